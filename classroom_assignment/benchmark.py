@@ -0,0 +1,333 @@
+import argparse
+import json
+import platform
+import time
+from datetime import datetime, timezone
+from re import search
+
+import gurobipy as gp
+import numpy as np
+import pandas as pd
+
+import settings
+
+from main import ClassroomAssignment, ModelParameters
+from solver.backend import SolverStatus
+from database.synthetic_data import generate_campus
+from database.table_cache import read_csv_table
+from database.transform_data import (
+    transform_sections_to_dict,
+    transform_classrooms_to_dict,
+)
+from utils.heuristic import allocate_greedy
+
+DEFAULT_SIZES = [1000, 5000, 10000, 50000]
+CACHED_CLASSROOMS_PATH = "cache/get_classrooms_available.csv"
+CACHED_SECTIONS_PATH = "cache/get_section_allocation.csv"
+MODEL_PHASES = [
+    "initialize_variables_and_coefficients",
+    "add_capacity_slack_variables",
+    "add_constraints",
+    "set_objective",
+    "optimize",
+]
+
+
+def run_phases(timetabling: ClassroomAssignment, phases: list) -> dict:
+    """
+    Runs each model building phase in order and measures its wall time.
+
+    Returns:
+        dict: The phase name mapped to its duration in seconds. A phase that raises a
+            `gp.GurobiError` (e.g. a size-limited license) stops the run and is
+            reported under the 'error' key.
+    """
+    timings = {}
+
+    for phase in phases:
+        start = time.perf_counter()
+        try:
+            getattr(timetabling, phase)()
+        except gp.GurobiError as err:
+            timings["error"] = f"{phase}: {err}"
+            break
+        timings[phase] = time.perf_counter() - start
+
+    return timings
+
+
+def load_dataset(dataset: str, n_sections: int, seed: int) -> tuple:
+    """
+    Returns the sections and classrooms DataFrames of a synthetic campus with
+    `n_sections`, or the ones cached from the spreadsheet (then `n_sections` and
+    `seed` are ignored).
+    """
+    if dataset == "cache":
+        sections = read_csv_table(CACHED_SECTIONS_PATH)
+        classrooms = read_csv_table(CACHED_CLASSROOMS_PATH)
+        return sections, classrooms
+
+    return generate_campus(n_sections, seed=seed)
+
+
+def transform_sections_to_dict_rowwise(data: pd.DataFrame) -> dict:
+    """
+    The row-by-row cleaning that `transform_sections_to_dict` replaced, kept to
+    compare both implementations.
+    """
+    data = data.replace({np.nan: None})
+    data_transformed = data.to_dict("index")
+    key_to_delete = []
+    for dt in data_transformed:
+        capacity = 0
+        line = data_transformed[dt]
+
+        try:
+            if "capacity" in line and line["capacity"]:
+                capacity = int(line["capacity"])
+        except ValueError:
+            pass
+
+        data_transformed[dt]["capacity"] = capacity
+
+        if not isinstance(line["classroom_type"], str):
+            line["classroom_type"] = None
+
+        if line["classroom_type"] and search(r"[PT](,[PT])*", line["classroom_type"]):
+            line["classroom_type"] = line["classroom_type"].replace("T", "Teórica")
+            line["classroom_type"] = line["classroom_type"].replace("P", "Prática")
+
+        if line["classroom_type"] == None:
+            line["classroom_type"] = "NAO INFORMADO"
+
+        if line["day"] == None or line["time"] == None:
+            key_to_delete.append(dt)
+
+        if line["blackboard_restriction"] == "FALSE":
+            line["blackboard_restriction"] = False
+        elif line["blackboard_restriction"] == "TRUE":
+            line["blackboard_restriction"] = True
+
+    for k in key_to_delete:
+        del data_transformed[k]
+
+    return data_transformed
+
+
+def transform_classrooms_to_dict_rowwise(data: pd.DataFrame) -> dict:
+    """
+    The row-by-row cleaning that `transform_classrooms_to_dict` replaced, kept to
+    compare both implementations.
+    """
+    data = data.replace({np.nan: None})
+    data_transformed = data.to_dict("index")
+
+    for dt in data_transformed:
+        capacity = 0
+        line = data_transformed[dt]
+
+        try:
+            if "capacity" in line and line["capacity"]:
+                capacity = int(line["capacity"])
+            elif "capacity_siga" in line and line["capacity_siga"]:
+                capacity = int(line["capacity_siga"])
+        except ValueError:
+            pass
+
+        if line["capacity"] == 0 and line["capacity_siga"]:
+            capacity = line["capacity_siga"]
+
+        data_transformed[dt]["capacity"] = capacity
+
+        if not isinstance(line["classroom_type"], str):
+            line["classroom_type"] = None
+
+        if line["classroom_type"] == None:
+            line["classroom_type"] = "NAO INFORMADO"
+
+    return data_transformed
+
+
+def benchmark_transform(sections: pd.DataFrame, classrooms: pd.DataFrame) -> dict:
+    """
+    Times the row-by-row and the column-wise cleaning of the same DataFrames.
+
+    Returns:
+        dict: The wall time of each implementation and whether their outputs are
+            equal.
+    """
+    start = time.perf_counter()
+    rowwise = (
+        transform_sections_to_dict_rowwise(sections),
+        transform_classrooms_to_dict_rowwise(classrooms),
+    )
+    rowwise_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = (
+        transform_sections_to_dict(sections),
+        transform_classrooms_to_dict(classrooms),
+    )
+    vectorized_time = time.perf_counter() - start
+
+    return {
+        "rowwise": rowwise_time,
+        "vectorized": vectorized_time,
+        "equal": rowwise == vectorized,
+    }
+
+
+def benchmark_heuristic(classrooms_set: dict, sections_set: dict) -> dict:
+    """
+    Runs `allocate_greedy` on the same input as the exact model.
+
+    Returns:
+        dict: Its wall time, linear objective and the slots left without a
+            classroom.
+    """
+    start = time.perf_counter()
+    result = allocate_greedy(classrooms_set, sections_set, ModelParameters())
+
+    return {
+        "time": time.perf_counter() - start,
+        "objective": result.objective_value,
+        "unallocated": len(result.unallocated),
+    }
+
+
+def benchmark_size(
+    n_sections: int,
+    seed: int,
+    objective_mode: str,
+    time_limit: float,
+    solver: str = settings.APP_SOLVER,
+    dataset: str = "synthetic",
+):
+    sections, classrooms = load_dataset(dataset, n_sections, seed)
+
+    start = time.perf_counter()
+    sections_set = transform_sections_to_dict(sections)
+    classrooms_set = transform_classrooms_to_dict(classrooms)
+    transform_time = time.perf_counter() - start
+
+    timetabling = ClassroomAssignment(
+        classrooms_set, sections_set, objective_mode=objective_mode, solver=solver
+    )
+    backend = timetabling.backend
+    backend.set_output(False)
+    if time_limit:
+        backend.set_time_limit(time_limit)
+
+    timings = {"transform_data": transform_time}
+    transform = benchmark_transform(sections, classrooms)
+    heuristic = benchmark_heuristic(classrooms_set, sections_set)
+    timings.update(run_phases(timetabling, MODEL_PHASES))
+
+    status = backend.status if "error" not in timings else None
+    result = {
+        "solver": solver,
+        "n_sections": len(sections_set),
+        "n_classrooms": len(classrooms_set),
+        "phases": timings,
+        "num_vars": backend.num_variables,
+        "num_constrs": backend.num_constraints,
+        "status": status.value if status else None,
+        "objective": (
+            backend.objective_value if status == SolverStatus.OPTIMAL else None
+        ),
+        "transform": transform,
+        "heuristic": heuristic,
+    }
+
+    # O objetivo da heurística só é comparável ao do modo linear
+    if result["objective"] and objective_mode == settings.ObjectiveMode.LINEAR.value:
+        heuristic["gap"] = (result["objective"] - heuristic["objective"]) / abs(
+            result["objective"]
+        )
+
+    timetabling.clean_model()
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measures how ClassroomAssignment scales on synthetic campuses."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--objective-mode",
+        default=settings.APP_OBJECTIVE_MODE,
+        choices=[mode.value for mode in settings.ObjectiveMode],
+    )
+    parser.add_argument("--time-limit", type=float, default=None)
+    parser.add_argument(
+        "--solvers",
+        nargs="+",
+        default=[settings.APP_SOLVER],
+        choices=[solver.value for solver in settings.Solver],
+    )
+    parser.add_argument(
+        "--dataset",
+        default="synthetic",
+        choices=["synthetic", "cache"],
+        help="Synthetic campuses of each size, or the cached spreadsheet data",
+    )
+    parser.add_argument("--label", default="", help="Identifies the measured version")
+    parser.add_argument(
+        "--output", default="classroom_assignment/results/benchmark.json"
+    )
+    args = parser.parse_args()
+
+    report = {
+        "label": args.label,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "gurobi": ".".join(str(v) for v in gp.gurobi.version()),
+        "seed": args.seed,
+        "objective_mode": args.objective_mode,
+        "dataset": args.dataset,
+        "runs": [],
+    }
+
+    # Os dados em cache têm um único tamanho
+    sizes = args.sizes if args.dataset == "synthetic" else [None]
+
+    for n_sections in sizes:
+        for solver in args.solvers:
+            label = n_sections or "CACHED"
+            print(f"========= BENCHMARK {label} SECTIONS ({solver}) ==========")
+            run = benchmark_size(
+                n_sections,
+                args.seed,
+                args.objective_mode,
+                args.time_limit,
+                solver=solver,
+                dataset=args.dataset,
+            )
+            report["runs"].append(run)
+
+            for phase, duration in run["phases"].items():
+                print(f"{phase}: {duration}")
+            print(f"status: {run['status']}, objective: {run['objective']}")
+            print(
+                f"transform: rowwise {run['transform']['rowwise']}s, "
+                f"vectorized {run['transform']['vectorized']}s, "
+                f"equal: {run['transform']['equal']}"
+            )
+            print(
+                f"heuristic: {run['heuristic']['time']}s, "
+                f"objective: {run['heuristic']['objective']}, "
+                f"unallocated: {run['heuristic']['unallocated']}, "
+                f"gap: {run['heuristic'].get('gap')}"
+            )
+
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+
+    print(f"Benchmark was saved in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,52 @@
+from typing import Tuple
+
 from database.service_google_sheet import (
+    SpreadsheetTabs,
     get_classrooms_available,
     get_secion_allocation,
 )
+from database.records import Classroom, Section, build_classrooms, build_sections
 from database.transform_data import (
     transform_sections_to_dict,
     transform_classrooms_to_dict
 )
 
 
-def get_sections_set() -> dict[str, dict]:
+def get_sections_set(tabs: SpreadsheetTabs = None) -> dict[str, Section]:
     """
-    Retrieves a set of required courses and transforms them into a dictionary format.
+    Retrieves a set of required courses and transforms them into `Section` records.
 
     Returns:
         dict: A dictionary containing the transformed required courses.
     """
-    sections = get_secion_allocation()
-    sections_set = transform_sections_to_dict(sections)
+    sections = get_secion_allocation(tabs)
+    sections_set = build_sections(transform_sections_to_dict(sections))
 
     return sections_set
 
 
-def get_classrooms_set():
+def get_classrooms_set(tabs: SpreadsheetTabs = None) -> dict[str, Classroom]:
     """
-    Retrieves a set of elective courses and transforms them into a dictionary format.
+    Retrieves a set of elective courses and transforms them into `Classroom` records.
     Obs.: Do not contain a time schedule due to the nature of elective courses.
 
     Returns:
         dict: A dictionary containing the elective courses.
     """
-    classrooms = get_classrooms_available()
-    classrooms_set = transform_classrooms_to_dict(classrooms)
+    classrooms = get_classrooms_available(tabs)
+    classrooms_set = build_classrooms(transform_classrooms_to_dict(classrooms))
 
     return classrooms_set
+
+
+def get_classrooms_and_sections_sets() -> Tuple[dict, dict]:
+    """
+    Retrieves both sets. When the caches are stale, the two spreadsheet tabs are
+    fetched with a single authenticated client and a single request.
+
+    Returns:
+        tuple: The classrooms set and the sections set.
+    """
+    tabs = SpreadsheetTabs()
+
+    return get_classrooms_set(tabs), get_sections_set(tabs)
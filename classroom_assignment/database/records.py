@@ -0,0 +1,120 @@
+import sys
+from enum import IntEnum
+from typing import Hashable, Mapping, NamedTuple, Optional, Tuple
+
+from utils import utils
+
+
+class ClassroomType(IntEnum):
+    """Classroom types as distinguished by RN3."""
+
+    SALA = 0
+    LABORATORIO = 1
+    OTHER = 2
+
+
+CLASSROOM_TYPES = {
+    "Sala": ClassroomType.SALA,
+    "Laboratório": ClassroomType.LABORATORIO,
+}
+
+
+class Classroom(NamedTuple):
+    """A row of the classrooms set, reduced to what the model uses."""
+
+    responsable_institute: Optional[str]
+    classroom_type: ClassroomType
+    capacity: int
+    is_blackboard: bool
+
+
+class Section(NamedTuple):
+    """
+    A row of the sections set, with its schedule parsed once.
+
+    Attributes:
+        slots: The (day, time) slots of the section.
+        theory_slots: How many slots require a theory classroom (RN3).
+        practical_slots: How many slots require a practical classroom (RN3).
+        is_new_students: Whether it is a freshman section (RN4).
+    """
+
+    responsable_institute: Optional[str]
+    graduation_course: Optional[str]
+    professor: Optional[str]
+    course_id: Optional[str]
+    course_name: Optional[str]
+    term: Optional[int]
+    capacity: int
+    slots: Tuple[Tuple[str, str], ...]
+    theory_slots: int
+    practical_slots: int
+    is_new_students: bool
+    blackboard_restriction: bool
+
+
+def _intern(value):
+    # Valores repetidos (dias, horários, professores...) passam a ser um único objeto
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def to_classroom(details: Mapping) -> Classroom:
+    return Classroom(
+        responsable_institute=_intern(details.get("responsable_institute")),
+        classroom_type=CLASSROOM_TYPES.get(
+            details.get("classroom_type"), ClassroomType.OTHER
+        ),
+        capacity=details.get("capacity") or 0,
+        is_blackboard=utils.is_blackboard({"board_type": details.get("board_type")}),
+    )
+
+
+def to_section(details: Mapping) -> Section:
+    days, times = utils.parse_schedule(details.get("day"), details.get("time"))
+    slots = tuple((_intern(day), _intern(time)) for day, time in zip(days, times))
+
+    if details.get("classroom_type"):
+        theory_slots, practical_slots = utils.get_classroom_type_demand(
+            details, len(slots)
+        )
+    else:
+        theory_slots, practical_slots = 0, 0
+
+    return Section(
+        responsable_institute=_intern(details.get("responsable_institute")),
+        graduation_course=_intern(details.get("graduation_course")),
+        professor=_intern(details.get("professor")),
+        course_id=_intern(details.get("course_id")),
+        course_name=_intern(details.get("course_name")),
+        term=details.get("term"),
+        capacity=details.get("capacity") or 0,
+        slots=slots,
+        theory_slots=theory_slots,
+        practical_slots=practical_slots,
+        is_new_students=utils.is_new_students_section(details),
+        blackboard_restriction=bool(details.get("blackboard_restriction")),
+    )
+
+
+def build_classrooms(classrooms: Mapping) -> dict[Hashable, Classroom]:
+    """
+    Converts the classrooms set returned by `transform_classrooms_to_dict` to
+    `Classroom` records. Rows that already are records are kept.
+    """
+    return {
+        classroom: (
+            details if isinstance(details, Classroom) else to_classroom(details)
+        )
+        for classroom, details in classrooms.items()
+    }
+
+
+def build_sections(sections: Mapping) -> dict[Hashable, Section]:
+    """
+    Converts the sections set returned by `transform_sections_to_dict` to
+    `Section` records. Rows that already are records are kept.
+    """
+    return {
+        section: details if isinstance(details, Section) else to_section(details)
+        for section, details in sections.items()
+    }
@@ -1,22 +1,29 @@
 # https://developers.google.com/sheets/api/quickstart/python
 
 import os.path
+from typing import Dict, List
+
 import pandas as pd
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from cache_pandas import cache_to_csv
 
 import settings
+from database.table_cache import load_cached_table
 
 # If modifying these scopes, delete the file token.json.
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
 
+SECTIONS_RANGE = "alocacao!A:M"
+CLASSROOMS_RANGE = "salas!A:L"
+
+SECTIONS_CSV = "get_section_allocation.csv"
+CLASSROOMS_CSV = "get_classrooms_available.csv"
 
-def read_google_sheet_to_dataframe(spreadsheet_id, range_name):
-    """Reads data from a Google Sheet and returns it as a pandas DataFrame."""
+
+def get_credentials():
     creds = None
 
     if os.path.exists("token.json"):
@@ -32,33 +39,87 @@ def read_google_sheet_to_dataframe(spreadsheet_id, range_name):
         with open("token.json", "w") as token:
             token.write(creds.to_json())
 
-    try:
-        service = build("sheets", "v4", credentials=creds)
+    return creds
 
-        sheet = service.spreadsheets()
-        result = (
-            sheet.values().get(spreadsheetId=spreadsheet_id, range=range_name).execute()
-        )
-        values = result.get("values", [])
 
-        if not values:
-            print("No data found.")
-            return pd.DataFrame()
+def get_sheets_service():
+    """Builds an authenticated client of the Sheets API."""
+    return build("sheets", "v4", credentials=get_credentials(), cache_discovery=False)
 
-        df = pd.DataFrame(values[1:], columns=values[0])
-        return df
+
+def values_to_dataframe(values: list) -> pd.DataFrame:
+    if not values:
+        print("No data found.")
+        return pd.DataFrame()
+
+    return pd.DataFrame(values[1:], columns=values[0])
+
+
+def read_google_sheet_ranges(
+    spreadsheet_id: str, range_names: List[str], service=None
+) -> List[list]:
+    """
+    Reads the raw values of several ranges of a Google Sheet with a single batchGet
+    request.
+
+    Args:
+        spreadsheet_id (str): The spreadsheet to read.
+        range_names (list): The ranges to read, in A1 notation.
+        service: A Sheets API client. A new one is built when not given.
+
+    Returns:
+        list: The rows of each range, in the same order. All of them are empty when
+            the request fails.
+    """
+    if service is None:
+        service = get_sheets_service()
+
+    try:
+        result = (
+            service.spreadsheets()
+            .values()
+            .batchGet(spreadsheetId=spreadsheet_id, ranges=list(range_names))
+            .execute()
+        )
 
     except HttpError as err:
         print(err)
-        return pd.DataFrame()
+        return [[] for _ in range_names]
+
+    return [
+        value_range.get("values", []) for value_range in result.get("valueRanges", [])
+    ]
+
+
+class SpreadsheetTabs:
+    """
+    Fetches the sections and classrooms tabs together, only once and only when one
+    of them is requested, so that the cached functions below share a single client
+    and a single request when both caches are stale.
+    """
+
+    def __init__(
+        self, spreadsheet_id: str = settings.SAMPLE_SPREADSHEET_ID, service=None
+    ):
+        self.spreadsheet_id = spreadsheet_id
+        self.service = service
+        self.tabs: Dict[str, list] = None
 
+    def get_values(self, range_name: str) -> list:
+        if self.tabs is None:
+            range_names = [SECTIONS_RANGE, CLASSROOMS_RANGE]
+            values = read_google_sheet_ranges(
+                self.spreadsheet_id, range_names, self.service
+            )
+            self.tabs = dict(zip(range_names, values))
 
-@cache_to_csv("cache/get_section_allocation.csv", refresh_time=settings.APP_CACHE_TTL)
-def get_secion_allocation():
-    page_name = "alocacao!A:M"
+        return self.tabs[range_name]
 
-    df = read_google_sheet_to_dataframe(settings.SAMPLE_SPREADSHEET_ID, page_name)
+    def get(self, range_name: str) -> pd.DataFrame:
+        return values_to_dataframe(self.get_values(range_name))
 
+
+def treat_section_allocation(df: pd.DataFrame) -> pd.DataFrame:
     df.rename(
         columns={
             "Instituto responsável": "responsable_institute",
@@ -82,12 +143,7 @@ def get_secion_allocation():
     return df
 
 
-@cache_to_csv("cache/get_classrooms_available.csv", refresh_time=settings.APP_CACHE_TTL)
-def get_classrooms_available():
-    page_name = "salas!A:L"
-
-    df = read_google_sheet_to_dataframe(settings.SAMPLE_SPREADSHEET_ID, page_name)
-
+def treat_classrooms_available(df: pd.DataFrame) -> pd.DataFrame:
     classrooms = df.loc[df["Disponível"] == "TRUE"].filter(
         [
             "Nome",
@@ -114,3 +170,19 @@ def get_classrooms_available():
     return classrooms
 
 
+def get_secion_allocation(tabs: SpreadsheetTabs = None) -> pd.DataFrame:
+    return load_cached_table(
+        tabs or SpreadsheetTabs(),
+        SECTIONS_RANGE,
+        treat_section_allocation,
+        seed_filename=SECTIONS_CSV,
+    )
+
+
+def get_classrooms_available(tabs: SpreadsheetTabs = None) -> pd.DataFrame:
+    return load_cached_table(
+        tabs or SpreadsheetTabs(),
+        CLASSROOMS_RANGE,
+        treat_classrooms_available,
+        seed_filename=CLASSROOMS_CSV,
+    )
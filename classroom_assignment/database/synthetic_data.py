@@ -0,0 +1,190 @@
+import math
+import random
+from typing import Tuple
+
+import pandas as pd
+
+DAYS = ["SEG", "TER", "QUA", "QUI", "SEX"]
+TIMES = [
+    "08:00-10:00",
+    "10:00-12:00",
+    "13:00-15:00",
+    "15:00-17:00",
+    "18:00-20:00",
+    "20:00-22:00",
+]
+INSTITUTES = ["IC", "IM", "IF", "IQ", "CCMN"]
+CAPACITIES = [30, 40, 60, 90, 120]
+SECTION_CAPACITIES = [20, 30, 40, 60]
+BOARD_TYPES = ["Branco", "Quadro Negro / Lousa de Giz", ""]
+
+NEW_STUDENTS_CLASSROOM = "F3014"
+AVERAGE_SLOTS_PER_SECTION = 1.6
+MAX_SLOT_OCCUPANCY = 0.6
+
+
+def generate_classrooms_available(
+    n_classrooms: int, seed: int = 0
+) -> pd.DataFrame:
+    """
+    Generates classrooms with the same schema returned by `get_classrooms_available`.
+
+    Args:
+        n_classrooms (int): The number of classrooms, including F3014.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        pd.DataFrame: The classrooms indexed by 'classroom_name'.
+    """
+    rng = random.Random(seed)
+
+    rows = [
+        {
+            "classroom_name": NEW_STUDENTS_CLASSROOM,
+            "responsable_institute": "IC",
+            "classroom_type": "Sala",
+            "capacity_siga": "Sem Registro",
+            "capacity": "90",
+            "board_type": "Branco",
+        }
+    ]
+
+    for i in range(1, n_classrooms):
+        classroom_type = rng.choices(
+            ["Sala", "Laboratório", "Anfiteatro"], weights=[70, 20, 10]
+        )[0]
+        capacity = rng.choice(CAPACITIES)
+
+        rows.append(
+            {
+                "classroom_name": f"S{i:05d}",
+                "responsable_institute": rng.choice(INSTITUTES),
+                "classroom_type": classroom_type,
+                "capacity_siga": str(capacity),
+                "capacity": "" if rng.random() < 0.2 else str(capacity),
+                "board_type": rng.choices(BOARD_TYPES, weights=[70, 20, 10])[0],
+            }
+        )
+
+    classrooms = pd.DataFrame(rows)
+    classrooms.set_index("classroom_name", inplace=True)
+
+    return classrooms
+
+
+def generate_secion_allocation(
+    n_sections: int, classrooms: pd.DataFrame, seed: int = 0
+) -> pd.DataFrame:
+    """
+    Generates sections with the same schema returned by `get_secion_allocation`.
+    Each (day, time) slot is filled up to a fraction of the classrooms of the
+    required type, so that the generated instance stays feasible.
+
+    Args:
+        n_sections (int): The number of sections.
+        classrooms (pd.DataFrame): The classrooms the sections will be assigned to.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        pd.DataFrame: The sections, with a default integer index.
+    """
+    rng = random.Random(seed)
+
+    supply = {
+        classroom_type: math.floor(qtty * MAX_SLOT_OCCUPANCY)
+        for classroom_type, qtty in classrooms["classroom_type"].value_counts().items()
+    }
+    room_type = {"T": "Sala", "P": "Laboratório"}
+    occupancy = {}
+
+    new_students_slots = [(day, time) for day in DAYS for time in TIMES[:2]]
+    rng.shuffle(new_students_slots)
+    qtty_new_students = min(len(new_students_slots), n_sections // 50)
+
+    rows = []
+    for i in range(n_sections):
+        is_new_students = i < qtty_new_students
+
+        if is_new_students:
+            days = [new_students_slots[i][0]]
+            times = [new_students_slots[i][1]]
+            classroom_types = ["T"]
+        else:
+            days, times, classroom_types = _get_free_schedule(
+                rng, supply, occupancy, room_type
+            )
+
+        for day, time, classroom_type in zip(days, times, classroom_types):
+            slot = (day, time, room_type[classroom_type])
+            occupancy[slot] = occupancy.get(slot, 0) + 1
+
+        rows.append(
+            {
+                "responsable_institute": rng.choice(INSTITUTES),
+                "graduation_course": f"CURSO{rng.randint(1, 20)}",
+                "professor": f"PROFESSOR {rng.randint(1, max(n_sections // 3, 1))}",
+                "course_id": f"DISC{i:05d}",
+                "course_name": f"Disciplina {i}",
+                "day": ",".join(days),
+                "time": (
+                    times[0] if len(set(times)) == 1 else ",".join(times)
+                ),
+                "capacity": str(rng.choice(SECTION_CAPACITIES)),
+                "classroom_type": (
+                    classroom_types[0]
+                    if len(set(classroom_types)) == 1
+                    else ",".join(classroom_types)
+                ),
+                "term": 1 if is_new_students else rng.randint(2, 8),
+                "class_type": "Calouro" if is_new_students else "Regular",
+                "blackboard_restriction": "TRUE" if rng.random() < 0.05 else "FALSE",
+            }
+        )
+
+    return pd.DataFrame(rows)
+
+
+def _get_free_schedule(
+    rng: random.Random, supply: dict, occupancy: dict, room_type: dict
+) -> Tuple[list, list, list]:
+    for _ in range(100):
+        qtty_days = 1 if rng.random() > AVERAGE_SLOTS_PER_SECTION - 1 else 2
+        days = sorted(rng.sample(DAYS, qtty_days), key=DAYS.index)
+
+        if qtty_days == 2 and rng.random() < 0.2:
+            times = [rng.choice(TIMES) for _ in days]
+        else:
+            times = [rng.choice(TIMES)] * qtty_days
+
+        if qtty_days == 2 and rng.random() < 0.15:
+            classroom_types = ["T", "P"]
+        else:
+            classroom_types = [rng.choices(["T", "P"], weights=[85, 15])[0]] * qtty_days
+
+        if all(
+            occupancy.get((day, time, room_type[classroom_type]), 0)
+            < supply.get(room_type[classroom_type], 0)
+            for day, time, classroom_type in zip(days, times, classroom_types)
+        ):
+            return days, times, classroom_types
+
+    raise ValueError("Not enough classrooms to generate a feasible schedule")
+
+
+def generate_campus(n_sections: int, seed: int = 0) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Generates a synthetic campus with enough classrooms for `n_sections`.
+
+    Returns:
+        tuple: The sections and the classrooms DataFrames.
+    """
+    qtty_slots = len(DAYS) * len(TIMES)
+    n_classrooms = math.ceil(
+        n_sections * AVERAGE_SLOTS_PER_SECTION / qtty_slots / MAX_SLOT_OCCUPANCY * 1.5
+    )
+    n_classrooms = max(n_classrooms, 10)
+
+    classrooms = generate_classrooms_available(n_classrooms, seed=seed)
+    sections = generate_secion_allocation(n_sections, classrooms, seed=seed)
+
+    return sections, classrooms
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import pickle
+import time
+from typing import Callable, NamedTuple, Optional
+
+import pandas as pd
+
+import settings
+
+CACHE_DIRECTORY = "cache"
+
+
+class CacheEntry(NamedTuple):
+    """A treated spreadsheet range, stored with the hash of the raw values."""
+
+    spreadsheet_id: str
+    range_name: str
+    content_hash: str
+    fetched_at: float
+    table: pd.DataFrame
+
+
+def get_cache_path(spreadsheet_id: str, range_name: str, directory: str) -> str:
+    key = hashlib.sha256(f"{spreadsheet_id}:{range_name}".encode()).hexdigest()[:16]
+
+    return os.path.join(directory, f"{key}.pkl")
+
+
+def hash_values(values: list) -> str:
+    return hashlib.sha256(json.dumps(values, default=str).encode()).hexdigest()
+
+
+def load_entry(path: str) -> Optional[CacheEntry]:
+    try:
+        with open(path, "rb") as file:
+            return pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+
+
+def save_entry(path: str, entry: CacheEntry) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    # Grava em um arquivo temporário para não deixar uma entrada pela metade
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as file:
+        pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_path, path)
+
+
+def read_csv_table(path: str) -> Optional[pd.DataFrame]:
+    """
+    Reads a treated table exported to CSV, such as the `cache/get_*.csv` files
+    committed with the repository. Returns None when the file does not exist.
+    """
+    try:
+        return pd.read_csv(path, index_col=0)
+    except FileNotFoundError:
+        return None
+
+
+def load_seed_entry(
+    spreadsheet_id: str, range_name: str, path: str
+) -> Optional[CacheEntry]:
+    """
+    Builds a cache entry from a treated table exported to CSV, dated by the file.
+    Its hash is unknown, so the table is treated again on the first revalidation.
+    """
+    table = read_csv_table(path)
+    if table is None:
+        return None
+
+    return CacheEntry(spreadsheet_id, range_name, None, os.path.getmtime(path), table)
+
+
+def load_cached_table(
+    tabs,
+    range_name: str,
+    treat: Callable[[pd.DataFrame], pd.DataFrame],
+    refresh_time: Optional[float] = settings.APP_CACHE_TTL,
+    directory: str = None,
+    seed_filename: str = None,
+) -> pd.DataFrame:
+    """
+    Returns the treated table of a spreadsheet range, keeping it pickled with its
+    dtypes under a key made of the spreadsheet id and the range.
+
+    A cached table younger than `refresh_time` is returned without any request.
+    An older one is revalidated: the raw values are fetched again and, when their
+    hash did not change, the cached table is kept without treating it again. When
+    the fetch fails, the older table is returned.
+
+    Without a pickled table, the CSV `seed_filename` of the cache directory is used
+    as if it had been fetched when the file was written, so that a fresh clone runs
+    offline from the committed CSV files.
+
+    Args:
+        tabs (SpreadsheetTabs): Fetches the raw values of the range.
+        range_name (str): The range, in A1 notation.
+        treat (Callable): Builds the table from the raw DataFrame of the range.
+        refresh_time (float): Seconds before revalidating a cached table. When
+            None, a cached table is never revalidated.
+        directory (str): Where the tables are kept, `CACHE_DIRECTORY` by default.
+        seed_filename (str): The CSV export of the treated table in `directory`.
+
+    Returns:
+        pd.DataFrame: The treated table.
+    """
+    directory = directory or CACHE_DIRECTORY
+    path = get_cache_path(tabs.spreadsheet_id, range_name, directory)
+    entry = load_entry(path)
+
+    if entry is None and seed_filename is not None:
+        entry = load_seed_entry(
+            tabs.spreadsheet_id, range_name, os.path.join(directory, seed_filename)
+        )
+
+    if entry is not None and (
+        refresh_time is None or time.time() - entry.fetched_at < refresh_time
+    ):
+        return entry.table
+
+    try:
+        values = tabs.get_values(range_name)
+    except Exception as err:
+        if entry is None:
+            raise
+
+        print(f"Could not fetch {range_name}, using the cached table: {err}")
+        return entry.table
+
+    # Uma leitura sem linhas é uma requisição que falhou, não uma planilha vazia
+    if not values and entry is not None:
+        print(f"No data found for {range_name}, using the cached table.")
+        return entry.table
+
+    content_hash = hash_values(values)
+
+    if entry is not None and entry.content_hash == content_hash:
+        table = entry.table
+    else:
+        table = treat(tabs.get(range_name))
+
+    save_entry(
+        path,
+        CacheEntry(tabs.spreadsheet_id, range_name, content_hash, time.time(), table),
+    )
+
+    return table
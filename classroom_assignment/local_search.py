@@ -0,0 +1,377 @@
+import argparse
+import random
+import re
+import time
+from typing import NamedTuple
+
+import settings
+
+from main import SNAPSHOT_PATH, ClassroomAssignment, ModelParameters
+from solver.backend import SolverStatus
+from database.records import build_classrooms, build_sections
+from utils import utils
+from utils.heuristic import allocate_greedy, get_allocation_score, get_capacity_diff
+from utils.incremental import diff_snapshot, load_snapshot, save_snapshot
+
+BUILDING_PATTERN = re.compile(r"[A-Za-z]+")
+IMPROVEMENT_TOLERANCE = 1e-6
+
+
+class Neighborhood(NamedTuple):
+    """
+    A part of the assignment that is re-solved at once.
+
+    Attributes:
+        kind: "building", "slot" or "institute".
+        name: The building, the "day time" slot or the institute.
+        sections: The sections that are freed.
+        classrooms: The classrooms they may move to, or None for all of them.
+    """
+
+    kind: str
+    name: str
+    sections: tuple
+    classrooms: tuple = None
+
+
+class LocalSearchResult(NamedTuple):
+    """
+    Attributes:
+        assignment: The best `Allocation` rows found.
+        objective_value: Their linear objective.
+        history: The (elapsed seconds, objective) after the start and after each
+            accepted move.
+        solved: How many neighborhoods were re-solved.
+    """
+
+    assignment: list
+    objective_value: float
+    history: list
+    solved: int
+
+
+def get_building(classroom: str) -> str:
+    """Returns the block of a classroom name, e.g. "F" for "F3014"."""
+    match = BUILDING_PATTERN.match(str(classroom))
+    return match.group() if match else str(classroom)
+
+
+def get_neighborhoods(classrooms: dict, sections: dict, allocations: dict) -> list:
+    """
+    Lists the neighborhoods of an assignment:
+
+    - Each building, with the sections that only use its classrooms, which stay
+      in the building.
+    - Each (day, time) slot, with the sections that have a class in it.
+    - Each responsible institute, with its sections.
+
+    Args:
+        classrooms (dict): The `Classroom` records.
+        sections (dict): The `Section` records.
+        allocations (dict): The (classroom, day, time) allocations of each section.
+    """
+    buildings = {}
+    for classroom in classrooms:
+        buildings.setdefault(get_building(classroom), []).append(classroom)
+
+    building_sections = {}
+    for section, section_allocations in allocations.items():
+        section_buildings = {
+            get_building(classroom) for classroom, _, _ in section_allocations
+        }
+        if len(section_buildings) == 1:
+            building_sections.setdefault(section_buildings.pop(), []).append(section)
+
+    neighborhoods = [
+        Neighborhood("building", building, tuple(building_sections[building]), tuple(rooms))
+        for building, rooms in buildings.items()
+        if building in building_sections
+    ]
+
+    schedule = utils.build_schedule_index(sections)
+    neighborhoods += [
+        Neighborhood("slot", f"{day} {time}", slot_sections)
+        for (day, time), slot_sections in schedule.slot_sections.items()
+    ]
+
+    institute_sections = {}
+    for section, details in sections.items():
+        institute_sections.setdefault(details.responsable_institute, []).append(section)
+
+    neighborhoods += [
+        Neighborhood("institute", str(institute), tuple(institute_sections[institute]))
+        for institute in institute_sections
+    ]
+
+    return neighborhoods
+
+
+def get_objective_value(
+    classrooms: dict, sections: dict, assignment, parameters: ModelParameters
+) -> float:
+    """Returns the linear objective of (classroom, section, day, time) allocations."""
+    return sum(
+        get_allocation_score(classrooms[classroom], sections[section], parameters)
+        for classroom, section, _, _ in assignment
+    )
+
+
+def solve_neighborhood(
+    classrooms: dict,
+    sections: dict,
+    allocations: dict,
+    neighborhood: Neighborhood,
+    parameters: ModelParameters,
+    time_limit: float,
+    solver: str = settings.APP_SOLVER,
+) -> list:
+    """
+    Re-solves the sections of a neighborhood in the classrooms the other sections
+    leave free, starting from their current classrooms.
+
+    Returns:
+        list: The new `Allocation` rows of the neighborhood, or None when no
+            solution was found.
+    """
+    freed_sections = set(neighborhood.sections)
+    occupied_slots = {
+        allocation
+        for section, section_allocations in allocations.items()
+        if section not in freed_sections
+        for allocation in section_allocations
+    }
+    neighborhood_classrooms = (
+        classrooms
+        if neighborhood.classrooms is None
+        else {classroom: classrooms[classroom] for classroom in neighborhood.classrooms}
+    )
+
+    timetabling = ClassroomAssignment(
+        neighborhood_classrooms,
+        {section: sections[section] for section in neighborhood.sections},
+        objective_mode=settings.ObjectiveMode.LINEAR.value,
+        occupied_slots=occupied_slots,
+        solver=solver,
+        parameters=parameters,
+    )
+
+    try:
+        timetabling.backend.set_output(False)
+        timetabling.backend.set_time_limit(time_limit)
+        timetabling.build_model()
+
+        for section in neighborhood.sections:
+            for classroom, day, time in allocations.get(section, []):
+                variable = timetabling.variables.get(
+                    (
+                        timetabling.classroom_representatives.get(classroom),
+                        section,
+                        day,
+                        time,
+                    )
+                )
+                if variable is not None:
+                    timetabling.backend.set_start(variable, 1)
+
+        timetabling.optimize()
+
+        status = timetabling.backend.status
+        if status not in (SolverStatus.OPTIMAL, SolverStatus.TIME_LIMIT):
+            return None
+        if not timetabling.backend.has_solution:
+            return None
+
+        assignment, _ = timetabling.get_results()
+        return assignment
+    finally:
+        timetabling.clean_model()
+
+
+def local_search(
+    classrooms: dict,
+    sections: dict,
+    assignment: list,
+    time_budget: float,
+    parameters: ModelParameters = None,
+    max_sections: int = 100,
+    neighborhood_time_limit: float = 10,
+    seed: int = 0,
+    solver: str = settings.APP_SOLVER,
+) -> LocalSearchResult:
+    """
+    Improves an assignment by large neighborhood search: a neighborhood (see
+    `get_neighborhoods`) is freed and re-solved with a small `ClassroomAssignment`,
+    and the new allocations are kept when the linear objective improves. Larger
+    neighborhoods are sampled down to `max_sections`. The search stops when the
+    time budget is spent or when a whole round of neighborhoods brings no
+    improvement, and the best assignment is available at any time.
+
+    Sections without a classroom in `assignment` are allocated when one of their
+    neighborhoods is re-solved, if they fit.
+
+    Returns:
+        LocalSearchResult: The best assignment found and its history.
+    """
+    start = time.perf_counter()
+    classrooms = build_classrooms(classrooms)
+    sections = build_sections(sections)
+    parameters = parameters or ModelParameters()
+    rng = random.Random(seed)
+
+    allocations = {}
+    for classroom, section, day, time_ in assignment:
+        allocations.setdefault(section, []).append((classroom, day, time_))
+
+    objective_value = get_objective_value(classrooms, sections, assignment, parameters)
+    history = [(time.perf_counter() - start, objective_value)]
+    neighborhoods = get_neighborhoods(classrooms, sections, allocations)
+    solved = 0
+    improved = True
+
+    while improved:
+        improved = False
+        rng.shuffle(neighborhoods)
+
+        for neighborhood in neighborhoods:
+            remaining = time_budget - (time.perf_counter() - start)
+            if remaining <= 0:
+                improved = False
+                break
+
+            if len(neighborhood.sections) > max_sections:
+                neighborhood = neighborhood._replace(
+                    sections=tuple(rng.sample(neighborhood.sections, max_sections))
+                )
+
+            current_value = sum(
+                get_allocation_score(classrooms[classroom], sections[section], parameters)
+                for section in neighborhood.sections
+                for classroom, _, _ in allocations.get(section, [])
+            )
+
+            new_assignment = solve_neighborhood(
+                classrooms,
+                sections,
+                allocations,
+                neighborhood,
+                parameters,
+                min(neighborhood_time_limit, remaining),
+                solver,
+            )
+            solved += 1
+
+            if new_assignment is None:
+                continue
+
+            new_value = get_objective_value(
+                classrooms, sections, new_assignment, parameters
+            )
+            if new_value <= current_value + IMPROVEMENT_TOLERANCE:
+                continue
+
+            for section in neighborhood.sections:
+                allocations[section] = []
+            for classroom, section, day, time_ in new_assignment:
+                allocations[section].append((classroom, day, time_))
+
+            objective_value += new_value - current_value
+            history.append((time.perf_counter() - start, objective_value))
+            improved = True
+
+    return LocalSearchResult(
+        [
+            utils.Allocation(classroom, section, day, time_)
+            for section, section_allocations in allocations.items()
+            for classroom, day, time_ in section_allocations
+        ],
+        objective_value,
+        history,
+        solved,
+    )
+
+
+def load_start(start: str, classrooms: dict, sections: dict) -> list:
+    """
+    Returns the assignment to improve: the last saved snapshot (written by every
+    run), a previous assignment.csv or the greedy heuristic.
+    """
+    if start == "snapshot":
+        snapshot = load_snapshot(SNAPSHOT_PATH)
+        if snapshot is None:
+            raise FileNotFoundError(f"Snapshot not found: {SNAPSHOT_PATH}")
+
+        kept_assignment, _ = diff_snapshot(snapshot, classrooms, sections)
+        return [utils.Allocation(*allocation) for allocation in kept_assignment]
+
+    if start == "csv":
+        assignment, _ = utils.match_results_to_sections(
+            utils.read_results_from_csv(utils.ASSIGNMENT_PATH), sections
+        )
+        return assignment
+
+    return allocate_greedy(classrooms, sections, ModelParameters()).assignment
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Improves an assignment by re-solving parts of it."
+    )
+    parser.add_argument(
+        "--start",
+        default="snapshot",
+        choices=["snapshot", "csv", "heuristic"],
+        help="The last results/snapshot.json, results/assignment.csv or the heuristic",
+    )
+    parser.add_argument(
+        "--dataset",
+        default="spreadsheet",
+        choices=["spreadsheet", "cache"],
+        help="The spreadsheet, or the data cached from it in cache/*.csv",
+    )
+    parser.add_argument("--time-budget", type=float, default=60)
+    parser.add_argument("--max-sections", type=int, default=100)
+    parser.add_argument("--neighborhood-time-limit", type=float, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--solver",
+        default=settings.APP_SOLVER,
+        choices=[solver.value for solver in settings.Solver],
+    )
+    args = parser.parse_args()
+
+    from scenarios import load_input
+
+    classrooms, sections = load_input(args.dataset)
+    classrooms = build_classrooms(classrooms)
+    sections = build_sections(sections)
+
+    result = local_search(
+        classrooms,
+        sections,
+        load_start(args.start, classrooms, sections),
+        args.time_budget,
+        max_sections=args.max_sections,
+        neighborhood_time_limit=args.neighborhood_time_limit,
+        seed=args.seed,
+        solver=args.solver,
+    )
+
+    utils.treat_and_save_results(
+        result.assignment,
+        sections,
+        get_capacity_diff(classrooms, sections, result.assignment),
+    )
+    save_snapshot(SNAPSHOT_PATH, classrooms, sections, result.assignment)
+
+    print("========= LOCAL SEARCH ==========")
+    print(f"Obj inicial: {result.history[0][1]}")
+    for elapsed, objective_value in result.history[1:]:
+        print(f"  {elapsed:.1f}s: {objective_value}")
+    print(f"Vizinhanças resolvidas: {result.solved}")
+    print("Result was saved in results/*")
+    print("=================================")
+    print(f"Obj: {result.objective_value}")
+
+
+if __name__ == "__main__":
+    main()
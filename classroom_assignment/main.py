@@ -1,315 +1,1226 @@
-import gurobipy as gp
-from gurobipy import GRB
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from typing import NamedTuple, Optional
 
 import settings
 
+from solver.backend import (
+    EQUAL,
+    GREATER_EQUAL,
+    LESS_EQUAL,
+    SolverStatus,
+    VariableType,
+    get_backend,
+    get_max_workers,
+)
+from database.records import ClassroomType, build_classrooms, build_sections
 from utils import utils
-from database.construct_sets import (
-    get_classrooms_set,
-    get_sections_set,
+from utils.incremental import diff_snapshot, load_snapshot, save_snapshot
+from utils.eligibility import get_ineligibility_reason
+from utils.diagnosis import (
+    Conflict,
+    ConstraintKey,
+    explain_iis,
+    get_slot_relaxation,
+    print_diagnosis,
+    save_diagnosis,
+)
+from utils.feasibility import check_sections, check_slots, print_infeasibility_report
+from utils.heuristic import HeuristicResult, allocate_greedy, get_capacity_diff
+from utils.instrumentation import Instrumentation
+from utils.symmetry import disaggregate_assignment, group_identical_classrooms
+from utils.model_cache import (
+    get_model_cache_paths,
+    get_model_fingerprint,
+    load_model_keys,
+    save_model_keys,
 )
+from database.construct_sets import get_classrooms_and_sections_sets
 
 DEFAULT_COEFFICIENT = 10
 RESPONSIBLE_INSTITUTE_COEFFICIENT = 100
+CAPACITY_DIFF_COEFFICIENT = 0.1  # Desempate: prefere a menor sala sem superar a preferência do instituto
+NEW_STUDENTS_CLASSROOM = "F3014"
+RUN_REPORT_PATH = "classroom_assignment/results/run_report.json"
+SNAPSHOT_PATH = "classroom_assignment/results/snapshot.json"
+DIAGNOSIS_PATH = "classroom_assignment/results/diagnosis.json"
+# Versão da formulação no MODEL_CACHE: incremente ao mudar variáveis, restrições ou
+# objetivo, para que os modelos salvos pelo código anterior não sejam reutilizados
+MODEL_CACHE_VERSION = 3
+
+
+class ModelParameters(NamedTuple):
+    """
+    Coefficients and rule settings of the model, overridable per instance to compare
+    scenarios.
+
+    Attributes:
+        new_students_classroom: The classroom of the freshman theory classes (RN4).
+            RN4 is disabled when None.
+        capacity_diff_coefficient: The weight of each empty seat (RF2), the same in
+            both objective modes. At 0.1 it breaks ties between classrooms with the
+            same coefficient: a classroom of another institute is only preferred
+            when the one of the responsible institute has 900 more empty seats.
+        capacity_tolerance: How many seats a section may exceed the classroom
+            capacity by (RF2).
+    """
+
+    default_coefficient: float = DEFAULT_COEFFICIENT
+    responsible_institute_coefficient: float = RESPONSIBLE_INSTITUTE_COEFFICIENT
+    capacity_diff_coefficient: float = CAPACITY_DIFF_COEFFICIENT
+    new_students_classroom: Optional[str] = NEW_STUDENTS_CLASSROOM
+    capacity_tolerance: int = 0
 
 
 class ClassroomAssignment:
-    def __init__(self, classrooms, sections):
-        self.classrooms = classrooms
-        self.sections = sections
-        self.coefficients = {}
+    def __init__(
+        self,
+        classrooms,
+        sections,
+        objective_mode=settings.APP_OBJECTIVE_MODE,
+        occupied_slots=None,
+        solver=settings.APP_SOLVER,
+        backend_options=None,
+        parameters: ModelParameters = None,
+        lazy_rn1: bool = settings.APP_LAZY_RN1,
+        aggregate_classrooms: bool = settings.APP_AGGREGATE_CLASSROOMS,
+    ):
+        self.classrooms = build_classrooms(classrooms)
+        self.sections = build_sections(sections)
+        self.objective_mode = objective_mode
+        self.solver = solver
+        self.parameters = parameters or ModelParameters()
+        self.lazy_rn1 = lazy_rn1
+        self.lazy_rn1_slots = []
+        # Salas idênticas compartilham as variáveis do grupo; sem agrupamento, cada
+        # sala é um grupo
+        self.aggregate_classrooms = aggregate_classrooms
+        if aggregate_classrooms:
+            self.classroom_groups = group_identical_classrooms(
+                self.classrooms, distinct=(self.parameters.new_students_classroom,)
+            )
+        else:
+            self.classroom_groups = {
+                classroom: (classroom,) for classroom in self.classrooms
+            }
+        self.classroom_representatives = {
+            member: classroom
+            for classroom, members in self.classroom_groups.items()
+            for member in members
+        }
+        # (classroom, day, time) já ocupados por seções fora do modelo
+        self.occupied_slots = occupied_slots or set()
+        self.schedule = utils.build_schedule_index(self.sections)
+        self.variable_keys = []
+        self.coefficients = []
         self.variables = {}
         self.slack_variables_capacity_diff = {}
+        self.capacity_diff_coefficients = {}
+        self.eligible_classrooms = None
+        self.variables_report = {}
+        # O que cada restrição do modelo restringe, na ordem de criação
+        self.constraint_keys = []
+
+        self.backend = get_backend(solver, **(backend_options or {}))
+
+        if (
+            objective_mode == settings.ObjectiveMode.QUADRATIC.value
+            and not self.backend.supports_quadratic
+        ):
+            raise ValueError(
+                f"The {self.backend.name} backend does not support the quadratic objective"
+            )
+
+    def get_ineligibility_reason(self, classroom: str, section: str) -> str:
+        """
+        Checks whether a classroom can ever be assigned to a section (see
+        `utils.eligibility.get_ineligibility_reason`).
+
+        Returns:
+            str: The name of the rule that discards the pair, or None when the
+                classroom is eligible for the section.
+        """
+        return get_ineligibility_reason(
+            classroom,
+            self.classrooms[classroom],
+            self.sections[section],
+            self.parameters,
+        )
+
+    def filter_eligible_classrooms(self):
+        """
+        Computes the classrooms that each section may occupy, so that variables are
+        only created for feasible (classroom, section) pairs. A report with the
+        amount of variables removed by each rule is kept in `variables_report`.
+        """
+        self.eligible_classrooms = {}
+        self.eligible_pairs = []
+        removed_by_rule = {"RN3": 0, "RN4": 0, "RN5": 0, "capacity": 0}
+        total_variables = 0
+        created_variables = 0
 
-        self.env = self.init_environment()
-        self.model = gp.Model(name="ClassroomAssignment", env=self.env)
+        for section in self.sections:
+            self.eligible_classrooms[section] = set()
+            qtty_slots = len(self.sections[section].slots)
+
+            # As salas de um grupo são iguais: a primeira decide por todas
+            for classroom, members in self.classroom_groups.items():
+                total_variables += qtty_slots * len(members)
+                reason = self.get_ineligibility_reason(classroom, section)
+
+                if reason:
+                    removed_by_rule[reason] += qtty_slots * len(members)
+                else:
+                    self.eligible_classrooms[section].update(members)
+                    self.eligible_pairs.append((classroom, section))
+                    created_variables += qtty_slots
+
+        self.variables_report = {
+            "total_variables": total_variables,
+            "created_variables": created_variables,
+            "removed_variables": total_variables - created_variables,
+            "removed_by_rule": removed_by_rule,
+        }
+
+        return self.eligible_classrooms
+
+    def print_variables_report(self):
+        print("========= VARIABLES ==========")
+        print(f"Total: {self.variables_report['total_variables']}")
+        print(f"Criadas: {self.variables_report['created_variables']}")
+        print(f"Removidas: {self.variables_report['removed_variables']}")
+        for rule, qtty in self.variables_report["removed_by_rule"].items():
+            print(f"  {rule}: {qtty}")
+        print("==============================")
+
+    def get_free_classrooms(self, classroom: str, day: str, time: str) -> int:
+        """Counts the classrooms of the group that are not occupied in the slot."""
+        return sum(
+            (member, day, time) not in self.occupied_slots
+            for member in self.classroom_groups[classroom]
+        )
 
-    def init_environment(self):
-        if settings.APP_LICENSE_TYPE == settings.LicenseType.NAMED_USER_ACADEMIC.value:
-            env = gp.Env(empty=False)
+    def is_eligible(self, classroom: str, section: str) -> bool:
+        if self.eligible_classrooms is None:
+            self.filter_eligible_classrooms()
 
-        elif settings.APP_LICENSE_TYPE == settings.LicenseType.WSL_ACADEMIC.value:
-            env = gp.Env(empty=True)
-            env.setParam("LicenseID", settings.APP_LICENSE_ID)
-            env.setParam("WLSAccessID", settings.APP_WLS_ACCESS_ID)
-            env.setParam("WLSSecret", settings.APP_WS_SECRET)
+        return classroom in self.eligible_classrooms[section]
 
-        env.start()
+    def get_eligible_pairs(self) -> list:
+        if self.eligible_classrooms is None:
+            self.filter_eligible_classrooms()
 
-        return env
+        return self.eligible_pairs
+
+    def check_feasibility(self) -> list:
+        """
+        Looks for infeasibilities that are visible without building the model, in
+        time proportional to the eligible (classroom, section) pairs. An empty
+        result does not mean the model is feasible.
+
+        Returns:
+            list: The `Infeasibility` found, with the sections and slots involved.
+        """
+        if self.eligible_classrooms is None:
+            self.filter_eligible_classrooms()
+
+        new_students_classroom = self.parameters.new_students_classroom
+
+        return check_sections(
+            self.classrooms,
+            self.sections,
+            self.eligible_classrooms,
+            new_students_classroom,
+        ) + check_slots(
+            self.classrooms,
+            self.schedule,
+            self.eligible_classrooms,
+            self.occupied_slots,
+            new_students_classroom,
+        )
+
+    def ensure_feasibility(self):
+        """Raises before building the model when `check_feasibility` finds a problem."""
+        infeasibilities = self.check_feasibility()
+
+        if infeasibilities:
+            print_infeasibility_report(infeasibilities)
+            raise Exception(
+                f"Pre-check found {len(infeasibilities)} infeasibilities. "
+                "The model was not built."
+            )
 
     def initialize_variables_and_coefficients(self):
-        for classroom in self.classrooms:
-            self.coefficients[classroom] = {}
-            self.variables[classroom] = {}
-
-            for section in self.sections.keys():
-                self.coefficients[classroom][section] = {}
-                self.variables[classroom][section] = {}
-
-                days, times = utils.get_section_schedule(self.sections, section)
-
-                for day, time in zip(days, times):
-
-                    if day not in self.coefficients[classroom][section]:
-                        self.coefficients[classroom][section][day] = {}
-
-                    if (
-                        self.sections[section]["responsable_institute"]
-                        == self.classrooms[classroom]["responsable_institute"]
-                    ):
-                        self.coefficients[classroom][section][day][
-                            time
-                        ] = RESPONSIBLE_INSTITUTE_COEFFICIENT
-                    else:
-                        self.coefficients[classroom][section][day][
-                            time
-                        ] = DEFAULT_COEFFICIENT
-
-                    if day not in self.variables[classroom][section]:
-                        self.variables[classroom][section][day] = {}
-
-                    self.variables[classroom][section][day][time] = self.model.addVar(
-                        vtype=GRB.BINARY, name=f"{classroom}_{section}_{day}_{time}"
-                    )
+        self.variable_keys = []
+        self.coefficients = []
+        self.constraint_keys = []
+        self.section_classrooms = {section: [] for section in self.sections}
 
-    def add_capacity_slack_variables(self):
-        for classroom in self.classrooms:
-            self.slack_variables_capacity_diff[classroom] = {}
-
-            for section in self.sections:
-                self.slack_variables_capacity_diff[classroom][section] = (
-                    self.model.addVar(
-                        vtype=GRB.INTEGER,
-                        name=f"CapDiff_{classroom}_{section}",
-                        lb=0.0,
-                        ub=float("inf"),
-                    )
-                )
+        for classroom, section in self.get_eligible_pairs():
+            self.section_classrooms[section].append(classroom)
 
-    def add_constraints(self):
-        sections_days, sections_times = utils.get_possible_schedules_v2(self.sections)
+            if (
+                self.sections[section].responsable_institute
+                == self.classrooms[classroom].responsable_institute
+            ):
+                coefficient = self.parameters.responsible_institute_coefficient
+            else:
+                coefficient = self.parameters.default_coefficient
 
-        # Soft constraints
-        for classroom in self.classrooms:
-            for section in self.sections:
-                days, times = utils.get_section_schedule(self.sections, section)
+            for day, time in self.sections[section].slots:
+                self.variable_keys.append((classroom, section, day, time))
+                self.coefficients.append(coefficient)
 
-                TOLERANCE = 1e-6  # Defina uma tolerância pequena
+        # Sem nomes: a identificação das variáveis é feita pelas chaves
+        self.variables = self.backend.add_variables(
+            self.variable_keys,
+            VariableType.BINARY,
+            ub=[
+                1 if self.get_free_classrooms(classroom, day, time) else 0
+                for classroom, _, day, time in self.variable_keys
+            ],
+        )
 
-                for day, time in zip(days, times):
-                    slack_var = self.model.addVar(
-                        vtype=GRB.CONTINUOUS, name=f"tolerance_slack"
-                    )
+    def add_capacity_slack_variables(self):
+        if self.objective_mode == settings.ObjectiveMode.LINEAR.value:
+            self.add_capacity_diff_coefficients()
+            return
 
-                    # RF2: Garante que a sala seja alocada com a menor capacidade possível
-                    self.model.addConstr(
-                        self.slack_variables_capacity_diff[classroom][section]
-                        <= self.classrooms[classroom][
-                            "capacity"
-                        ]  # TODO: testando a questão da tolerancia do erro
-                        - (
-                            self.variables[classroom][section][day][time]
-                            * self.sections[section]["capacity"]
-                        )
-                        + slack_var
-                    )
+        self.slack_variables_capacity_diff = self.backend.add_variables(
+            self.get_eligible_pairs(),
+            VariableType.INTEGER,
+            lb=0,
+            ub=float("inf"),
+            name="CapDiff",
+        )
 
-                    # Adicione uma restrição para garantir que a variável de folga esteja dentro da tolerância
-                    self.model.addConstr(slack_var <= TOLERANCE)
+    def add_capacity_diff_coefficients(self):
+        """
+        Linear alternative to the capacity slack variables: since the eligibility filter
+        already discards classrooms smaller than the section, the capacity difference of
+        each pair is a constant that can be weighted directly in the objective (RF2).
+        """
+        for classroom, section in self.get_eligible_pairs():
+            self.capacity_diff_coefficients[classroom, section] = (
+                self.classrooms[classroom].capacity - self.sections[section].capacity
+            )
+
+    def add_constraints(self):
+        if self.objective_mode == settings.ObjectiveMode.QUADRATIC.value:
+            self.add_capacity_slack_constraints()
+
+        # Agrupa as variáveis em uma única passada, em vez de um select por restrição
+        classroom_slot_variables = {}
+        section_slot_variables = {}
+        for classroom, section, day, time in self.variable_keys:
+            variable = self.variables[classroom, section, day, time]
+            classroom_slot_variables.setdefault((classroom, day, time), []).append(
+                variable
+            )
+            section_slot_variables.setdefault((section, day, time), []).append(variable)
+
+        contested_slots = self.get_contested_classroom_slots() if self.lazy_rn1 else None
+        self.lazy_rn1_slots = []
 
         # Hard constraints
         # RN1: Um sala poderá ser alocada para no máximo 1 uma turma em um mesmo dia e horário (binário)
-        for classroom in self.classrooms:
-            for i in range(len(sections_days)):
-                day = sections_days[i]
-                time = sections_times[i]
-
-                exact_time_sections = utils.get_courses_by_exact_day_and_time(
-                    self.sections, day, time
-                )
+        # Com salas agrupadas, o grupo recebe no máximo uma turma por sala livre
+        for (classroom, day, time), variables in classroom_slot_variables.items():
+            free_classrooms = self.get_free_classrooms(classroom, day, time)
 
-                self.model.addConstr(
-                    gp.quicksum(
-                        self.variables[classroom][section][day][time]
-                        for section in exact_time_sections
+            # Com LAZY_RN1 só as salas disputadas entram no modelo; as demais são
+            # adicionadas pelo solver quando uma solução as viola
+            if self.lazy_rn1 and (classroom, day, time) not in contested_slots:
+                if len(variables) > free_classrooms > 0:
+                    self.backend.add_lazy_constraint(
+                        variables, LESS_EQUAL, free_classrooms
                     )
-                    <= 1,
-                    name=f"RN1:Section_{section}_{classroom}_{day}_{time}",
-                )
+                    self.lazy_rn1_slots.append((classroom, day, time))
+                continue
+
+            self.constraint_keys.append(
+                ConstraintKey("RN1", classroom=classroom, day=day, time=time)
+            )
+            self.backend.add_constraint(
+                variables,
+                LESS_EQUAL,
+                free_classrooms,
+                name=f"RN1:Classroom_{classroom}_{day}_{time}",
+            )
 
-        for section in self.sections.keys():
-            days, times = utils.get_section_schedule(self.sections, section)
-            for day, time in zip(days, times):
+        for section, details in self.sections.items():
+            for day, time in details.slots:
                 # RN2: Uma seção deverá ter somente uma sala de aula para um mesmo dia e horário
-                self.model.addConstr(
-                    gp.quicksum(
-                        self.variables[classroom][section][day][time]
-                        for classroom in self.classrooms
-                    )
-                    == 1,
-                    name=f"RN2:Section_{section}_{classroom}_{day}_{time}",
+                self.constraint_keys.append(
+                    ConstraintKey("RN2", section=section, day=day, time=time)
+                )
+                self.backend.add_constraint(
+                    section_slot_variables.get((section, day, time), []),
+                    EQUAL,
+                    1,
+                    name=f"RN2:Section_{section}_{day}_{time}",
                 )
 
         # RN3: O tipo de sala deverá ser o mesmo requerido na alocação da disciplina
-        for section in self.sections:
-            days, times = utils.get_section_schedule(self.sections, section)
-            classroom_types = self.sections[section]["classroom_type"].split(",")
-
-            if len(classroom_types) == 1:
-                classroom_types = [classroom_types[0]] * len(days)
-
-            qtty_theory_classroom = classroom_types.count("Teórica")
-            qtty_practical_classroom = classroom_types.count("Prática")
-
-            self.model.addConstr(
-                gp.quicksum(
-                    self.variables[classroom][section][day][time]
-                    for classroom in self.classrooms
-                    if self.classrooms[classroom]["classroom_type"] == "Sala"
-                    for day, time in zip(days, times)
-                )
-                == qtty_theory_classroom,
+        for section, details in self.sections.items():
+            self.constraint_keys.append(
+                ConstraintKey("RN3", section=section, classroom_type="Sala")
+            )
+            self.backend.add_constraint(
+                [
+                    self.variables[classroom, section, day, time]
+                    for classroom in self.section_classrooms[section]
+                    if self.classrooms[classroom].classroom_type == ClassroomType.SALA
+                    for day, time in details.slots
+                ],
+                EQUAL,
+                details.theory_slots,
                 name=f"RN3:Section_Theory_{section}",
             )
 
-            self.model.addConstr(
-                gp.quicksum(
-                    self.variables[classroom][section][day][time]
-                    for classroom in self.classrooms
-                    if self.classrooms[classroom]["classroom_type"] == "Laboratório"
-                    for day, time in zip(days, times)
-                )
-                == qtty_practical_classroom,
+            self.constraint_keys.append(
+                ConstraintKey("RN3", section=section, classroom_type="Laboratório")
+            )
+            self.backend.add_constraint(
+                [
+                    self.variables[classroom, section, day, time]
+                    for classroom in self.section_classrooms[section]
+                    if self.classrooms[classroom].classroom_type
+                    == ClassroomType.LABORATORIO
+                    for day, time in details.slots
+                ],
+                EQUAL,
+                details.practical_slots,
                 name=f"RN3:Section_Practical_{section}",
             )
 
-        for section in self.sections:
+        new_students_classroom = self.parameters.new_students_classroom
+
+        for section, details in self.sections.items():
 
             # RN4: Caso a disciplina seja do primeiro período e for turma de calouro,
             # uma sala específica deverá ser ocupada para as aulas teóricas (F3014)
-            if (
-                self.sections[section]["term"] == 1
-                and self.sections[section]["class_type"] == "Calouro"
-            ):
-
-                days, times = utils.get_section_schedule(self.sections, section)
-                classroom_types = self.sections[section]["classroom_type"].split(",")
-                qtty_theory_classroom = classroom_types.count("Teórica")
-
-                if qtty_theory_classroom == len(classroom_types):
-                    qtty_theory_classroom = len(times)
-
-                classroom_new_students = "F3014"
-                self.model.addConstr(
-                    gp.quicksum(
-                        self.variables[classroom_new_students][section][day][time]
-                        for day, time in zip(days, times)
+            if details.is_new_students and new_students_classroom is not None:
+                self.constraint_keys.append(
+                    ConstraintKey(
+                        "RN4", section=section, classroom=new_students_classroom
                     )
-                    == qtty_theory_classroom,
+                )
+                self.backend.add_constraint(
+                    [
+                        self.variables[new_students_classroom, section, day, time]
+                        for day, time in details.slots
+                        if (new_students_classroom, section, day, time) in self.variables
+                    ],
+                    EQUAL,
+                    details.theory_slots,
                     name=f"RN4:F3014_NewStudents_{section}",
                 )
 
             # RN5: Se a seção tiver alguma restrição de quadro, levar em consideração
 
-            if self.sections[section]["blackboard_restriction"]:
-                days, times = utils.get_section_schedule(self.sections, section)
-
-                self.model.addConstr(
-                    gp.quicksum(
-                        self.variables[classroom][section][day][time]
-                        for classroom in self.classrooms
-                        if utils.is_blackboard(self.classrooms[classroom])
-                        for day, time in zip(days, times)
-                    )
-                    == 0,
-                    name=f"RN5:Board_Restriction_{section}_{classroom}_{day}_{time}",
+            if details.blackboard_restriction:
+                self.constraint_keys.append(ConstraintKey("RN5", section=section))
+                self.backend.add_constraint(
+                    [
+                        self.variables[classroom, section, day, time]
+                        for classroom in self.section_classrooms[section]
+                        if self.classrooms[classroom].is_blackboard
+                        for day, time in details.slots
+                    ],
+                    EQUAL,
+                    0,
+                    name=f"RN5:Board_Restriction_{section}",
                 )
 
+    def get_contested_classroom_slots(self) -> set:
+        """
+        Finds the (classroom, day, time) that are the best classroom, by objective
+        coefficient, of more than one section in that slot. These are the first RN1
+        conflicts of a model without RN1, so their constraints are not left lazy.
+        """
+        best_classrooms = {}
+
+        for (classroom, section, day, time), coefficient in zip(
+            self.variable_keys, self.coefficients
+        ):
+            score = coefficient - self.parameters.capacity_diff_coefficient * abs(
+                self.classrooms[classroom].capacity - self.sections[section].capacity
+            )
+            best = best_classrooms.get((section, day, time))
+
+            if best is None or score > best[0]:
+                best_classrooms[section, day, time] = (score, classroom)
+
+        qtty_sections = Counter(
+            (classroom, day, time)
+            for (_, day, time), (_, classroom) in best_classrooms.items()
+        )
+
+        return {
+            slot
+            for slot, qtty in qtty_sections.items()
+            if qtty > self.get_free_classrooms(*slot)
+        }
+
+    def add_capacity_slack_constraints(self):
+        # Soft constraints
+        TOLERANCE = 1e-6  # Defina uma tolerância pequena
+
+        slack_vars = self.backend.add_variables(
+            self.variable_keys,
+            VariableType.CONTINUOUS,
+            ub=float("inf"),
+            name="tolerance_slack",
+        )
+
+        # RF2: A sala deve comportar as vagas da seção, com a tolerância
+        # x * vagas da seção <= capacidade da sala + tolerância + folga
+        for classroom, section, day, time in self.variable_keys:
+            self.constraint_keys.append(
+                ConstraintKey("RF2", section, classroom, day, time)
+            )
+            self.backend.add_constraint(
+                [
+                    self.variables[classroom, section, day, time],
+                    slack_vars[classroom, section, day, time],
+                ],
+                LESS_EQUAL,
+                # TODO: testando a questão da tolerancia do erro
+                self.classrooms[classroom].capacity
+                + self.parameters.capacity_tolerance,
+                coefficients=[self.sections[section].capacity, -1.0],
+            )
+
+        # RF2: CapDiff >= x * |capacidade da sala - vagas da seção|, para que o termo
+        # quadrático pese as vagas sobrando ou faltando em vez de levar CapDiff a zero
+        for classroom, section, day, time in self.variable_keys:
+            self.constraint_keys.append(
+                ConstraintKey("RF2", section, classroom, day, time)
+            )
+            self.backend.add_constraint(
+                [
+                    self.slack_variables_capacity_diff[classroom, section],
+                    self.variables[classroom, section, day, time],
+                ],
+                GREATER_EQUAL,
+                0,
+                coefficients=[
+                    1.0,
+                    -abs(
+                        self.classrooms[classroom].capacity
+                        - self.sections[section].capacity
+                    ),
+                ],
+            )
+
+        # Adicione uma restrição para garantir que a variável de folga esteja dentro da tolerância
+        for classroom, section, day, time in self.variable_keys:
+            self.constraint_keys.append(
+                ConstraintKey("RF2", section, classroom, day, time)
+            )
+            self.backend.add_constraint(
+                [slack_vars[classroom, section, day, time]], LESS_EQUAL, TOLERANCE
+            )
+
     def set_objective(self):
-        self.model.setObjective(
-            gp.quicksum(
-                self.variables[classroom][section][day][time]
-                * self.coefficients[classroom][section][day][time]
-                for classroom in self.classrooms
-                for section in self.sections.keys()
-                for day, time in zip(
-                    utils.get_section_schedule(self.sections, section)[0],
-                    utils.get_section_schedule(self.sections, section)[1],
-                )
+        if self.objective_mode == settings.ObjectiveMode.QUADRATIC.value:
+            self.set_quadratic_objective()
+            return
+
+        # RF2: Penaliza a diferença de capacidade de cada par para preferir a menor sala possível.
+        # Com capacity_tolerance, as vagas que faltam pesam como as que sobram
+        objective_coefficients = [
+            coefficient
+            - self.parameters.capacity_diff_coefficient
+            * abs(self.capacity_diff_coefficients[classroom, section])
+            for (classroom, section, _, _), coefficient in zip(
+                self.variable_keys, self.coefficients
             )
-            - gp.quicksum(
-                self.variables[classroom][section][day][time]
-                * self.slack_variables_capacity_diff[classroom][section]
-                for classroom in self.classrooms
-                for section in self.sections.keys()
-                for day, time in zip(
-                    utils.get_section_schedule(self.sections, section)[0],
-                    utils.get_section_schedule(self.sections, section)[1],
+        ]
+
+        self.backend.set_objective(
+            list(self.variables.values()), objective_coefficients
+        )
+
+    def set_quadratic_objective(self):
+        self.backend.set_objective(
+            list(self.variables.values()),
+            self.coefficients,
+            quadratic_terms=[
+                (
+                    -self.parameters.capacity_diff_coefficient,
+                    self.variables[classroom, section, day, time],
+                    self.slack_variables_capacity_diff[classroom, section],
                 )
-            ),
-            GRB.MAXIMIZE,
+                for classroom, section, day, time in self.variable_keys
+            ],
+        )
+
+    def build_model(self, model_cache: bool = False) -> bool:
+        """
+        Creates the variables, constraints and objective. With `model_cache`, the
+        model built for the same input and options is read from the cache instead,
+        and a newly built model is written to it.
+
+        Returns:
+            bool: Whether the model was read from the cache.
+        """
+        start = perf_counter()
+
+        if model_cache and self.load_cached_model():
+            print("========= MODEL CACHE ==========")
+            print(f"Hit: modelo lido em {perf_counter() - start:.3f}s")
+            print("================================")
+            return True
+
+        self.initialize_variables_and_coefficients()
+        self.add_capacity_slack_variables()
+        self.add_constraints()
+        self.set_objective()
+
+        if model_cache:
+            build_time = perf_counter() - start
+            self.save_cached_model()
+            print("========= MODEL CACHE ==========")
+            print(f"Miss: modelo construído em {build_time:.3f}s")
+            print(f"Gravado em {perf_counter() - start - build_time:.3f}s")
+            print("================================")
+
+        return False
+
+    def get_model_fingerprint(self) -> str:
+        return get_model_fingerprint(
+            self.classrooms,
+            self.sections,
+            {
+                "version": MODEL_CACHE_VERSION,
+                "objective_mode": self.objective_mode,
+                "solver": self.backend.name,
+                "occupied_slots": sorted(self.occupied_slots),
+                "parameters": list(self.parameters),
+                "lazy_rn1": self.lazy_rn1,
+                "aggregate_classrooms": self.aggregate_classrooms,
+            },
+        )
+
+    def save_cached_model(self, directory: str = None):
+        """
+        Writes the built model as MPS, together with the variable keys and the
+        eligibility data needed to use it without building it again.
+        """
+        model_path, keys_path = get_model_cache_paths(
+            self.get_model_fingerprint(), directory
+        )
+        os.makedirs(os.path.dirname(model_path), exist_ok=True)
+
+        self.backend.write_model(model_path)
+        save_model_keys(
+            keys_path,
+            {
+                "variable_keys": self.variable_keys,
+                "coefficients": self.coefficients,
+                "eligible_pairs": self.eligible_pairs,
+                "variables_report": self.variables_report,
+                "capacity_diff_coefficients": self.capacity_diff_coefficients,
+                "lazy_rn1_slots": self.lazy_rn1_slots,
+                "constraint_keys": self.constraint_keys,
+            },
+        )
+
+    def load_cached_model(self, directory: str = None) -> bool:
+        """
+        Reads the model saved by `save_cached_model` for the same input and options.
+        The variables are matched to their keys by creation order: the assignment
+        variables first and then, in the quadratic mode, the capacity slack ones.
+
+        Returns:
+            bool: Whether a cached model was found.
+        """
+        model_path, keys_path = get_model_cache_paths(
+            self.get_model_fingerprint(), directory
         )
+        keys = load_model_keys(keys_path)
+
+        if keys is None or not os.path.exists(model_path):
+            return False
+
+        variables = self.backend.read_model(model_path)
+
+        self.variable_keys = keys["variable_keys"]
+        self.coefficients = keys["coefficients"]
+        self.eligible_pairs = keys["eligible_pairs"]
+        self.variables_report = keys["variables_report"]
+        self.capacity_diff_coefficients = keys["capacity_diff_coefficients"]
+        self.constraint_keys = keys["constraint_keys"]
+
+        self.eligible_classrooms = {section: set() for section in self.sections}
+        for classroom, section in self.eligible_pairs:
+            self.eligible_classrooms[section].update(self.classroom_groups[classroom])
+
+        qtty_variables = len(self.variable_keys)
+        self.variables = dict(zip(self.variable_keys, variables[:qtty_variables]))
+
+        if self.objective_mode == settings.ObjectiveMode.QUADRATIC.value:
+            self.slack_variables_capacity_diff = dict(
+                zip(self.eligible_pairs, variables[qtty_variables:])
+            )
+
+        # As restrições lazy não fazem parte do arquivo do modelo
+        self.lazy_rn1_slots = keys["lazy_rn1_slots"]
+        lazy_rn1_variables = {slot: [] for slot in self.lazy_rn1_slots}
+        for (classroom, section, day, time), variable in self.variables.items():
+            if (classroom, day, time) in lazy_rn1_variables:
+                lazy_rn1_variables[classroom, day, time].append(variable)
+
+        for slot, slot_variables in lazy_rn1_variables.items():
+            self.backend.add_lazy_constraint(
+                slot_variables, LESS_EQUAL, self.get_free_classrooms(*slot)
+            )
+
+        return True
+
+    def set_warm_start(self, filename: str = utils.ASSIGNMENT_PATH) -> dict:
+        """
+        Uses a previous assignment.csv as MIP start. Each row (classroom, professor,
+        graduation course, course, course name, term, day, time) is matched to the
+        current section with the same course, professor, graduation course and slot.
+
+        Returns:
+            dict: How many rows were read, set as start, had no matching section or
+                had no variable (the classroom is not eligible anymore).
+        """
+        rows = utils.read_results_from_csv(filename)
+        assignment, without_section = utils.match_results_to_sections(
+            rows, self.sections
+        )
+
+        report = {
+            "rows": len(rows),
+            "matched": 0,
+            "without_section": without_section,
+            "without_variable": 0,
+        }
+
+        for classroom, section, day, time in assignment:
+            variable = self.variables.get(
+                (self.classroom_representatives.get(classroom), section, day, time)
+            )
+
+            if variable is None:
+                report["without_variable"] += 1
+                continue
+
+            self.backend.set_start(variable, 1)
+            report["matched"] += 1
+
+        print("========= WARM START ==========")
+        print(f"Linhas: {report['rows']}")
+        print(f"Dicas aplicadas: {report['matched']}")
+        print(f"Sem seção: {report['without_section']}")
+        print(f"Sem variável: {report['without_variable']}")
+        print("===============================")
+
+        return report
+
+    def set_heuristic_start(self) -> HeuristicResult:
+        """
+        Uses the assignment of `allocate_greedy` as MIP start. The slots it leaves
+        without a classroom are left for the solver to complete.
+
+        Returns:
+            HeuristicResult: The heuristic assignment.
+        """
+        result = allocate_greedy(
+            self.classrooms, self.sections, self.parameters, self.occupied_slots
+        )
+
+        for classroom, section, day, time in result.assignment:
+            variable = self.variables.get(
+                (self.classroom_representatives[classroom], section, day, time)
+            )
+            if variable is not None:
+                self.backend.set_start(variable, 1)
+
+        print("========= HEURISTIC START ==========")
+        print(f"Horários alocados: {len(result.assignment)}")
+        print(f"Horários sem sala: {len(result.unallocated)}")
+        print(f"Obj: {result.objective_value}")
+        print("====================================")
+
+        return result
 
     def optimize(self):
-        self.model.update()
-        self.model.optimize()
+        self.backend.optimize()
 
     def clean_model(self):
-        self.model.dispose()
-        self.env.dispose()
+        self.backend.dispose()
 
-    def generate_results(self):
+    def diagnose_sub_model(self, sections: dict, slot: tuple = None) -> Conflict:
+        """
+        Solves the model of a subset of the sections, with the same classrooms,
+        occupied slots and parameters, and computes its IIS when it is infeasible.
 
-        if self.model.Status == 2:
-            print(f"Optimal solution found. Model return status={self.model.Status}")
+        Returns:
+            Conflict: The IIS of the sub-model, or None when it is feasible.
+        """
+        # O objetivo não altera a viabilidade: o modo linear cria menos variáveis
+        sub_model = ClassroomAssignment(
+            self.classrooms,
+            sections,
+            objective_mode=settings.ObjectiveMode.LINEAR.value,
+            occupied_slots=self.occupied_slots,
+            solver=self.solver,
+            backend_options=(
+                {"env": self.backend.env}
+                if self.solver == settings.Solver.GUROBI.value
+                else None
+            ),
+            parameters=self.parameters,
+            lazy_rn1=False,
+            aggregate_classrooms=False,
+        )
+
+        try:
+            sub_model.backend.set_output(False)
+            sub_model.build_model()
+            sub_model.optimize()
+
+            if sub_model.backend.status != SolverStatus.INFEASIBLE:
+                return None
+
+            try:
+                iis_constraints, iis_bounds = sub_model.backend.compute_iis()
+            except NotImplementedError:
+                constraints = None
+            else:
+                constraints = explain_iis(
+                    sub_model.constraint_keys,
+                    sub_model.variable_keys,
+                    iis_constraints,
+                    iis_bounds,
+                    self.occupied_slots,
+                )
+
+            return Conflict(slot, tuple(sections), constraints)
+        finally:
+            sub_model.clean_model()
+
+    def diagnose_infeasibility(self) -> list:
+        """
+        Isolates the infeasibility in small sub-models before computing an IIS,
+        which on the whole model is slow and hard to read. Each (day, time) slot is
+        solved alone first (see `get_slot_relaxation`); only when every slot is
+        feasible, the components of sections that share slots are solved.
+
+        Returns:
+            list: The `Conflict` of each infeasible sub-model found.
+        """
+        conflicts = []
+
+        for slot, slot_sections in self.schedule.slot_sections.items():
+            relaxation = get_slot_relaxation(
+                {section: self.sections[section] for section in slot_sections}, slot
+            )
+            if not relaxation:
+                continue
+
+            conflict = self.diagnose_sub_model(relaxation, slot)
+            if conflict:
+                conflicts.append(conflict)
+
+        if conflicts:
+            return conflicts
+
+        # A inviabilidade depende de mais de um horário (RN3 ou RN4 das seções)
+        for component in utils.get_independent_components(self.schedule):
+            conflict = self.diagnose_sub_model(
+                {section: self.sections[section] for section in component}
+            )
+            if conflict:
+                conflicts.append(conflict)
+
+        return conflicts
+
+    def get_results(self) -> tuple:
+        """
+        Reads the solution of an optimal model in bulk from the stored variables.
+
+        Returns:
+            tuple: The `Allocation` rows of the chosen variables and the
+                `CapacityDiff` rows of the classrooms assigned to the sections.
+        """
+        values = self.backend.get_values(self.variables)
+        assignment = [
+            utils.Allocation(*key) for key in self.variable_keys if values[key] > 0.5
+        ]
+
+        if self.aggregate_classrooms:
+            assignment = disaggregate_assignment(
+                assignment, self.classroom_groups, self.occupied_slots
+            )
+
+        if self.objective_mode == settings.ObjectiveMode.LINEAR.value:
+            pairs = dict.fromkeys(
+                (allocation.classroom, allocation.section) for allocation in assignment
+            )
+            cap_diff = [
+                utils.CapacityDiff(
+                    classroom,
+                    section,
+                    float(
+                        self.capacity_diff_coefficients[
+                            self.classroom_representatives[classroom], section
+                        ]
+                    ),
+                )
+                for classroom, section in pairs
+            ]
         else:
-            self.model.computeIIS()
-            self.model.write("model.ilp")
-            raise Exception(f"Model return status={self.model.Status}")
+            values = self.backend.get_values(self.slack_variables_capacity_diff)
+            cap_diff = [
+                utils.CapacityDiff(classroom, section, value)
+                for (classroom, section), value in values.items()
+                if value > 0
+            ]
 
-        classroom_assignement = []
-        for var in self.model.getVars():
-            if var.X > 0 and "tolerance_slack" not in var.VarName:
-                timeschedule = f"{var.VarName}#{var.X}"
-                classroom_assignement.append(timeschedule)
+            if self.aggregate_classrooms:
+                # A folga é do grupo: vale para as salas do grupo usadas pela seção
+                section_classrooms = {}
+                for allocation in assignment:
+                    classrooms = section_classrooms.setdefault(
+                        (
+                            self.classroom_representatives[allocation.classroom],
+                            allocation.section,
+                        ),
+                        [],
+                    )
+                    if allocation.classroom not in classrooms:
+                        classrooms.append(allocation.classroom)
 
-        model_value = self.model.ObjVal
+                cap_diff = [
+                    utils.CapacityDiff(member, section, value)
+                    for classroom, section, value in cap_diff
+                    for member in section_classrooms.get(
+                        (classroom, section), [classroom]
+                    )
+                ]
 
-        utils.treat_and_save_results(classroom_assignement, self.sections)
+        return assignment, cap_diff
 
-        print("========= METHOD ==========")
-        print(self.model.getParamInfo("Method"))
-        print(self.model.getParamInfo("ConcurrentMethod"))
-        print(self.model.getParamInfo("ConcurrentMIP"))
+    def generate_results(self):
 
-        print(f"É MIP: {self.model.getAttr(GRB.Attr.IsMIP)}")
-        print(f"É QP: {self.model.getAttr(GRB.Attr.IsQP)}")
-        print(f"É QCP: {self.model.getAttr(GRB.Attr.IsQCP)}")
-        print(f"É MultiObj: {self.model.getAttr(GRB.Attr.IsMultiObj)}")
-        print("=============================")
+        status = self.backend.status
+
+        if status == SolverStatus.OPTIMAL:
+            print(f"Optimal solution found. Model return status={status.value}")
+        elif status == SolverStatus.INFEASIBLE and settings.APP_DIAGNOSIS:
+            conflicts = self.diagnose_infeasibility()
+            print_diagnosis(conflicts)
+            save_diagnosis(DIAGNOSIS_PATH, conflicts)
+            raise Exception(f"Model return status={status.value}")
+        else:
+            self.backend.write_infeasibility_report("model.ilp")
+            raise Exception(f"Model return status={status.value}")
+
+        assignment, cap_diff = self.get_results()
+        model_value = self.backend.objective_value
+
+        utils.treat_and_save_results(assignment, self.sections, cap_diff)
+        save_snapshot(SNAPSHOT_PATH, self.classrooms, self.sections, assignment)
+
+        self.backend.print_method_info()
 
         print("========= RESULT ==========")
         print("Result was saved in results/*")
         print("=============================")
         print(f"Obj: {model_value}")
 
-        return classroom_assignement, model_value
+        return assignment, model_value
 
 
-def main():
-    CLASSROOMS = get_classrooms_set()
-    COURSES = get_sections_set()
+def solve_section_component(
+    classrooms: dict, sections: dict, objective_mode: str
+) -> tuple:
+    """
+    Builds and solves the model of a subset of sections that shares no (day, time)
+    slot with the other sections.
 
-    timetabling = ClassroomAssignment(CLASSROOMS, COURSES)
-    timetabling.initialize_variables_and_coefficients()
-    timetabling.add_capacity_slack_variables()
-    timetabling.add_constraints()
-    timetabling.set_objective()
+    Returns:
+        tuple: The model status, the assignment and capacity differences as
+            returned by `get_results` and the objective value (None when the model
+            is not optimal).
+    """
+    timetabling = ClassroomAssignment(classrooms, sections, objective_mode=objective_mode)
+    timetabling.build_model()
     timetabling.optimize()
-    timetabling.generate_results()
+
+    status = timetabling.backend.status
+    assignment = []
+    cap_diff = []
+    model_value = None
+
+    if status == SolverStatus.OPTIMAL:
+        assignment, cap_diff = timetabling.get_results()
+        model_value = timetabling.backend.objective_value
+
     timetabling.clean_model()
 
+    return status, assignment, cap_diff, model_value
+
+
+def solve_decomposed(
+    classrooms: dict,
+    sections: dict,
+    max_workers: int = None,
+    objective_mode: str = settings.APP_OBJECTIVE_MODE,
+) -> tuple:
+    """
+    Splits the sections into independent components of the section-slot graph
+    (RN1 and RN2 only link sections of the same slot, RN3 to RN5 only the slots of
+    the same section), solves one model per component in a process pool and saves
+    the merged assignment.
+    """
+    classrooms = build_classrooms(classrooms)
+    sections = build_sections(sections)
+    schedule = utils.build_schedule_index(sections)
+    components = utils.get_independent_components(schedule)
+    print(f"Componentes independentes: {len(components)}")
+
+    with ProcessPoolExecutor(max_workers=get_max_workers(max_workers)) as executor:
+        futures = [
+            executor.submit(
+                solve_section_component,
+                classrooms,
+                {section: sections[section] for section in component},
+                objective_mode,
+            )
+            for component in components
+        ]
+        results = [future.result() for future in futures]
+
+    assignment = []
+    cap_diff = []
+    model_value = 0
+
+    for component, result in zip(components, results):
+        status, component_assignment, component_cap_diff, component_value = result
+
+        if status != SolverStatus.OPTIMAL:
+            raise Exception(
+                f"Model return status={status.value} for sections {sorted(map(str, component))}"
+            )
+
+        assignment.extend(component_assignment)
+        cap_diff.extend(component_cap_diff)
+        model_value += component_value
+
+    utils.treat_and_save_results(assignment, sections, cap_diff)
+    save_snapshot(SNAPSHOT_PATH, classrooms, sections, assignment)
+
+    print("========= RESULT ==========")
+    print("Result was saved in results/*")
+    print("=============================")
+    print(f"Obj: {model_value}")
+
+    return assignment, model_value
+
+
+def solve_incremental(
+    classrooms: dict,
+    sections: dict,
+    objective_mode: str = settings.APP_OBJECTIVE_MODE,
+) -> tuple:
+    """
+    Re-optimizes only the sections that changed since the last saved snapshot. The
+    other sections keep their classrooms, which stay occupied for the re-optimized
+    ones. Falls back to the full model when there is no snapshot or when the kept
+    assignment leaves no room for the changed sections.
+    """
+    classrooms = build_classrooms(classrooms)
+    sections = build_sections(sections)
+    snapshot = load_snapshot(SNAPSHOT_PATH)
+
+    if snapshot is None:
+        print("Snapshot not found. Solving the full model.")
+        return solve_full(classrooms, sections, objective_mode)
+
+    kept_assignment, affected_sections = diff_snapshot(snapshot, classrooms, sections)
+    print(f"Seções mantidas: {len(sections) - len(affected_sections)}")
+    print(f"Seções realocadas: {len(affected_sections)}")
+
+    # Sem seções alteradas, a alocação anterior é mantida sem montar um modelo vazio
+    if not affected_sections:
+        assignment, cap_diff, model_value = [], [], 0.0
+    else:
+        timetabling = ClassroomAssignment(
+            classrooms,
+            {section: sections[section] for section in affected_sections},
+            objective_mode=objective_mode,
+            occupied_slots={
+                (classroom, day, time) for classroom, _, day, time in kept_assignment
+            },
+        )
+        timetabling.build_model()
+        timetabling.optimize()
+
+        if timetabling.backend.status != SolverStatus.OPTIMAL:
+            print(
+                f"Incremental model return status={timetabling.backend.status.value}. "
+                "Solving the full model."
+            )
+            timetabling.clean_model()
+            return solve_full(classrooms, sections, objective_mode)
+
+        assignment, cap_diff = timetabling.get_results()
+        model_value = timetabling.backend.objective_value
+        timetabling.clean_model()
+
+    assignment += [utils.Allocation(*allocation) for allocation in kept_assignment]
+    cap_diff += [
+        utils.CapacityDiff(
+            classroom,
+            section,
+            float(classrooms[classroom].capacity - sections[section].capacity),
+        )
+        for classroom, section in dict.fromkeys(
+            (classroom, section) for classroom, section, _, _ in kept_assignment
+        )
+    ]
+
+    utils.treat_and_save_results(assignment, sections, cap_diff)
+    save_snapshot(SNAPSHOT_PATH, classrooms, sections, assignment)
+
+    print("========= RESULT ==========")
+    print("Result was saved in results/*")
+    print("=============================")
+    print(f"Obj (seções realocadas): {model_value}")
+
+    return assignment, model_value
+
+
+def solve_full(
+    classrooms: dict,
+    sections: dict,
+    objective_mode: str = settings.APP_OBJECTIVE_MODE,
+) -> tuple:
+    timetabling = ClassroomAssignment(classrooms, sections, objective_mode=objective_mode)
+    try:
+        if settings.APP_PRECHECK:
+            timetabling.ensure_feasibility()
+        timetabling.build_model(model_cache=settings.APP_MODEL_CACHE)
+        # Os dois MIP starts somados violariam a RN1: o da execução anterior prevalece
+        if settings.APP_WARM_START:
+            timetabling.set_warm_start()
+        elif settings.APP_HEURISTIC_START:
+            timetabling.set_heuristic_start()
+        timetabling.optimize()
+
+        return timetabling.generate_results()
+    finally:
+        timetabling.clean_model()
+
+
+def solve_heuristic(
+    classrooms: dict, sections: dict, parameters: ModelParameters = None
+) -> tuple:
+    """
+    Allocates the sections with `allocate_greedy`, without a solver or license, and
+    saves the results like `generate_results`.
+
+    Returns:
+        tuple: The assignment and its linear objective value.
+    """
+    classrooms = build_classrooms(classrooms)
+    sections = build_sections(sections)
+
+    result = allocate_greedy(classrooms, sections, parameters or ModelParameters())
+
+    utils.treat_and_save_results(
+        result.assignment,
+        sections,
+        get_capacity_diff(classrooms, sections, result.assignment),
+    )
+    save_snapshot(SNAPSHOT_PATH, classrooms, sections, result.assignment)
+
+    print("========= HEURISTIC ==========")
+    print(f"Horários alocados: {len(result.assignment)}")
+    print(f"Horários sem sala: {len(result.unallocated)}")
+    for section, day, time in result.unallocated:
+        print(f"  Seção {section}: {day} {time}")
+    print("Result was saved in results/*")
+    print("==============================")
+    print(f"Obj: {result.objective_value}")
+
+    return result.assignment, result.objective_value
+
+
+def main():
+    instrumentation = Instrumentation(enabled=settings.APP_INSTRUMENTATION)
+
+    with instrumentation.phase("load_data"):
+        CLASSROOMS, COURSES = get_classrooms_and_sections_sets()
+
+    if settings.APP_DECOMPOSITION:
+        with instrumentation.phase("solve_decomposed"):
+            solve_decomposed(
+                CLASSROOMS, COURSES, max_workers=settings.APP_MAX_WORKERS
+            )
+        instrumentation.save(RUN_REPORT_PATH)
+        return
+
+    if settings.APP_HEURISTIC:
+        with instrumentation.phase("solve_heuristic"):
+            solve_heuristic(CLASSROOMS, COURSES)
+        instrumentation.save(RUN_REPORT_PATH)
+        return
+
+    if settings.APP_INCREMENTAL:
+        with instrumentation.phase("solve_incremental"):
+            solve_incremental(CLASSROOMS, COURSES)
+        instrumentation.save(RUN_REPORT_PATH)
+        return
+
+    timetabling = ClassroomAssignment(CLASSROOMS, COURSES)
+
+    if settings.APP_PRECHECK:
+        with instrumentation.phase("check_feasibility"):
+            timetabling.ensure_feasibility()
+
+    if settings.APP_MODEL_CACHE:
+        with instrumentation.phase("build_model"):
+            timetabling.build_model(model_cache=True)
+        timetabling.print_variables_report()
+    else:
+        with instrumentation.phase("initialize_variables_and_coefficients"):
+            timetabling.initialize_variables_and_coefficients()
+        timetabling.print_variables_report()
+        with instrumentation.phase("add_capacity_slack_variables"):
+            timetabling.add_capacity_slack_variables()
+        with instrumentation.phase("add_constraints"):
+            timetabling.add_constraints()
+        with instrumentation.phase("set_objective"):
+            timetabling.set_objective()
+    # Os dois MIP starts somados violariam a RN1: o da execução anterior prevalece
+    if settings.APP_WARM_START:
+        with instrumentation.phase("set_warm_start"):
+            timetabling.set_warm_start()
+    elif settings.APP_HEURISTIC_START:
+        with instrumentation.phase("set_heuristic_start"):
+            timetabling.set_heuristic_start()
+    with instrumentation.phase("optimize"):
+        timetabling.optimize()
+    instrumentation.add_model_stats(timetabling.backend)
+
+    try:
+        with instrumentation.phase("generate_results"):
+            timetabling.generate_results()
+    finally:
+        instrumentation.save(RUN_REPORT_PATH)
+        timetabling.clean_model()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,251 @@
+import argparse
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import fnmatch
+
+import pandas as pd
+
+import settings
+
+from main import ClassroomAssignment, ModelParameters
+from solver.backend import SolverStatus, get_max_workers
+from database.records import build_classrooms, build_sections
+from database.transform_data import (
+    transform_sections_to_dict,
+    transform_classrooms_to_dict,
+)
+
+SCENARIO_KEYS = {"name", "close_classrooms", "classroom_capacity", "parameters"}
+RESULT_COLUMNS = [
+    "scenario",
+    "status",
+    "objective",
+    "rooms_used",
+    "capacity_waste",
+    "n_classrooms",
+    "num_vars",
+    "build_time",
+    "solve_time",
+]
+
+# Entrada compartilhada pelos processos, carregada uma vez por processo
+_classrooms = None
+_sections = None
+
+
+def load_scenarios(filename: str) -> list:
+    """
+    Reads and validates a JSON list of scenarios. Each scenario has a "name" and
+    optionally:
+
+    - "close_classrooms": glob patterns of classrooms left out, e.g. ["F*"].
+    - "classroom_capacity": new capacities, e.g. {"F3014": 80}.
+    - "parameters": `ModelParameters` overrides, e.g.
+      {"new_students_classroom": null, "capacity_tolerance": 5}.
+    """
+    with open(filename) as file:
+        scenarios = json.load(file)
+
+    for scenario in scenarios:
+        unknown_keys = set(scenario) - SCENARIO_KEYS
+        if "name" not in scenario or unknown_keys:
+            raise ValueError(
+                f"Invalid scenario {scenario.get('name')}: "
+                f"requires a name and accepts only {sorted(SCENARIO_KEYS)}"
+            )
+
+        # Falha antes de iniciar os processos se houver um parâmetro desconhecido
+        ModelParameters(**scenario.get("parameters", {}))
+
+    return scenarios
+
+
+def apply_scenario(classrooms: dict, scenario: dict) -> dict:
+    """
+    Returns:
+        dict: The `Classroom` records left open by the scenario, with its
+            capacities.
+    """
+    patterns = scenario.get("close_classrooms", [])
+    capacities = scenario.get("classroom_capacity", {})
+
+    return {
+        classroom: (
+            details._replace(capacity=capacities[classroom])
+            if classroom in capacities
+            else details
+        )
+        for classroom, details in classrooms.items()
+        if not any(fnmatch(str(classroom), pattern) for pattern in patterns)
+    }
+
+
+def init_worker(classrooms: dict, sections: dict):
+    global _classrooms, _sections
+    _classrooms = classrooms
+    _sections = sections
+
+
+def run_scenario(
+    scenario: dict,
+    objective_mode: str = settings.APP_OBJECTIVE_MODE,
+    solver: str = settings.APP_SOLVER,
+    time_limit: float = None,
+) -> dict:
+    """
+    Builds and solves the model of a scenario over the input shared by
+    `init_worker`.
+
+    Returns:
+        dict: The row of the scenario in the comparison table. The capacity waste
+            is the sum of the empty seats of each allocated slot.
+    """
+    classrooms = apply_scenario(_classrooms, scenario)
+
+    timetabling = ClassroomAssignment(
+        classrooms,
+        _sections,
+        objective_mode=objective_mode,
+        solver=solver,
+        parameters=ModelParameters(**scenario.get("parameters", {})),
+    )
+    timetabling.backend.set_output(False)
+    if time_limit:
+        timetabling.backend.set_time_limit(time_limit)
+
+    start = time.perf_counter()
+    timetabling.build_model()
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    timetabling.optimize()
+    solve_time = time.perf_counter() - start
+
+    status = timetabling.backend.status
+    result = {
+        "scenario": scenario["name"],
+        "status": status.value,
+        "objective": None,
+        "rooms_used": None,
+        "capacity_waste": None,
+        "n_classrooms": len(classrooms),
+        "num_vars": timetabling.backend.num_variables,
+        "build_time": build_time,
+        "solve_time": solve_time,
+    }
+
+    if status == SolverStatus.OPTIMAL:
+        assignment, _ = timetabling.get_results()
+        result["objective"] = timetabling.backend.objective_value
+        result["rooms_used"] = len({allocation.classroom for allocation in assignment})
+        result["capacity_waste"] = sum(
+            max(
+                0,
+                classrooms[allocation.classroom].capacity
+                - _sections[allocation.section].capacity,
+            )
+            for allocation in assignment
+        )
+
+    timetabling.clean_model()
+
+    return result
+
+
+def run_scenarios(
+    classrooms: dict,
+    sections: dict,
+    scenarios: list,
+    max_workers: int = None,
+    **options,
+) -> pd.DataFrame:
+    """
+    Solves every scenario in a process pool. The input is parsed once and sent
+    once to each process, not once per scenario.
+
+    Returns:
+        pd.DataFrame: The comparison table, one row per scenario, in order.
+    """
+    classrooms = build_classrooms(classrooms)
+    sections = build_sections(sections)
+
+    with ProcessPoolExecutor(
+        max_workers=get_max_workers(
+            max_workers, options.get("solver", settings.APP_SOLVER)
+        ),
+        initializer=init_worker,
+        initargs=(classrooms, sections),
+    ) as executor:
+        futures = [
+            executor.submit(run_scenario, scenario, **options) for scenario in scenarios
+        ]
+        results = [future.result() for future in futures]
+
+    return pd.DataFrame(results, columns=RESULT_COLUMNS)
+
+
+def load_input(dataset: str) -> tuple:
+    if dataset == "cache":
+        from benchmark import load_dataset
+
+        sections, classrooms = load_dataset("cache", None, None)
+        return transform_classrooms_to_dict(classrooms), transform_sections_to_dict(
+            sections
+        )
+
+    from database.construct_sets import get_classrooms_and_sections_sets
+
+    return get_classrooms_and_sections_sets()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Solves what-if scenarios of the model and compares them."
+    )
+    parser.add_argument("scenarios", help="JSON file with the list of scenarios")
+    parser.add_argument(
+        "--dataset",
+        default="spreadsheet",
+        choices=["spreadsheet", "cache"],
+        help="The spreadsheet, or the data cached from it in cache/*.csv",
+    )
+    parser.add_argument(
+        "--objective-mode",
+        default=settings.APP_OBJECTIVE_MODE,
+        choices=[mode.value for mode in settings.ObjectiveMode],
+    )
+    parser.add_argument(
+        "--solver",
+        default=settings.APP_SOLVER,
+        choices=[solver.value for solver in settings.Solver],
+    )
+    parser.add_argument("--time-limit", type=float, default=None)
+    parser.add_argument("--max-workers", type=int, default=settings.APP_MAX_WORKERS)
+    parser.add_argument(
+        "--output", default="classroom_assignment/results/scenarios.csv"
+    )
+    args = parser.parse_args()
+
+    scenarios = load_scenarios(args.scenarios)
+    classrooms, sections = load_input(args.dataset)
+
+    table = run_scenarios(
+        classrooms,
+        sections,
+        scenarios,
+        max_workers=args.max_workers,
+        objective_mode=args.objective_mode,
+        solver=args.solver,
+        time_limit=args.time_limit,
+    )
+    table.to_csv(args.output, index=False)
+
+    print("========= SCENARIOS ==========")
+    print(table.to_string(index=False))
+    print("==============================")
+    print(f"Comparison was saved in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
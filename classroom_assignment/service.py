@@ -0,0 +1,309 @@
+import json
+import os
+import sys
+
+import settings
+
+from main import SNAPSHOT_PATH, ClassroomAssignment, solve_incremental
+from solver.backend import SolverStatus
+from database.records import build_classrooms, build_sections
+from database.construct_sets import get_classrooms_and_sections_sets
+from utils import utils
+from utils.incremental import save_snapshot
+
+QUERY_SECTION = "__query__"
+
+
+def validate_section(details) -> dict:
+    """
+    Checks and converts the fields of a requested section before it is turned into
+    a `Section` record, like `transform_sections_to_dict` does for the spreadsheet.
+
+    Raises:
+        ValueError: When a field is missing or cannot be converted.
+    """
+    if not isinstance(details, dict):
+        raise ValueError("The section must be an object")
+
+    for field in ("day", "time"):
+        if not isinstance(details.get(field), str) or not details[field].strip():
+            raise ValueError(f"The section {field} is required")
+
+    days = details["day"].split(",")
+    times = details["time"].split(",")
+    if len(times) not in (1, len(days)):
+        raise ValueError("The section must have one time or one time per day")
+
+    details = dict(details)
+
+    for field in ("capacity", "term"):
+        if details.get(field) is None:
+            continue
+        try:
+            details[field] = int(details[field])
+        except (TypeError, ValueError):
+            raise ValueError(
+                f"The section {field} must be an integer: {details[field]!r}"
+            ) from None
+
+    if details.get("capacity", 0) < 0:
+        raise ValueError("The section capacity must not be negative")
+
+    restriction = details.get("blackboard_restriction")
+    if isinstance(restriction, str):
+        details["blackboard_restriction"] = restriction.strip().upper() == "TRUE"
+
+    return details
+
+
+class AllocationService:
+    """
+    Answers allocation requests over a loaded assignment, keeping the classrooms,
+    the sections and the slot index between requests. The Gurobi environment is
+    kept by the `ENVIRONMENT_POOL` of the process.
+
+    A new section is first placed alone, in the classrooms left free by the other
+    sections. When none is free, it is re-optimized together with the sections
+    that share one of its slots, which may then move to other classrooms.
+    """
+
+    def __init__(
+        self,
+        classrooms: dict,
+        sections: dict,
+        assignment: list = (),
+        objective_mode: str = settings.APP_OBJECTIVE_MODE,
+        solver: str = settings.APP_SOLVER,
+    ):
+        self.classrooms = build_classrooms(classrooms)
+        self.sections = build_sections(sections)
+        self.objective_mode = objective_mode
+        self.solver = solver
+
+        schedule = utils.build_schedule_index(self.sections)
+        self.slot_sections = {
+            slot: set(slot_sections)
+            for slot, slot_sections in schedule.slot_sections.items()
+        }
+
+        # section -> [(classroom, day, time)]
+        self.allocations = {}
+        for classroom, section, day, time in assignment:
+            self.allocations.setdefault(section, []).append((classroom, day, time))
+
+    @classmethod
+    def from_spreadsheet(cls, **options) -> "AllocationService":
+        """
+        Loads the spreadsheet and solves it like `INCREMENTAL=True`, paying the
+        start-up cost once.
+        """
+        classrooms, sections = get_classrooms_and_sections_sets()
+        assignment, _ = solve_incremental(classrooms, sections)
+
+        return cls(classrooms, sections, assignment, **options)
+
+    def reoptimize(self, sections: dict) -> dict:
+        """
+        Solves the model of the given sections in the classrooms that the other
+        sections leave free.
+
+        Returns:
+            dict: The (classroom, day, time) allocations of each given section, or
+                None when the sections do not fit.
+        """
+        occupied_slots = {
+            allocation
+            for section, allocations in self.allocations.items()
+            if section not in sections
+            for allocation in allocations
+        }
+
+        timetabling = ClassroomAssignment(
+            self.classrooms,
+            sections,
+            objective_mode=self.objective_mode,
+            occupied_slots=occupied_slots,
+            solver=self.solver,
+        )
+        try:
+            timetabling.backend.set_output(False)
+            timetabling.build_model()
+            timetabling.optimize()
+
+            if timetabling.backend.status != SolverStatus.OPTIMAL:
+                return None
+
+            assignment, _ = timetabling.get_results()
+        finally:
+            # Devolve o ambiente ao pool mesmo quando a resolução falha
+            timetabling.clean_model()
+
+        allocations = {section: [] for section in sections}
+        for classroom, section, day, time in assignment:
+            allocations[section].append((classroom, day, time))
+
+        return allocations
+
+    def find_allocation(self, section, details) -> dict:
+        """
+        Places a section, moving the sections that share its slots only when it
+        does not fit alone.
+
+        Returns:
+            dict: The new allocations of the placed section and of the moved
+                sections, or None when the section does not fit.
+        """
+        new_section = build_sections({section: details})
+        allocations = self.reoptimize(new_section)
+
+        if allocations is None:
+            neighbours = {
+                neighbour
+                for slot in new_section[section].slots
+                for neighbour in self.slot_sections.get(slot, ())
+                if neighbour != section
+            }
+            allocations = self.reoptimize(
+                {
+                    **new_section,
+                    **{neighbour: self.sections[neighbour] for neighbour in neighbours},
+                }
+            )
+
+        if allocations is None:
+            return None
+
+        # Só devolve as seções vizinhas que mudaram de sala
+        return {
+            key: sorted(value)
+            for key, value in allocations.items()
+            if key == section or sorted(value) != sorted(self.allocations.get(key, []))
+        }
+
+    def add_section(self, section, details) -> dict:
+        if section in self.sections:
+            raise ValueError(f"Section {section} already exists")
+
+        allocations = self.find_allocation(section, details)
+
+        if allocations is not None:
+            self.sections.update(build_sections({section: details}))
+            for slot in self.sections[section].slots:
+                self.slot_sections.setdefault(slot, set()).add(section)
+            self.allocations.update(allocations)
+
+        return allocations
+
+    def remove_section(self, section) -> list:
+        if section not in self.sections:
+            raise ValueError(f"Section {section} not found")
+
+        for slot in self.sections.pop(section).slots:
+            self.slot_sections[slot].discard(section)
+
+        return self.allocations.pop(section, [])
+
+    def get_assignment(self) -> list:
+        return [
+            utils.Allocation(classroom, section, day, time)
+            for section, allocations in self.allocations.items()
+            for classroom, day, time in allocations
+        ]
+
+    def save(self):
+        assignment = self.get_assignment()
+        utils.treat_and_save_results(assignment, self.sections)
+        save_snapshot(SNAPSHOT_PATH, self.classrooms, self.sections, assignment)
+
+    def handle(self, request: dict) -> dict:
+        """
+        Answers one request:
+
+        - {"action": "query", "section": {...}}: where the section could go.
+        - {"action": "add", "id": ..., "section": {...}}: places and keeps it.
+        - {"action": "remove", "id": ...}: frees its classrooms.
+        - {"action": "save"}: writes the results and the snapshot.
+
+        The section fields are the ones of the sections set, e.g. "day", "time",
+        "capacity", "classroom_type" and "responsable_institute". An error in a
+        request is answered with {"status": "error"} and does not stop the service.
+        """
+        if not isinstance(request, dict):
+            return {"status": "error", "message": "The request must be an object"}
+
+        action = request.get("action")
+
+        try:
+            if action == "query":
+                allocations = self.find_allocation(
+                    QUERY_SECTION, validate_section(request["section"])
+                )
+                return self.allocation_response(allocations, QUERY_SECTION)
+
+            if action == "add":
+                allocations = self.add_section(
+                    request["id"], validate_section(request["section"])
+                )
+                return self.allocation_response(allocations, request["id"])
+
+            if action == "remove":
+                released = self.remove_section(request["id"])
+                return {"status": "ok", "released": released}
+
+            if action == "save":
+                self.save()
+                return {"status": "ok"}
+
+        except KeyError as err:
+            return {"status": "error", "message": f"Missing field: {err}"}
+        except Exception as err:
+            return {"status": "error", "message": str(err)}
+
+        return {"status": "error", "message": f"Unknown action: {action}"}
+
+    def allocation_response(self, allocations: dict, section) -> dict:
+        if allocations is None:
+            return {"status": "infeasible"}
+
+        return {
+            "status": "ok",
+            "allocation": allocations.pop(section),
+            "moved": [
+                {"id": moved, "allocation": allocation}
+                for moved, allocation in allocations.items()
+            ],
+        }
+
+
+def serve(service: AllocationService, requests, responses):
+    """Reads one JSON request per line and writes one JSON response per line."""
+    for line in requests:
+        if not line.strip():
+            continue
+
+        try:
+            response = service.handle(json.loads(line))
+        except json.JSONDecodeError as err:
+            response = {"status": "error", "message": f"Invalid JSON: {err}"}
+        except Exception as err:
+            response = {"status": "error", "message": str(err)}
+
+        responses.write(json.dumps(response, ensure_ascii=False) + "\n")
+        responses.flush()
+
+
+def main():
+    # Reserva o stdout para as respostas: logs do Python e do solver vão para o stderr
+    responses = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    service = AllocationService.from_spreadsheet()
+    print("========= SERVICE ==========")
+    print("Pronto para receber requisições (uma por linha)")
+    print("============================", flush=True)
+
+    serve(service, sys.stdin, responses)
+
+
+if __name__ == "__main__":
+    main()
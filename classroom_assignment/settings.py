@@ -12,4 +12,40 @@ APP_LICENSE_ID = config("LICENSE_ID", default=123, cast=int)
 APP_WLS_ACCESS_ID = config("WLS_ACCESS_ID", default="access_id")
 APP_WS_SECRET = config("WS_SECRET", default="secret")
 
+class ObjectiveMode(Enum):
+    LINEAR = "linear"
+    QUADRATIC = "quadratic"
+
+APP_OBJECTIVE_MODE = config("OBJECTIVE_MODE", default=ObjectiveMode.LINEAR.value, cast=lambda v: v if v in ObjectiveMode._value2member_map_ else ObjectiveMode.LINEAR.value)
+
+class Solver(Enum):
+    GUROBI = "gurobi"
+    HIGHS = "highs"
+
+APP_SOLVER = config("SOLVER", default=Solver.GUROBI.value, cast=lambda v: v if v in Solver._value2member_map_ else Solver.GUROBI.value)
+
+APP_INSTRUMENTATION = config("INSTRUMENTATION", default=False, cast=bool)
+
+APP_DECOMPOSITION = config("DECOMPOSITION", default=False, cast=bool)
+APP_MAX_WORKERS = config("MAX_WORKERS", default=None, cast=lambda v: int(v) if v else None)
+APP_GUROBI_ENVIRONMENTS = config("GUROBI_ENVIRONMENTS", default=None, cast=lambda v: int(v) if v else None)
+
+APP_INCREMENTAL = config("INCREMENTAL", default=False, cast=bool)
+
+APP_WARM_START = config("WARM_START", default=False, cast=bool)
+
+APP_MODEL_CACHE = config("MODEL_CACHE", default=False, cast=bool)
+
+APP_LAZY_RN1 = config("LAZY_RN1", default=False, cast=bool)
+
+APP_AGGREGATE_CLASSROOMS = config("AGGREGATE_CLASSROOMS", default=False, cast=bool)
+
+APP_PRECHECK = config("PRECHECK", default=True, cast=bool)
+
+APP_HEURISTIC = config("HEURISTIC", default=False, cast=bool)
+
+APP_HEURISTIC_START = config("HEURISTIC_START", default=False, cast=bool)
+
+APP_DIAGNOSIS = config("DIAGNOSIS", default=False, cast=bool)
+
 APP_CACHE_TTL = config("CACHE_TTL", default=29809, cast=int)
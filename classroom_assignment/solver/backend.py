@@ -0,0 +1,211 @@
+import os
+from enum import Enum
+
+import settings
+
+
+class SolverStatus(Enum):
+    OPTIMAL = "optimal"
+    INFEASIBLE = "infeasible"
+    UNBOUNDED = "unbounded"
+    TIME_LIMIT = "time_limit"
+    OTHER = "other"
+
+
+class VariableType(Enum):
+    BINARY = "binary"
+    INTEGER = "integer"
+    CONTINUOUS = "continuous"
+
+
+LESS_EQUAL = "<="
+EQUAL = "=="
+GREATER_EQUAL = ">="
+
+
+class SolverBackend:
+    """
+    Interface used by `ClassroomAssignment` to build and solve the model without
+    depending on a specific solver. Variables are returned as a mapping from the
+    given keys to solver handles, which are only meaningful to the backend that
+    created them.
+    """
+
+    name = None
+    supports_quadratic = False
+
+    def add_variables(
+        self,
+        keys: list,
+        vtype: VariableType,
+        lb: float = 0.0,
+        ub=1.0,
+        name: str = "",
+    ) -> dict:
+        """
+        Creates one variable per key.
+
+        Args:
+            keys (list): The keys of the variables, in creation order.
+            vtype (VariableType): The type of all the variables.
+            lb (float): The lower bound of all the variables.
+            ub (float | list): The upper bound of all the variables, or one bound
+                per key.
+            name (str): A prefix for the variable names, when the solver uses them.
+
+        Returns:
+            dict: The keys mapped to the created variables.
+        """
+        raise NotImplementedError
+
+    def add_constraint(
+        self,
+        variables: list,
+        sense: str,
+        rhs: float,
+        coefficients: list = None,
+        name: str = "",
+    ):
+        """
+        Adds the linear constraint `sum(coefficients * variables) <sense> rhs`. All the
+        coefficients are 1 when `coefficients` is None.
+        """
+        raise NotImplementedError
+
+    def add_lazy_constraint(
+        self,
+        variables: list,
+        sense: str,
+        rhs: float,
+        coefficients: list = None,
+    ):
+        """
+        Adds a constraint like `add_constraint` that the solver may leave out of the
+        model until a solution violates it. Backends without lazy constraints add it
+        right away.
+        """
+        self.add_constraint(variables, sense, rhs, coefficients)
+
+    def set_objective(
+        self,
+        variables: list,
+        coefficients: list,
+        quadratic_terms: list = None,
+        maximize: bool = True,
+    ):
+        """
+        Sets the objective `sum(coefficients * variables)` plus the optional
+        quadratic terms, given as (coefficient, variable, variable) tuples.
+        """
+        raise NotImplementedError
+
+    def set_start(self, variable, value: float):
+        raise NotImplementedError
+
+    def set_output(self, enabled: bool):
+        raise NotImplementedError
+
+    def set_time_limit(self, seconds: float):
+        raise NotImplementedError
+
+    def optimize(self):
+        raise NotImplementedError
+
+    @property
+    def status(self) -> SolverStatus:
+        raise NotImplementedError
+
+    @property
+    def objective_value(self) -> float:
+        raise NotImplementedError
+
+    @property
+    def has_solution(self) -> bool:
+        """Whether a feasible solution was found, e.g. before a time limit."""
+        raise NotImplementedError
+
+    @property
+    def num_variables(self) -> int:
+        raise NotImplementedError
+
+    @property
+    def num_constraints(self) -> int:
+        raise NotImplementedError
+
+    def get_values(self, variables: dict) -> dict:
+        """
+        Reads the solution of the given variables in bulk.
+
+        Returns:
+            dict: The keys of `variables` mapped to their values.
+        """
+        raise NotImplementedError
+
+    def get_stats(self) -> dict:
+        """Returns the solver statistics saved in the run report."""
+        raise NotImplementedError
+
+    def print_method_info(self):
+        raise NotImplementedError
+
+    def write_infeasibility_report(self, filename: str):
+        raise NotImplementedError
+
+    def compute_iis(self) -> tuple:
+        """
+        Computes an irreducible infeasible subsystem of an infeasible model.
+
+        Returns:
+            tuple: The indices, in creation order, of the constraints and of the
+                variables whose bounds belong to the IIS.
+        """
+        raise NotImplementedError
+
+    def write_model(self, filename: str):
+        """Writes the built model, in the format given by the extension of `filename`."""
+        raise NotImplementedError
+
+    def read_model(self, filename: str) -> list:
+        """
+        Replaces the model with one written by `write_model`.
+
+        Returns:
+            list: The variables of the read model, in creation order.
+        """
+        raise NotImplementedError
+
+    def dispose(self):
+        raise NotImplementedError
+
+
+def get_backend(name: str = settings.APP_SOLVER, **options) -> SolverBackend:
+    """
+    Creates the backend of the given solver. The solver packages are only imported
+    here, so that a worker only needs the one it uses. The `options` are passed to
+    the backend, e.g. the shared `env` of `GurobiBackend`.
+    """
+    if name == settings.Solver.GUROBI.value:
+        from solver.gurobi_backend import GurobiBackend
+
+        return GurobiBackend(**options)
+
+    if name == settings.Solver.HIGHS.value:
+        from solver.highs_backend import HighsBackend
+
+        return HighsBackend(**options)
+
+    raise ValueError(f"Unknown solver: {name}")
+
+
+def get_max_workers(max_workers: int = None, name: str = settings.APP_SOLVER) -> int:
+    """
+    Returns the size of a process pool that solves with the given solver. The
+    `GUROBI_ENVIRONMENTS` limit is enforced per process, so with Gurobi the pool
+    is capped at it to bound the licenses checked out by all the workers.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+
+    if name == settings.Solver.GUROBI.value and settings.APP_GUROBI_ENVIRONMENTS:
+        return min(max_workers, settings.APP_GUROBI_ENVIRONMENTS)
+
+    return max_workers
@@ -0,0 +1,240 @@
+import gurobipy as gp
+from gurobipy import GRB
+
+import settings
+
+from solver.backend import (
+    EQUAL,
+    GREATER_EQUAL,
+    LESS_EQUAL,
+    SolverBackend,
+    SolverStatus,
+    VariableType,
+)
+from solver.gurobi_environment import ENVIRONMENT_POOL, EnvironmentPool
+
+GUROBI_STATS = ["NumVars", "NumConstrs", "NumQNZs", "Runtime", "MIPGap", "NodeCount"]
+LAZY_TOLERANCE = 1e-6
+
+VARIABLE_TYPES = {
+    VariableType.BINARY: GRB.BINARY,
+    VariableType.INTEGER: GRB.INTEGER,
+    VariableType.CONTINUOUS: GRB.CONTINUOUS,
+}
+SENSES = {
+    LESS_EQUAL: GRB.LESS_EQUAL,
+    EQUAL: GRB.EQUAL,
+    GREATER_EQUAL: GRB.GREATER_EQUAL,
+}
+STATUSES = {
+    GRB.OPTIMAL: SolverStatus.OPTIMAL,
+    GRB.INFEASIBLE: SolverStatus.INFEASIBLE,
+    GRB.INF_OR_UNBD: SolverStatus.INFEASIBLE,
+    GRB.UNBOUNDED: SolverStatus.UNBOUNDED,
+    GRB.TIME_LIMIT: SolverStatus.TIME_LIMIT,
+}
+
+
+class GurobiBackend(SolverBackend):
+    """
+    Backend on Gurobi. The environment is borrowed from `pool` (the process-wide
+    `ENVIRONMENT_POOL` by default) and given back by `dispose`. A given `env` is
+    used as is and kept open: whoever created it must dispose it.
+    """
+
+    name = settings.Solver.GUROBI.value
+    supports_quadratic = True
+
+    def __init__(self, env: gp.Env = None, pool: EnvironmentPool = None):
+        self.pool = None if env else pool or ENVIRONMENT_POOL
+        self.env = env or self.pool.acquire()
+        self.model = gp.Model(name="ClassroomAssignment", env=self.env)
+        self.lazy_constraints = []
+        self.lazy_variables = []
+        self.lazy_constraints_added = 0
+
+    def add_variables(self, keys, vtype, lb=0.0, ub=1.0, name=""):
+        return self.model.addVars(
+            keys, vtype=VARIABLE_TYPES[vtype], lb=lb, ub=ub, name=name
+        )
+
+    def add_constraint(self, variables, sense, rhs, coefficients=None, name=""):
+        if coefficients is None:
+            coefficients = [1.0] * len(variables)
+
+        self.model.addLConstr(
+            gp.LinExpr(coefficients, variables), SENSES[sense], rhs, name=name
+        )
+
+    def add_lazy_constraint(self, variables, sense, rhs, coefficients=None):
+        if coefficients is None:
+            coefficients = [1.0] * len(variables)
+
+        # Os valores de todas as variáveis são lidos de uma vez no callback
+        start = len(self.lazy_variables)
+        self.lazy_variables.extend(variables)
+        self.lazy_constraints.append((variables, coefficients, sense, rhs, start))
+
+    def separate_lazy_constraints(self, model, where):
+        """
+        Callback that adds the lazy constraints violated by a new incumbent. Each
+        constraint is added at most once.
+        """
+        if where != GRB.Callback.MIPSOL:
+            return
+
+        values = model.cbGetSolution(self.lazy_variables)
+        pending = []
+
+        for constraint in self.lazy_constraints:
+            variables, coefficients, sense, rhs, start = constraint
+            lhs = sum(
+                coefficient * value
+                for coefficient, value in zip(
+                    coefficients, values[start : start + len(variables)]
+                )
+            )
+
+            if (
+                (sense == LESS_EQUAL and lhs > rhs + LAZY_TOLERANCE)
+                or (sense == GREATER_EQUAL and lhs < rhs - LAZY_TOLERANCE)
+                or (sense == EQUAL and abs(lhs - rhs) > LAZY_TOLERANCE)
+            ):
+                model.cbLazy(gp.LinExpr(coefficients, variables), SENSES[sense], rhs)
+                self.lazy_constraints_added += 1
+            else:
+                pending.append(constraint)
+
+        self.lazy_constraints = pending
+
+    def set_objective(
+        self, variables, coefficients, quadratic_terms=None, maximize=True
+    ):
+        expression = gp.LinExpr(coefficients, variables)
+
+        if quadratic_terms:
+            quadratic_coefficients, variables_1, variables_2 = zip(*quadratic_terms)
+            expression = gp.QuadExpr(expression)
+            expression.addTerms(quadratic_coefficients, variables_1, variables_2)
+
+        self.model.setObjective(expression, GRB.MAXIMIZE if maximize else GRB.MINIMIZE)
+
+    def set_start(self, variable, value):
+        variable.Start = value
+
+    def set_output(self, enabled):
+        self.model.Params.OutputFlag = int(enabled)
+
+    def set_time_limit(self, seconds):
+        self.model.Params.TimeLimit = seconds
+
+    def optimize(self):
+        self.model.update()
+
+        if self.lazy_constraints:
+            self.model.Params.LazyConstraints = 1
+            self.model.optimize(self.separate_lazy_constraints)
+        else:
+            self.model.optimize()
+
+    @property
+    def status(self):
+        return STATUSES.get(self.model.Status, SolverStatus.OTHER)
+
+    @property
+    def objective_value(self):
+        return self.model.ObjVal
+
+    @property
+    def has_solution(self):
+        return self.model.SolCount > 0
+
+    @property
+    def num_variables(self):
+        self.model.update()
+        return self.model.NumVars
+
+    @property
+    def num_constraints(self):
+        self.model.update()
+        return self.model.NumConstrs
+
+    def get_values(self, variables):
+        return self.model.getAttr("X", variables)
+
+    def get_stats(self):
+        stats = {}
+
+        for attr in GUROBI_STATS:
+            try:
+                stats[attr] = self.model.getAttr(attr)
+            except gp.GurobiError:  # Atributo indisponível para o status do modelo
+                stats[attr] = None
+
+        stats["LazyConstraintsAdded"] = self.lazy_constraints_added
+        stats["LazyConstraintsPending"] = len(self.lazy_constraints)
+
+        return stats
+
+    def print_method_info(self):
+        print("========= METHOD ==========")
+        print(self.model.getParamInfo("Method"))
+        print(self.model.getParamInfo("ConcurrentMethod"))
+        print(self.model.getParamInfo("ConcurrentMIP"))
+
+        print(f"É MIP: {self.model.getAttr(GRB.Attr.IsMIP)}")
+        print(f"É QP: {self.model.getAttr(GRB.Attr.IsQP)}")
+        print(f"É QCP: {self.model.getAttr(GRB.Attr.IsQCP)}")
+        print(f"É MultiObj: {self.model.getAttr(GRB.Attr.IsMultiObj)}")
+        if self.lazy_constraints_added or self.lazy_constraints:
+            print(f"Restrições lazy adicionadas: {self.lazy_constraints_added}")
+            print(f"Restrições lazy não usadas: {len(self.lazy_constraints)}")
+        print("=============================")
+
+    def write_infeasibility_report(self, filename):
+        self.model.computeIIS()
+        self.model.write(filename)
+
+    def compute_iis(self):
+        self.model.computeIIS()
+
+        constraints = self.model.getAttr("IISConstr", self.model.getConstrs())
+        variables = self.model.getVars()
+        lower_bounds = self.model.getAttr("IISLB", variables)
+        upper_bounds = self.model.getAttr("IISUB", variables)
+
+        return (
+            [index for index, in_iis in enumerate(constraints) if in_iis],
+            [
+                index
+                for index, in_iis in enumerate(zip(lower_bounds, upper_bounds))
+                if any(in_iis)
+            ],
+        )
+
+    def write_model(self, filename):
+        self.model.update()
+        self.model.write(filename)
+
+    def read_model(self, filename):
+        # A leitura segue a saída do modelo sem alterar o ambiente compartilhado
+        output_flag = self.env.getParam("OutputFlag")
+        self.env.setParam("OutputFlag", self.model.Params.OutputFlag)
+        self.model.dispose()
+
+        self.lazy_constraints = []
+        self.lazy_variables = []
+
+        try:
+            self.model = gp.read(filename, env=self.env)
+        finally:
+            self.env.setParam("OutputFlag", output_flag)
+
+        return self.model.getVars()
+
+    def dispose(self):
+        self.model.dispose()
+
+        if self.pool is not None:
+            self.pool.release(self.env)
+            self.pool = None
@@ -0,0 +1,105 @@
+import atexit
+import os
+import threading
+from contextlib import contextmanager
+
+import gurobipy as gp
+
+import settings
+
+
+def init_environment() -> gp.Env:
+    if settings.APP_LICENSE_TYPE == settings.LicenseType.NAMED_USER_ACADEMIC.value:
+        env = gp.Env(empty=False)
+
+    elif settings.APP_LICENSE_TYPE == settings.LicenseType.WSL_ACADEMIC.value:
+        env = gp.Env(empty=True)
+        env.setParam("LicenseID", settings.APP_LICENSE_ID)
+        env.setParam("WLSAccessID", settings.APP_WLS_ACCESS_ID)
+        env.setParam("WLSSecret", settings.APP_WS_SECRET)
+
+    env.start()
+
+    return env
+
+
+class EnvironmentPool:
+    """
+    Started Gurobi environments shared by the models of a process, so that the
+    environment start-up (and the WLS license checkout) is paid once instead of
+    once per model.
+
+    An environment is lent to one model at a time. When `size` environments are
+    lent, `acquire` waits for one of them to be released, which bounds the
+    licenses used by parallel solves. Without `size`, a new environment is only
+    started when all the others are in use.
+    """
+
+    def __init__(self, size: int = None):
+        self.size = size
+        self.idle = []
+        self.started = 0
+        self.closed = False
+        self.pid = os.getpid()
+        self.condition = threading.Condition()
+
+    def _reset_after_fork(self):
+        # Os ambientes herdados de outro processo não são válidos neste
+        if self.pid != os.getpid():
+            self.idle = []
+            self.started = 0
+            self.pid = os.getpid()
+
+    def acquire(self) -> gp.Env:
+        with self.condition:
+            self._reset_after_fork()
+
+            if self.closed:
+                raise RuntimeError("The Gurobi environment pool is closed")
+
+            while not self.idle and self.size and self.started >= self.size:
+                self.condition.wait()
+
+            if self.idle:
+                return self.idle.pop()
+
+            self.started += 1
+
+        try:
+            return init_environment()
+        except Exception:
+            with self.condition:
+                self.started -= 1
+                self.condition.notify()
+            raise
+
+    def release(self, env: gp.Env):
+        with self.condition:
+            if self.closed or self.pid != os.getpid():
+                env.dispose()
+                return
+
+            self.idle.append(env)
+            self.condition.notify()
+
+    @contextmanager
+    def environment(self):
+        env = self.acquire()
+        try:
+            yield env
+        finally:
+            self.release(env)
+
+    def close(self):
+        """Disposes the idle environments. The lent ones are disposed on release."""
+        with self.condition:
+            self._reset_after_fork()
+            self.closed = True
+
+            for env in self.idle:
+                env.dispose()
+            self.idle = []
+
+
+ENVIRONMENT_POOL = EnvironmentPool(settings.APP_GUROBI_ENVIRONMENTS)
+atexit.register(ENVIRONMENT_POOL.close)
@@ -0,0 +1,212 @@
+import highspy
+import numpy as np
+
+import settings
+
+from solver.backend import (
+    GREATER_EQUAL,
+    LESS_EQUAL,
+    SolverBackend,
+    SolverStatus,
+    VariableType,
+)
+
+STATUSES = {
+    highspy.HighsModelStatus.kOptimal: SolverStatus.OPTIMAL,
+    # Um modelo sem variáveis nem restrições já está resolvido
+    highspy.HighsModelStatus.kModelEmpty: SolverStatus.OPTIMAL,
+    highspy.HighsModelStatus.kInfeasible: SolverStatus.INFEASIBLE,
+    highspy.HighsModelStatus.kUnboundedOrInfeasible: SolverStatus.INFEASIBLE,
+    highspy.HighsModelStatus.kUnbounded: SolverStatus.UNBOUNDED,
+    highspy.HighsModelStatus.kTimeLimit: SolverStatus.TIME_LIMIT,
+}
+
+
+class HighsBackend(SolverBackend):
+    """
+    Open-source backend on the HiGHS MILP solver (`pip install highspy`), which needs
+    no license. Columns and rows are buffered in Python lists and passed to HiGHS
+    in bulk right before solving. Variables are the column indices.
+    """
+
+    name = settings.Solver.HIGHS.value
+    supports_quadratic = False
+
+    def __init__(self):
+        self.highs = highspy.Highs()
+        self.lower = []
+        self.upper = []
+        self.integer_columns = []
+        self.row_lower = []
+        self.row_upper = []
+        self.row_starts = []
+        self.row_indices = []
+        self.row_values = []
+        self.costs = None
+        self.maximize = True
+        self.start = {}
+        self.model_passed = False
+
+    def add_variables(self, keys, vtype, lb=0.0, ub=1.0, name=""):
+        first_column = len(self.lower)
+        qtty = len(keys)
+
+        self.lower.extend([lb] * qtty)
+        self.upper.extend(ub if isinstance(ub, list) else [ub] * qtty)
+
+        if vtype != VariableType.CONTINUOUS:
+            self.integer_columns.extend(range(first_column, first_column + qtty))
+
+        return {key: first_column + i for i, key in enumerate(keys)}
+
+    def add_constraint(self, variables, sense, rhs, coefficients=None, name=""):
+        if coefficients is None:
+            coefficients = [1.0] * len(variables)
+
+        self.row_starts.append(len(self.row_indices))
+        self.row_indices.extend(variables)
+        self.row_values.extend(coefficients)
+        self.row_lower.append(-highspy.kHighsInf if sense == LESS_EQUAL else rhs)
+        self.row_upper.append(highspy.kHighsInf if sense == GREATER_EQUAL else rhs)
+
+    def set_objective(
+        self, variables, coefficients, quadratic_terms=None, maximize=True
+    ):
+        if quadratic_terms:
+            raise NotImplementedError(
+                "HiGHS does not solve mixed-integer quadratic models. "
+                "Use OBJECTIVE_MODE=linear."
+            )
+
+        self.costs = (list(variables), list(coefficients))
+        self.maximize = maximize
+
+    def set_start(self, variable, value):
+        self.start[variable] = value
+
+    def set_output(self, enabled):
+        self.highs.setOptionValue("output_flag", bool(enabled))
+
+    def set_time_limit(self, seconds):
+        self.highs.setOptionValue("time_limit", float(seconds))
+
+    def pass_model(self):
+        qtty_columns = len(self.lower)
+        self.highs.addVars(
+            qtty_columns, np.array(self.lower), np.array(self.upper, dtype=float)
+        )
+
+        if self.integer_columns:
+            self.highs.changeColsIntegrality(
+                len(self.integer_columns),
+                np.array(self.integer_columns, dtype=np.int32),
+                np.array(
+                    [highspy.HighsVarType.kInteger] * len(self.integer_columns),
+                    dtype=np.uint8,
+                ),
+            )
+
+        if self.row_starts:
+            self.highs.addRows(
+                len(self.row_starts),
+                np.array(self.row_lower, dtype=float),
+                np.array(self.row_upper, dtype=float),
+                len(self.row_indices),
+                np.array(self.row_starts, dtype=np.int32),
+                np.array(self.row_indices, dtype=np.int32),
+                np.array(self.row_values, dtype=float),
+            )
+
+        if self.costs:
+            columns, coefficients = self.costs
+            self.highs.changeColsCost(
+                len(columns),
+                np.array(columns, dtype=np.int32),
+                np.array(coefficients, dtype=float),
+            )
+
+        self.highs.changeObjectiveSense(
+            highspy.ObjSense.kMaximize if self.maximize else highspy.ObjSense.kMinimize
+        )
+        self.model_passed = True
+
+    def optimize(self):
+        if not self.model_passed:
+            self.pass_model()
+
+        if self.start:
+            self.highs.setSolution(
+                len(self.start),
+                np.array(list(self.start.keys()), dtype=np.int32),
+                np.array(list(self.start.values()), dtype=float),
+            )
+
+        self.highs.run()
+
+    @property
+    def status(self):
+        return STATUSES.get(self.highs.getModelStatus(), SolverStatus.OTHER)
+
+    @property
+    def objective_value(self):
+        return self.highs.getInfo().objective_function_value
+
+    @property
+    def has_solution(self):
+        return (
+            self.highs.getInfo().primal_solution_status
+            == highspy.SolutionStatus.kSolutionStatusFeasible
+        )
+
+    @property
+    def num_variables(self):
+        if self.model_passed:
+            return self.highs.getNumCol()
+        return len(self.lower)
+
+    @property
+    def num_constraints(self):
+        if self.model_passed:
+            return self.highs.getNumRow()
+        return len(self.row_starts)
+
+    def get_values(self, variables):
+        column_values = self.highs.getSolution().col_value
+
+        return {key: column_values[column] for key, column in variables.items()}
+
+    def get_stats(self):
+        info = self.highs.getInfo()
+
+        return {
+            "NumVars": self.num_variables,
+            "NumConstrs": self.num_constraints,
+            "Runtime": self.highs.getRunTime(),
+            "MIPGap": info.mip_gap,
+            "NodeCount": info.mip_node_count,
+        }
+
+    def print_method_info(self):
+        print("========= METHOD ==========")
+        print(f"HiGHS {self.highs.version()}")
+        print(f"É MIP: {int(bool(self.integer_columns))}")
+        print("=============================")
+
+    def write_infeasibility_report(self, filename):
+        # HiGHS não calcula IIS: grava o modelo completo para inspeção
+        self.highs.writeModel(filename)
+
+    def write_model(self, filename):
+        if not self.model_passed:
+            self.pass_model()
+
+        self.highs.writeModel(filename)
+
+    def read_model(self, filename):
+        self.highs.readModel(filename)
+        self.model_passed = True
+
+        return list(range(self.highs.getNumCol()))
+
+    def dispose(self):
+        self.highs.clear()
@@ -0,0 +1,29 @@
+def classroom(
+    capacity: int, classroom_type: str = "Sala", institute: str = "IC", **details
+) -> dict:
+    """A classroom row as returned by `transform_classrooms_to_dict`."""
+    return {
+        "capacity": capacity,
+        "classroom_type": classroom_type,
+        "responsable_institute": institute,
+        **details,
+    }
+
+
+def section(
+    capacity: int,
+    classroom_type: str = "Teórica",
+    day: str = "SEG",
+    time: str = "10:00-12:00",
+    institute: str = "IC",
+    **details,
+) -> dict:
+    """A section row as returned by `transform_sections_to_dict`."""
+    return {
+        "capacity": capacity,
+        "day": day,
+        "time": time,
+        "classroom_type": classroom_type,
+        "responsable_institute": institute,
+        **details,
+    }
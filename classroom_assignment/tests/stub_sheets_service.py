@@ -0,0 +1,35 @@
+class StubSheetsService:
+    """
+    Offline stand-in for the Sheets API client built by `get_sheets_service`. Answers
+    `spreadsheets().values().batchGet(...).execute()` with the given values and keeps
+    the requested ranges in `requests`.
+    """
+
+    def __init__(self, values_by_range: dict):
+        self.values_by_range = values_by_range
+        self.requests = []
+        self.ranges = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def batchGet(self, spreadsheetId: str, ranges: list):
+        self.requests.append((spreadsheetId, ranges))
+        self.ranges = ranges
+        return self
+
+    def execute(self) -> dict:
+        return {
+            "valueRanges": [
+                {"range": range_name, "values": self.values_by_range.get(range_name, [])}
+                for range_name in self.ranges
+            ]
+        }
+
+
+def dataframe_to_values(dataframe) -> list:
+    """Converts a DataFrame to the rows returned by the Sheets API."""
+    return [list(dataframe.columns)] + dataframe.values.tolist()
@@ -2,37 +2,33 @@ from unittest import TestCase, main
 from unittest.mock import patch, Mock, MagicMock
 import sys
 import os
+import tempfile
 import pandas as pd
-from functools import wraps
 
 sys.path.insert(
     0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 )  # FIXME quero corrigir de outra forma
 
 from database.transform_data import transform_classrooms_to_dict
-
-
-def mock_decorator(*args, **kwargs):
-    """Decorate by doing nothing."""
-    def decorator(f):
-        @wraps(f)
-        def decorated_function(*args, **kwargs):
-            return f(*args, **kwargs)
-        return decorated_function
-    return decorator
-
-patch('cache_pandas.cache_to_csv', mock_decorator).start()
-
-from database.service_google_sheet import get_classrooms_available
+from database.service_google_sheet import (
+    CLASSROOMS_RANGE,
+    SECTIONS_RANGE,
+    SpreadsheetTabs,
+    get_classrooms_available,
+)
+from tests.stub_sheets_service import StubSheetsService, dataframe_to_values
 
 
 class TestClassroomAvailableFromGoogleSheets(TestCase):
 
-    # @patch.object(cache_to_csv, "cache_to_csv")
-    # @patch("database.service_google_sheet.cache_to_csv")
-    @patch("database.service_google_sheet.read_google_sheet_to_dataframe")
-    # @patch("cache_pandas.cache_to_csv", lambda *args, **kwargs: lambda func: func)
-    def test_get_classrooms_available(self, mock_read_google_sheet):
+    def setUp(self) -> None:
+        cache_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_directory.cleanup)
+        patch("database.table_cache.CACHE_DIRECTORY", cache_directory.name).start()
+        self.addCleanup(patch.stopall)
+        return super().setUp()
+
+    def test_get_classrooms_available(self):
         mock_data = pd.DataFrame(
             {
                 "Disponível": ["TRUE", "TRUE"],
@@ -44,11 +40,9 @@ class TestClassroomAvailableFromGoogleSheets(TestCase):
             },
         )
 
-        mock_data.index.name = "course_class_id"
-
-        mock_read_google_sheet.return_value = mock_data
+        service = StubSheetsService({CLASSROOMS_RANGE: dataframe_to_values(mock_data)})
 
-        result = get_classrooms_available()
+        result = get_classrooms_available(SpreadsheetTabs("sheet_id", service))
 
         expected_data = pd.DataFrame(
             {
@@ -65,7 +59,9 @@ class TestClassroomAvailableFromGoogleSheets(TestCase):
 
         expected_data.index.name = "classroom_name"
 
-        mock_read_google_sheet.assert_called_once()
+        self.assertEqual(
+            service.requests, [("sheet_id", [SECTIONS_RANGE, CLASSROOMS_RANGE])]
+        )
         pd.testing.assert_frame_equal(result, expected_data)
 
 
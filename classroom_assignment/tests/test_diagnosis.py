@@ -0,0 +1,135 @@
+from unittest import TestCase, main
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)  # FIXME quero corrigir de outra forma
+
+import settings
+from database.records import build_sections
+from main import ClassroomAssignment
+from utils.diagnosis import ConstraintKey, get_slot_relaxation
+from tests.fixtures import classroom, section
+
+
+class TestDiagnoseInfeasibility(TestCase):
+
+    def setUp(self) -> None:
+        self.classrooms = {
+            "F3014": classroom(60),
+            "H201": classroom(40),
+            "LAB1": classroom(20, "Laboratório"),
+        }
+        return super().setUp()
+
+    def diagnose(
+        self,
+        sections: dict,
+        occupied_slots: set = None,
+        objective_mode: str = settings.ObjectiveMode.LINEAR.value,
+    ) -> list:
+        timetabling = ClassroomAssignment(
+            self.classrooms,
+            sections,
+            objective_mode=objective_mode,
+            occupied_slots=occupied_slots,
+        )
+        try:
+            timetabling.backend.set_output(False)
+            timetabling.build_model()
+            self.assertEqual(
+                len(timetabling.constraint_keys), timetabling.backend.num_constraints
+            )
+            return timetabling.diagnose_infeasibility()
+        finally:
+            timetabling.clean_model()
+
+    def test_isolate_overloaded_slot(self):
+        sections = {
+            0: section(30),
+            1: section(35),
+            2: section(20),
+            3: section(10, day="TER"),
+        }
+
+        conflicts = self.diagnose(sections)
+
+        self.assertEqual(len(conflicts), 1)
+        self.assertEqual(conflicts[0].slot, ("SEG", "10:00-12:00"))
+        self.assertEqual(conflicts[0].sections, (0, 1, 2))
+        self.assertIn(
+            ConstraintKey("RN1", classroom="H201", day="SEG", time="10:00-12:00"),
+            conflicts[0].constraints,
+        )
+
+    def test_explain_quadratic_model(self):
+        sections = {0: section(30), 1: section(35), 2: section(20)}
+
+        conflicts = self.diagnose(
+            sections, objective_mode=settings.ObjectiveMode.QUADRATIC.value
+        )
+
+        self.assertEqual(len(conflicts), 1)
+        self.assertEqual(conflicts[0].sections, (0, 1, 2))
+        self.assertIn(
+            ConstraintKey("RN1", classroom="H201", day="SEG", time="10:00-12:00"),
+            conflicts[0].constraints,
+        )
+
+    def test_explain_occupied_classroom(self):
+        sections = {0: section(15, "Prática", day="SEG,QUA")}
+
+        conflicts = self.diagnose(sections, {("LAB1", "QUA", "10:00-12:00")})
+
+        self.assertEqual([conflict.slot for conflict in conflicts], [("QUA", "10:00-12:00")])
+        self.assertIn(
+            ConstraintKey("occupied", 0, "LAB1", "QUA", "10:00-12:00"),
+            conflicts[0].constraints,
+        )
+
+    def test_fall_back_to_components(self):
+        sections = {
+            0: section(30, "Teórica,Prática", day="SEG,QUA"),
+            1: section(10, day="TER"),
+        }
+
+        conflicts = self.diagnose(sections)
+
+        self.assertEqual(len(conflicts), 1)
+        self.assertIsNone(conflicts[0].slot)
+        self.assertEqual(conflicts[0].sections, (0,))
+        self.assertIn(
+            ConstraintKey("RN3", section=0, classroom_type="Laboratório"),
+            conflicts[0].constraints,
+        )
+
+    def test_feasible_model_has_no_conflicts(self):
+        self.assertEqual(self.diagnose({0: section(30), 1: section(35)}), [])
+
+
+class TestGetSlotRelaxation(TestCase):
+
+    def test_keep_single_type_sections(self):
+        sections = build_sections(
+            {
+                0: section(30, day="SEG,QUA"),
+                1: section(30, "Prática", day="SEG,QUA"),
+                2: section(30, "Teórica,Prática", day="SEG,QUA"),
+            }
+        )
+
+        relaxation = get_slot_relaxation(sections, ("QUA", "10:00-12:00"))
+
+        self.assertEqual(list(relaxation), [0, 1])
+        self.assertEqual(relaxation[0].slots, (("QUA", "10:00-12:00"),))
+        self.assertEqual(
+            (relaxation[0].theory_slots, relaxation[0].practical_slots), (1, 0)
+        )
+        self.assertEqual(
+            (relaxation[1].theory_slots, relaxation[1].practical_slots), (0, 1)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+from unittest import TestCase, main
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)  # FIXME quero corrigir de outra forma
+
+from main import ClassroomAssignment
+from tests.fixtures import classroom, section
+
+
+class TestCheckFeasibility(TestCase):
+
+    def setUp(self) -> None:
+        self.classrooms = {
+            "F3014": classroom(60),
+            "H201": classroom(40),
+            "LAB1": classroom(20, "Laboratório"),
+        }
+        return super().setUp()
+
+    def check(self, sections: dict, occupied_slots: set = None) -> list:
+        timetabling = ClassroomAssignment(
+            self.classrooms, sections, occupied_slots=occupied_slots
+        )
+        try:
+            return timetabling.check_feasibility()
+        finally:
+            timetabling.clean_model()
+
+    def test_feasible_instance(self):
+        sections = {0: section(30), 1: section(15, "Prática")}
+
+        self.assertEqual(self.check(sections), [])
+
+    def test_section_without_eligible_classroom(self):
+        infeasibilities = self.check({0: section(100)})
+
+        self.assertEqual(
+            [(rule, sections) for rule, sections, _, _ in infeasibilities],
+            [("RN2", (0,))],
+        )
+
+    def test_practical_section_without_laboratory(self):
+        sections = {
+            0: section(30, "Teórica,Prática", day="SEG,QUA", time="10:00-12:00")
+        }
+
+        infeasibilities = self.check(sections)
+
+        self.assertEqual([rule for rule, *_ in infeasibilities], ["RN3"])
+        self.assertIn("Laboratório", infeasibilities[0].message)
+
+    def test_freshman_sections_share_new_students_classroom(self):
+        sections = {
+            0: section(30, term=1, class_type="Calouro"),
+            1: section(30, term=1, class_type="Calouro"),
+        }
+
+        infeasibilities = self.check(sections)
+
+        self.assertEqual(infeasibilities[0].rule, "RN4")
+        self.assertEqual(infeasibilities[0].sections, (0, 1))
+        self.assertEqual(infeasibilities[0].slot, ("SEG", "10:00-12:00"))
+
+    def test_eligible_classrooms_already_occupied(self):
+        sections = {0: section(50)}
+
+        infeasibilities = self.check(sections, {("F3014", "SEG", "10:00-12:00")})
+
+        self.assertEqual(
+            [(rule, slot) for rule, _, slot, _ in infeasibilities],
+            [("RN1", ("SEG", "10:00-12:00"))],
+        )
+
+    def test_more_sections_than_classrooms_in_slot(self):
+        sections = {0: section(30), 1: section(35), 2: section(20)}
+
+        infeasibilities = self.check(sections)
+
+        self.assertEqual(len(infeasibilities), 1)
+        self.assertEqual(infeasibilities[0].sections, (0, 1, 2))
+        self.assertIn("3 seções para 2 salas livres", infeasibilities[0].message)
+
+
+if __name__ == "__main__":
+    main()
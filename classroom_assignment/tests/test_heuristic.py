@@ -0,0 +1,95 @@
+from unittest import TestCase, main
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)  # FIXME quero corrigir de outra forma
+
+import settings
+from main import ClassroomAssignment, ModelParameters
+from utils.heuristic import allocate_greedy
+from utils.utils import Allocation
+from tests.fixtures import classroom, section
+
+
+class TestAllocateGreedy(TestCase):
+
+    def setUp(self) -> None:
+        self.classrooms = {
+            "F3014": classroom(60),
+            "H201": classroom(40),
+            "H202": classroom(50),
+            "H203": classroom(35, institute="IM"),
+            "LAB1": classroom(30, "Laboratório"),
+        }
+        return super().setUp()
+
+    def test_prefer_institute_and_then_smallest_classroom(self):
+        sections = {0: section(30), 1: section(20, "Prática")}
+
+        result = allocate_greedy(self.classrooms, sections, ModelParameters())
+
+        self.assertEqual(
+            result.assignment,
+            [
+                Allocation("LAB1", 1, "SEG", "10:00-12:00"),
+                Allocation("H201", 0, "SEG", "10:00-12:00"),
+            ],
+        )
+        self.assertEqual(result.unallocated, [])
+        self.assertAlmostEqual(result.objective_value, (100 - 1) + (100 - 1))
+
+    def test_respect_rn1_and_rn4(self):
+        sections = {
+            0: section(30),
+            1: section(30),
+            2: section(30),
+            3: section(30, term=1, class_type="Calouro"),
+            4: section(45),
+        }
+
+        result = allocate_greedy(self.classrooms, sections, ModelParameters())
+
+        classrooms = {
+            allocation.section: allocation.classroom for allocation in result.assignment
+        }
+        self.assertEqual(classrooms[3], "F3014")
+        self.assertEqual(len(set(classrooms.values())), len(classrooms))
+        self.assertEqual(len(result.assignment) + len(result.unallocated), 5)
+        # Quatro salas para cinco seções: as mais restritas são alocadas primeiro
+        self.assertEqual(classrooms[4], "H202")
+        self.assertEqual(result.unallocated, [(2, "SEG", "10:00-12:00")])
+
+    def test_skip_occupied_classrooms(self):
+        result = allocate_greedy(
+            self.classrooms,
+            {0: section(30)},
+            ModelParameters(),
+            occupied_slots={("H201", "SEG", "10:00-12:00")},
+        )
+
+        self.assertEqual(result.assignment[0].classroom, "H202")
+
+    def test_seed_exact_model(self):
+        sections = {0: section(30), 1: section(20, "Prática"), 2: section(45)}
+        timetabling = ClassroomAssignment(
+            self.classrooms,
+            sections,
+            objective_mode=settings.ObjectiveMode.LINEAR.value,
+        )
+        try:
+            timetabling.backend.set_output(False)
+            timetabling.build_model()
+            result = timetabling.set_heuristic_start()
+            timetabling.optimize()
+
+            self.assertGreaterEqual(
+                timetabling.backend.objective_value, result.objective_value
+            )
+        finally:
+            timetabling.clean_model()
+
+
+if __name__ == "__main__":
+    main()
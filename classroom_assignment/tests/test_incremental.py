@@ -0,0 +1,141 @@
+from unittest import TestCase, main
+import sys
+import os
+import tempfile
+from unittest.mock import patch
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)  # FIXME quero corrigir de outra forma
+
+import main as main_module
+from database.records import build_classrooms, build_sections
+from utils.incremental import diff_snapshot, load_snapshot, save_snapshot
+
+
+class TestSnapshot(TestCase):
+
+    def setUp(self) -> None:
+        self.classrooms = build_classrooms(
+            {
+                "Room1": {"capacity": 30, "classroom_type": "Sala"},
+                "Room2": {"capacity": 60, "classroom_type": "Sala"},
+            }
+        )
+        self.sections = build_sections(
+            {
+                0: {"capacity": 25, "day": "SEG", "time": "10:00-12:00"},
+                1: {"capacity": 50, "day": "TER,QUI", "time": "08:00-10:00"},
+                2: {"capacity": 20, "day": "SEX", "time": "08:00-10:00"},
+            }
+        )
+        self.assignment = [
+            ("Room1", 0, "SEG", "10:00-12:00"),
+            ("Room2", 1, "TER", "08:00-10:00"),
+            ("Room2", 1, "QUI", "08:00-10:00"),
+            ("Room1", 2, "SEX", "08:00-10:00"),
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "snapshot.json")
+            save_snapshot(filename, self.classrooms, self.sections, self.assignment)
+            self.snapshot = load_snapshot(filename)
+
+        return super().setUp()
+
+    def test_save_and_load_snapshot(self):
+        self.assertEqual(self.snapshot["assignment"], self.assignment)
+        self.assertEqual(list(self.snapshot["sections"]), [0, 1, 2])
+        self.assertEqual(self.snapshot["classrooms"]["Room1"]["capacity"], 30)
+
+    def test_load_missing_snapshot(self):
+        self.assertIsNone(load_snapshot("missing_snapshot.json"))
+
+    def test_keep_unchanged_sections(self):
+        kept_assignment, affected_sections = diff_snapshot(
+            self.snapshot, self.classrooms, self.sections
+        )
+
+        self.assertEqual(kept_assignment, self.assignment)
+        self.assertEqual(affected_sections, [])
+
+    def test_reoptimize_changed_and_new_sections(self):
+        sections = build_sections(
+            {
+                0: {"capacity": 25, "day": "SEG", "time": "10:00-12:00"},
+                1: {"capacity": 50, "day": "TER,QUI", "time": "10:00-12:00"},
+                2: {"capacity": 20, "day": "SEX", "time": "08:00-10:00"},
+                3: {"capacity": 20, "day": "SEX", "time": "10:00-12:00"},
+            }
+        )
+
+        kept_assignment, affected_sections = diff_snapshot(
+            self.snapshot, self.classrooms, sections
+        )
+
+        self.assertEqual(
+            kept_assignment,
+            [
+                ("Room1", 0, "SEG", "10:00-12:00"),
+                ("Room1", 2, "SEX", "08:00-10:00"),
+            ],
+        )
+        self.assertEqual(affected_sections, [1, 3])
+
+    def test_match_sections_by_content_when_keys_shift(self):
+        sections = {
+            0: build_sections(
+                {0: {"capacity": 40, "day": "QUA", "time": "13:00-15:00"}}
+            )[0],
+            1: self.sections[0],
+            2: self.sections[1],
+            3: self.sections[2],
+        }
+
+        kept_assignment, affected_sections = diff_snapshot(
+            self.snapshot, self.classrooms, sections
+        )
+
+        self.assertIn(("Room1", 1, "SEG", "10:00-12:00"), kept_assignment)
+        self.assertEqual(affected_sections, [0])
+
+    def test_reoptimize_sections_of_changed_classrooms(self):
+        classrooms = {"Room1": self.classrooms["Room1"]}
+
+        _, affected_sections = diff_snapshot(self.snapshot, classrooms, self.sections)
+
+        self.assertEqual(affected_sections, [1])
+
+
+class TestSolveIncremental(TestCase):
+
+    def test_keep_assignment_without_changed_sections(self):
+        classrooms = build_classrooms(
+            {"Room1": {"capacity": 30, "classroom_type": "Sala"}}
+        )
+        sections = build_sections(
+            {0: {"capacity": 25, "day": "SEG", "time": "10:00-12:00"}}
+        )
+        assignment = [("Room1", 0, "SEG", "10:00-12:00")]
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "snapshot.json")
+            save_snapshot(filename, classrooms, sections, assignment)
+
+            with patch.object(main_module, "SNAPSHOT_PATH", filename), patch.object(
+                main_module.utils, "treat_and_save_results"
+            ) as treat_and_save_results, patch.object(
+                main_module, "ClassroomAssignment"
+            ) as classroom_assignment:
+                result, model_value = main_module.solve_incremental(
+                    classrooms, sections
+                )
+
+        classroom_assignment.assert_not_called()
+        treat_and_save_results.assert_called_once()
+        self.assertEqual(result, [main_module.utils.Allocation(*assignment[0])])
+        self.assertEqual(model_value, 0.0)
+
+
+if __name__ == "__main__":
+    main()
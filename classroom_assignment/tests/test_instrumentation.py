@@ -0,0 +1,93 @@
+from unittest import TestCase, main
+from unittest.mock import Mock, patch
+import sys
+import os
+import json
+import tempfile
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)  # FIXME quero corrigir de outra forma
+
+from utils.instrumentation import Instrumentation
+
+
+class TestInstrumentation(TestCase):
+
+    def test_do_not_record_when_disabled(self):
+        instrumentation = Instrumentation(enabled=False)
+
+        with instrumentation.phase("phase"):
+            pass
+
+        self.assertEqual(instrumentation.phases, [])
+
+    def test_record_phases_in_order(self):
+        instrumentation = Instrumentation(enabled=True)
+
+        with instrumentation.phase("first"):
+            pass
+        with instrumentation.phase("second"):
+            pass
+
+        self.assertEqual(
+            [phase["name"] for phase in instrumentation.phases], ["first", "second"]
+        )
+        for phase in instrumentation.phases:
+            self.assertGreaterEqual(phase["wall_time"], 0)
+            self.assertGreater(phase["objects"], 0)
+
+    @patch("utils.instrumentation.get_peak_rss", side_effect=[100, 100, 100, 250])
+    def test_record_peak_rss_growth_of_each_phase(self, get_peak_rss):
+        instrumentation = Instrumentation(enabled=True)
+
+        with instrumentation.phase("first"):
+            pass
+        with instrumentation.phase("second"):
+            pass
+
+        self.assertEqual(
+            [
+                (phase["peak_rss_growth"], phase["max_rss_so_far"])
+                for phase in instrumentation.phases
+            ],
+            [(0, 100), (150, 250)],
+        )
+
+    def test_record_phase_that_raises(self):
+        instrumentation = Instrumentation(enabled=True)
+
+        with self.assertRaises(ValueError):
+            with instrumentation.phase("failing"):
+                raise ValueError()
+
+        self.assertEqual(instrumentation.phases[0]["name"], "failing")
+
+    def test_add_backend_stats(self):
+        instrumentation = Instrumentation(enabled=True)
+        backend = Mock()
+        backend.get_stats.return_value = {"NumVars": 10, "MIPGap": None}
+
+        instrumentation.add_model_stats(backend)
+
+        self.assertEqual(instrumentation.solver, {"NumVars": 10, "MIPGap": None})
+
+    def test_save_report(self):
+        instrumentation = Instrumentation(enabled=True)
+
+        with instrumentation.phase("phase"):
+            pass
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "run_report.json")
+            instrumentation.save(filename)
+
+            with open(filename) as file:
+                report = json.load(file)
+
+        self.assertEqual(report["phases"][0]["name"], "phase")
+        self.assertIn("total_wall_time", report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+from unittest import TestCase, main
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)  # FIXME quero corrigir de outra forma
+
+from database.records import build_classrooms, build_sections
+from local_search import get_building, get_neighborhoods, local_search
+from utils.utils import Allocation
+from tests.fixtures import classroom, section
+
+
+class TestLocalSearch(TestCase):
+
+    def setUp(self) -> None:
+        self.classrooms = {
+            "F3014": classroom(60),
+            "H201": classroom(40),
+            "H202": classroom(50, institute="IM"),
+        }
+        self.sections = {
+            0: section(30),
+            1: section(45, institute="IM"),
+            2: section(30, day="TER"),
+        }
+        return super().setUp()
+
+    def test_get_building(self):
+        self.assertEqual(get_building("F3014"), "F")
+        self.assertEqual(get_building("H201"), "H")
+        self.assertEqual(get_building("3014"), "3014")
+
+    def test_get_neighborhoods(self):
+        allocations = {
+            0: [("F3014", "SEG", "10:00-12:00")],
+            1: [("H202", "SEG", "10:00-12:00")],
+            2: [("H201", "TER", "10:00-12:00")],
+        }
+
+        neighborhoods = get_neighborhoods(
+            build_classrooms(self.classrooms),
+            build_sections(self.sections),
+            allocations,
+        )
+
+        by_name = {
+            (neighborhood.kind, neighborhood.name): neighborhood
+            for neighborhood in neighborhoods
+        }
+        self.assertEqual(by_name["building", "H"].sections, (1, 2))
+        self.assertEqual(by_name["building", "H"].classrooms, ("H201", "H202"))
+        self.assertEqual(by_name["slot", "SEG 10:00-12:00"].sections, (0, 1))
+        self.assertIsNone(by_name["slot", "SEG 10:00-12:00"].classrooms)
+        self.assertEqual(by_name["institute", "IM"].sections, (1,))
+
+    def test_improve_start(self):
+        # Seção 0 está na sala maior e seção 1 fora da sala do seu instituto
+        start = [
+            Allocation("F3014", 0, "SEG", "10:00-12:00"),
+            Allocation("H201", 1, "SEG", "10:00-12:00"),
+        ]
+        sections = {0: self.sections[0], 1: section(40, institute="IM")}
+
+        result = local_search(self.classrooms, sections, start, time_budget=30)
+
+        self.assertEqual(
+            sorted(result.assignment),
+            [
+                Allocation("H201", 0, "SEG", "10:00-12:00"),
+                Allocation("H202", 1, "SEG", "10:00-12:00"),
+            ],
+        )
+        self.assertAlmostEqual(result.objective_value, (100 - 1) + (100 - 1))
+        self.assertAlmostEqual(result.history[0][1], (100 - 3) + (10 - 0))
+        self.assertGreater(len(result.history), 1)
+
+    def test_allocate_missing_slots(self):
+        start = [Allocation("H201", 0, "SEG", "10:00-12:00")]
+
+        result = local_search(self.classrooms, self.sections, start, time_budget=30)
+
+        self.assertEqual(len(result.assignment), 3)
+        self.assertEqual(
+            {allocation.section for allocation in result.assignment}, {0, 1, 2}
+        )
+
+    def test_respect_time_budget(self):
+        start = [Allocation("F3014", 0, "SEG", "10:00-12:00")]
+
+        result = local_search(self.classrooms, self.sections, start, time_budget=0)
+
+        self.assertEqual(result.solved, 0)
+        self.assertEqual(result.assignment, start)
+        self.assertEqual(len(result.history), 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,21 @@ import unittest
 from unittest.mock import patch
 import sys
 import os
+import tempfile
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from main import ClassroomAssignment
+import settings
+from database.synthetic_data import generate_campus
+from database.transform_data import (
+    transform_classrooms_to_dict,
+    transform_sections_to_dict,
+)
+import main as main_module
+from main import ClassroomAssignment, ModelParameters, solve_decomposed, solve_full
+from utils.heuristic import allocate_greedy
+from utils.utils import Allocation, CapacityDiff
+from tests.fixtures import classroom, section
 
 
 class TestInitializeVariablesAndCoefficients(unittest.TestCase):
@@ -53,22 +64,597 @@ class TestAddCapacitySlackVariables(unittest.TestCase):
                 "capacity": 25,
                 "day": "SEG,QUA",
                 "time": "10:00-12:00",
-                "classroom_type": "Sala",
+                "classroom_type": "Teórica",
             },
             "Section2": {
                 "capacity": 15,
                 "day": "TER,QUI",
                 "time": "08:00-10:00",
+                "classroom_type": "Prática",
+            },
+        }
+        self.timetabling = ClassroomAssignment(
+            self.classrooms,
+            self.sections,
+            objective_mode=settings.ObjectiveMode.QUADRATIC.value,
+        )
+        self.timetabling.add_capacity_slack_variables()
+        return super().setUp()
+
+    def test_add_capacity_slack_variables_for_eligible_pairs(self):
+        self.assertEqual(
+            list(self.timetabling.slack_variables_capacity_diff.keys()),
+            [("Room1", "Section1"), ("Room2", "Section2")],
+        )
+
+
+class TestAddCapacityDiffCoefficients(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.classrooms = {
+            "Room1": {"capacity": 30, "classroom_type": "Sala"},
+            "Room2": {"capacity": 20, "classroom_type": "Laboratório"},
+        }
+        self.sections = {
+            "Section1": {
+                "capacity": 25,
+                "day": "SEG,QUA",
+                "time": "10:00-12:00",
+                "classroom_type": "Teórica",
+            },
+            "Section2": {
+                "capacity": 15,
+                "day": "TER,QUI",
+                "time": "08:00-10:00",
+                "classroom_type": "Prática",
+            },
+        }
+        self.timetabling = ClassroomAssignment(
+            self.classrooms,
+            self.sections,
+            objective_mode=settings.ObjectiveMode.LINEAR.value,
+        )
+        self.timetabling.add_capacity_slack_variables()
+        return super().setUp()
+
+    def test_do_not_add_capacity_slack_variables(self):
+        self.assertEqual(self.timetabling.slack_variables_capacity_diff, {})
+        self.assertEqual(self.timetabling.backend.num_variables, 0)
+
+    def test_add_capacity_diff_coefficient_for_eligible_pairs(self):
+        self.assertEqual(
+            self.timetabling.capacity_diff_coefficients,
+            {("Room1", "Section1"): 5, ("Room2", "Section2"): 5},
+        )
+
+
+class TestLinearObjective(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.classrooms = {
+            "Room1": {
+                "capacity": 60,
+                "classroom_type": "Sala",
+                "responsable_institute": "IC",
+            },
+            "Room_2": {
+                "capacity": 30,
+                "classroom_type": "Sala",
+                "responsable_institute": "IC",
+            },
+        }
+        self.sections = {
+            "Section1": {
+                "capacity": 25,
+                "day": "SEG",
+                "time": "10:00-12:00",
+                "classroom_type": "Teórica",
+                "responsable_institute": "IC",
+                "term": 2,
+                "class_type": "Regular",
+                "blackboard_restriction": False,
+            },
+        }
+        self.timetabling = ClassroomAssignment(
+            self.classrooms,
+            self.sections,
+            objective_mode=settings.ObjectiveMode.LINEAR.value,
+        )
+        self.timetabling.backend.set_output(False)
+        self.timetabling.initialize_variables_and_coefficients()
+        self.timetabling.add_capacity_slack_variables()
+        self.timetabling.add_constraints()
+        self.timetabling.set_objective()
+        self.timetabling.optimize()
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.timetabling.clean_model()
+        return super().tearDown()
+
+    def test_model_is_not_quadratic(self):
+        self.assertEqual(self.timetabling.backend.model.IsQP, 0)
+
+    def test_assign_smallest_classroom(self):
+        values = self.timetabling.backend.get_values(self.timetabling.variables)
+
+        self.assertEqual(values["Room_2", "Section1", "SEG", "10:00-12:00"], 1)
+        self.assertEqual(values["Room1", "Section1", "SEG", "10:00-12:00"], 0)
+
+    def test_get_results(self):
+        assignment, cap_diff = self.timetabling.get_results()
+
+        self.assertEqual(
+            assignment, [Allocation("Room_2", "Section1", "SEG", "10:00-12:00")]
+        )
+        self.assertEqual(cap_diff, [CapacityDiff("Room_2", "Section1", 5.0)])
+
+
+class TestObjectiveModes(unittest.TestCase):
+
+    def setUp(self) -> None:
+        # A sala do instituto tem 975 vagas sobrando; a outra comporta a seção exata
+        self.classrooms = {
+            "Room1": classroom(1000),
+            "Room2": classroom(25, institute="IM"),
+        }
+        self.sections = {"Section1": section(25)}
+        return super().setUp()
+
+    def solve(self, objective_mode: str, parameters: ModelParameters = None) -> list:
+        timetabling = ClassroomAssignment(
+            self.classrooms,
+            self.sections,
+            objective_mode=objective_mode,
+            parameters=parameters,
+        )
+        try:
+            timetabling.backend.set_output(False)
+            timetabling.build_model()
+            timetabling.optimize()
+            assignment, _ = timetabling.get_results()
+            return assignment
+        finally:
+            timetabling.clean_model()
+
+    def test_same_capacity_weight_in_both_modes(self):
+        expected = [Allocation("Room2", "Section1", "SEG", "10:00-12:00")]
+
+        for objective_mode in settings.ObjectiveMode:
+            with self.subTest(objective_mode=objective_mode.value):
+                self.assertEqual(self.solve(objective_mode.value), expected)
+
+    def test_prefer_responsible_institute_below_the_weight(self):
+        self.classrooms["Room1"]["capacity"] = 125
+        expected = [Allocation("Room1", "Section1", "SEG", "10:00-12:00")]
+
+        for objective_mode in settings.ObjectiveMode:
+            with self.subTest(objective_mode=objective_mode.value):
+                self.assertEqual(self.solve(objective_mode.value), expected)
+
+    def test_overflow_is_not_a_bonus(self):
+        # Com tolerância, a sala menor é permitida, mas não vale mais que a exata
+        self.classrooms = {"Room1": classroom(25), "Room2": classroom(30)}
+        self.sections = {"Section1": section(30)}
+        parameters = ModelParameters(capacity_tolerance=5)
+        expected = [Allocation("Room2", "Section1", "SEG", "10:00-12:00")]
+
+        for objective_mode in settings.ObjectiveMode:
+            with self.subTest(objective_mode=objective_mode.value):
+                self.assertEqual(
+                    self.solve(objective_mode.value, parameters), expected
+                )
+
+        self.assertEqual(
+            allocate_greedy(self.classrooms, self.sections, parameters).assignment,
+            expected,
+        )
+
+
+class TestSolveDecomposed(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.classrooms = {"Room1": classroom(30), "Room2": classroom(60)}
+        # Seções 0 e 1 dividem o horário de segunda; a 2 forma outro componente
+        self.sections = {
+            0: section(25),
+            1: section(50),
+            2: section(25, day="TER,QUI", time="08:00-10:00"),
+        }
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patches = [
+            patch.object(
+                main_module,
+                "SNAPSHOT_PATH",
+                os.path.join(directory.name, "snapshot.json"),
+            ),
+            patch.object(main_module.utils, "treat_and_save_results"),
+            patch.object(settings, "APP_PRECHECK", False),
+            patch.object(settings, "APP_DIAGNOSIS", False),
+        ]
+        for active_patch in patches:
+            active_patch.start()
+            self.addCleanup(active_patch.stop)
+        return super().setUp()
+
+    def test_same_assignment_as_full_model(self):
+        full_assignment, full_value = solve_full(
+            self.classrooms,
+            self.sections,
+            objective_mode=settings.ObjectiveMode.LINEAR.value,
+        )
+        assignment, model_value = solve_decomposed(
+            self.classrooms,
+            self.sections,
+            max_workers=2,
+            objective_mode=settings.ObjectiveMode.LINEAR.value,
+        )
+
+        self.assertEqual(sorted(assignment), sorted(full_assignment))
+        self.assertEqual(
+            sorted(assignment),
+            [
+                Allocation("Room1", 0, "SEG", "10:00-12:00"),
+                Allocation("Room1", 2, "QUI", "08:00-10:00"),
+                Allocation("Room1", 2, "TER", "08:00-10:00"),
+                Allocation("Room2", 1, "SEG", "10:00-12:00"),
+            ],
+        )
+        self.assertAlmostEqual(model_value, full_value)
+
+    @patch.object(settings, "APP_WARM_START", True)
+    @patch.object(settings, "APP_HEURISTIC_START", True)
+    @patch.object(ClassroomAssignment, "set_heuristic_start")
+    @patch.object(ClassroomAssignment, "set_warm_start")
+    def test_use_one_start_at_a_time(self, set_warm_start, set_heuristic_start):
+        solve_full(
+            self.classrooms,
+            self.sections,
+            objective_mode=settings.ObjectiveMode.LINEAR.value,
+        )
+
+        set_warm_start.assert_called_once()
+        set_heuristic_start.assert_not_called()
+
+
+class TestSetWarmStart(unittest.TestCase):
+
+    def setUp(self) -> None:
+        classrooms = {
+            "Room1": {
+                "capacity": 60,
+                "classroom_type": "Sala",
+                "responsable_institute": "IC",
+            },
+            "Room2": {
+                "capacity": 30,
+                "classroom_type": "Sala",
+                "responsable_institute": "IC",
+            },
+        }
+        sections = {
+            0: {
+                "capacity": 25,
+                "day": "SEG,QUA",
+                "time": "10:00-12:00",
+                "classroom_type": "Teórica",
+                "responsable_institute": "IC",
+                "course_id": "ICP131",
+                "professor": "PROFESSOR 1",
+                "graduation_course": "BCC1",
+            },
+            1: {
+                "capacity": 40,
+                "day": "TER",
+                "time": "08:00-10:00",
+                "classroom_type": "Teórica",
+                "responsable_institute": "IC",
+                "course_id": "ICP222",
+                "professor": "PROFESSOR 2",
+                "graduation_course": "BCC1",
+            },
+        }
+        self.timetabling = ClassroomAssignment(classrooms, sections)
+        self.timetabling.backend.set_output(False)
+        self.timetabling.initialize_variables_and_coefficients()
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "assignment.csv")
+        with open(self.filename, "w") as file:
+            file.write(
+                "Room2;PROFESSOR 1;BCC1;ICP131;Nome;1;SEG;10:00-12:00\n"
+                "Room1;PROFESSOR 1;BCC1;ICP131;Nome;1;QUA;10:00-12:00\n"
+                "Room2;PROFESSOR 2;BCC1;ICP222;Nome;1;TER;08:00-10:00\n"
+                "Room1;PROFESSOR 3;BCC1;ICP999;Nome;1;SEX;08:00-10:00\n"
+            )
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        self.timetabling.clean_model()
+        return super().tearDown()
+
+    def test_report_matched_rows(self):
+        report = self.timetabling.set_warm_start(self.filename)
+
+        self.assertEqual(
+            report,
+            {"rows": 4, "matched": 2, "without_section": 1, "without_variable": 1},
+        )
+
+    def test_set_start_of_matched_variables(self):
+        self.timetabling.set_warm_start(self.filename)
+        self.timetabling.backend.model.update()
+        variables = self.timetabling.variables
+
+        self.assertEqual(variables["Room2", 0, "SEG", "10:00-12:00"].Start, 1)
+        self.assertEqual(variables["Room1", 0, "QUA", "10:00-12:00"].Start, 1)
+
+    def test_ignore_missing_file(self):
+        report = self.timetabling.set_warm_start("missing_assignment.csv")
+
+        self.assertEqual(report["rows"], 0)
+
+
+class TestFilterEligibleClassrooms(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.classrooms = {
+            "Room1": {
+                "capacity": 30,
+                "classroom_type": "Sala",
+                "responsable_institute": "IC",
+                "board_type": "Quadro Negro / Lousa de Giz",
+            },
+            "Room2": {
+                "capacity": 20,
                 "classroom_type": "Laboratório",
+                "responsable_institute": "IC",
+                "board_type": "Branco",
+            },
+            "F3014": {
+                "capacity": 60,
+                "classroom_type": "Sala",
+                "responsable_institute": "IC",
+                "board_type": "Branco",
+            },
+        }
+        self.sections = {
+            "Section1": {
+                "capacity": 35,
+                "day": "SEG,QUA",
+                "time": "10:00-12:00",
+                "classroom_type": "Teórica",
+                "responsable_institute": "IC",
+                "term": 2,
+                "class_type": "Regular",
+                "blackboard_restriction": False,
+            },
+            "Section2": {
+                "capacity": 15,
+                "day": "TER,QUI",
+                "time": "08:00-10:00",
+                "classroom_type": "Teórica,Prática",
+                "responsable_institute": "IC",
+                "term": 1,
+                "class_type": "Calouro",
+                "blackboard_restriction": False,
+            },
+            "Section3": {
+                "capacity": 25,
+                "day": "SEX",
+                "time": "08:00-10:00",
+                "classroom_type": "Teórica",
+                "responsable_institute": "IC",
+                "term": 3,
+                "class_type": "Regular",
+                "blackboard_restriction": True,
             },
         }
         self.timetabling = ClassroomAssignment(self.classrooms, self.sections)
-        self.timetabling.add_capacity_slack_variables()
+        self.timetabling.initialize_variables_and_coefficients()
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.timetabling.clean_model()
+        return super().tearDown()
+
+    def test_filter_classrooms_by_type_and_capacity(self):
+        self.assertEqual(
+            self.timetabling.eligible_classrooms["Section1"], {"F3014"}
+        )
+
+    def test_filter_new_students_theory_classroom(self):
+        self.assertEqual(
+            self.timetabling.eligible_classrooms["Section2"], {"Room2", "F3014"}
+        )
+
+    def test_filter_blackboard_restriction(self):
+        self.assertEqual(self.timetabling.eligible_classrooms["Section3"], {"F3014"})
+
+    def test_only_create_variables_for_eligible_classrooms(self):
+        variables = self.timetabling.variables
+
+        self.assertNotIn(("Room1", "Section3", "SEX", "08:00-10:00"), variables)
+        self.assertIn(("F3014", "Section3", "SEX", "08:00-10:00"), variables)
+        self.assertEqual(len(variables), 7)
+
+    def test_report_removed_variables(self):
+        report = self.timetabling.variables_report
+
+        self.assertEqual(report["total_variables"], 15)
+        self.assertEqual(report["created_variables"], 7)
+        self.assertEqual(report["removed_variables"], 8)
+        self.assertEqual(
+            report["removed_by_rule"],
+            {"RN3": 3, "RN4": 2, "RN5": 1, "capacity": 2},
+        )
+
+
+class TestModelCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.classrooms = {
+            "Room1": {
+                "capacity": 60,
+                "classroom_type": "Sala",
+                "responsable_institute": "IC",
+            },
+            "Room 2": {
+                "capacity": 30,
+                "classroom_type": "Sala",
+                "responsable_institute": "IM",
+            },
+        }
+        self.sections = {
+            0: {
+                "capacity": 25,
+                "day": "SEG,QUA",
+                "time": "10:00-12:00",
+                "classroom_type": "Teórica",
+                "responsable_institute": "IC",
+            },
+            1: {
+                "capacity": 20,
+                "day": "SEG",
+                "time": "10:00-12:00",
+                "classroom_type": "Teórica",
+                "responsable_institute": "IM",
+            },
+        }
+        self.directory = tempfile.TemporaryDirectory()
+        patch("utils.model_cache.MODEL_CACHE_DIRECTORY", self.directory.name).start()
         return super().setUp()
 
-    def test_add_capacity_slack_variables_for_all_classrooms(self):
-        for classroom in self.classrooms.keys():
-            self.assertIn(classroom, self.timetabling.slack_variables_capacity_diff)
+    def tearDown(self) -> None:
+        patch.stopall()
+        self.directory.cleanup()
+        return super().tearDown()
+
+    def solve(self, objective_mode=settings.ObjectiveMode.LINEAR.value, sections=None):
+        timetabling = ClassroomAssignment(
+            self.classrooms, sections or self.sections, objective_mode=objective_mode
+        )
+        timetabling.backend.set_output(False)
+        cache_hit = timetabling.build_model(model_cache=True)
+        timetabling.optimize()
+        results = timetabling.get_results()
+        report = timetabling.variables_report
+        value = timetabling.backend.objective_value
+        timetabling.clean_model()
+
+        return cache_hit, results, report, value
+
+    def test_read_the_model_built_for_the_same_input(self):
+        miss = self.solve()
+        hit = self.solve()
+
+        self.assertFalse(miss[0])
+        self.assertTrue(hit[0])
+        self.assertEqual(hit[1:], miss[1:])
+
+    def test_read_the_quadratic_model_with_its_slack_variables(self):
+        miss = self.solve(settings.ObjectiveMode.QUADRATIC.value)
+        hit = self.solve(settings.ObjectiveMode.QUADRATIC.value)
+
+        self.assertTrue(hit[0])
+        self.assertEqual(hit[1:], miss[1:])
+
+    def test_build_again_when_the_input_changes(self):
+        self.solve()
+        sections = dict(self.sections)
+        sections[1] = dict(sections[1], capacity=35)
+
+        cache_hit, (assignment, _), _, _ = self.solve(sections=sections)
+
+        self.assertFalse(cache_hit)
+        self.assertIn(Allocation("Room1", 1, "SEG", "10:00-12:00"), assignment)
+
+    def test_register_lazy_constraints_of_cached_model(self):
+        timetabling = ClassroomAssignment(self.classrooms, self.sections, lazy_rn1=True)
+        timetabling.build_model(model_cache=True)
+        lazy_rn1_slots = timetabling.lazy_rn1_slots
+        timetabling.clean_model()
+
+        timetabling = ClassroomAssignment(self.classrooms, self.sections, lazy_rn1=True)
+        cache_hit = timetabling.build_model(model_cache=True)
+
+        self.assertTrue(cache_hit)
+        self.assertTrue(lazy_rn1_slots)
+        self.assertEqual(timetabling.lazy_rn1_slots, lazy_rn1_slots)
+        self.assertEqual(
+            len(timetabling.backend.lazy_constraints), len(lazy_rn1_slots)
+        )
+        timetabling.clean_model()
+
+    def test_options_change_the_fingerprint(self):
+        linear = ClassroomAssignment(self.classrooms, self.sections)
+        occupied = ClassroomAssignment(
+            self.classrooms,
+            self.sections,
+            occupied_slots={("Room1", "QUA", "10:00-12:00")},
+        )
+
+        self.assertNotEqual(
+            linear.get_model_fingerprint(), occupied.get_model_fingerprint()
+        )
+        linear.clean_model()
+        occupied.clean_model()
+
+    def test_formulation_version_changes_the_fingerprint(self):
+        timetabling = ClassroomAssignment(self.classrooms, self.sections)
+        fingerprint = timetabling.get_model_fingerprint()
+
+        with patch.object(
+            main_module, "MODEL_CACHE_VERSION", main_module.MODEL_CACHE_VERSION + 1
+        ):
+            self.assertNotEqual(timetabling.get_model_fingerprint(), fingerprint)
+        timetabling.clean_model()
+
+
+class TestLazyRN1(unittest.TestCase):
+
+    def setUp(self) -> None:
+        sections, classrooms = generate_campus(30, seed=0)
+        self.classrooms = transform_classrooms_to_dict(classrooms)
+        self.sections = transform_sections_to_dict(sections)
+        return super().setUp()
+
+    def solve(self, lazy_rn1: bool) -> ClassroomAssignment:
+        timetabling = ClassroomAssignment(
+            self.classrooms, self.sections, lazy_rn1=lazy_rn1
+        )
+        timetabling.backend.set_output(False)
+        timetabling.build_model()
+        timetabling.optimize()
+        self.addCleanup(timetabling.clean_model)
+
+        return timetabling
+
+    def test_same_objective_with_fewer_constraints(self):
+        eager = self.solve(lazy_rn1=False)
+        lazy = self.solve(lazy_rn1=True)
+
+        self.assertAlmostEqual(
+            lazy.backend.objective_value, eager.backend.objective_value
+        )
+        self.assertLess(lazy.backend.num_constraints, eager.backend.num_constraints)
+
+    def test_add_only_violated_constraints(self):
+        timetabling = self.solve(lazy_rn1=True)
+        stats = timetabling.backend.get_stats()
+        assignment, _ = timetabling.get_results()
+
+        self.assertGreater(stats["LazyConstraintsAdded"], 0)
+        self.assertGreater(stats["LazyConstraintsPending"], 0)
+        self.assertEqual(
+            stats["LazyConstraintsAdded"] + stats["LazyConstraintsPending"],
+            len(timetabling.lazy_rn1_slots),
+        )
+        occupied = [(a.classroom, a.day, a.time) for a in assignment]
+        self.assertEqual(len(occupied), len(set(occupied)))
 
 
 if __name__ == "__main__":
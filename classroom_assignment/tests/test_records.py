@@ -0,0 +1,99 @@
+from unittest import TestCase, main
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)  # FIXME quero corrigir de outra forma
+
+from database.records import (
+    Classroom,
+    ClassroomType,
+    Section,
+    build_classrooms,
+    build_sections,
+)
+
+
+class TestBuildSections(TestCase):
+
+    def setUp(self) -> None:
+        self.sections = build_sections(
+            {
+                0: {
+                    "responsable_institute": "IC",
+                    "graduation_course": "BCC1",
+                    "professor": "PROFESSOR 1",
+                    "course_id": "ICP131",
+                    "course_name": "Programação",
+                    "day": "SEG,QUA",
+                    "time": "08:00-10:00",
+                    "capacity": 40,
+                    "classroom_type": "Teórica,Prática",
+                    "term": 1,
+                    "class_type": "Calouro",
+                    "blackboard_restriction": True,
+                },
+                1: {
+                    "day": "QUA",
+                    "time": "08:00-10:00",
+                    "classroom_type": "Teórica",
+                    "blackboard_restriction": False,
+                },
+            }
+        )
+        return super().setUp()
+
+    def test_parse_schedule_once(self):
+        self.assertEqual(
+            self.sections[0].slots,
+            (("SEG", "08:00-10:00"), ("QUA", "08:00-10:00")),
+        )
+
+    def test_count_classroom_type_demand(self):
+        self.assertEqual(self.sections[0].theory_slots, 1)
+        self.assertEqual(self.sections[0].practical_slots, 1)
+        self.assertEqual(self.sections[1].theory_slots, 1)
+
+    def test_flag_new_students_and_blackboard_restriction(self):
+        self.assertTrue(self.sections[0].is_new_students)
+        self.assertTrue(self.sections[0].blackboard_restriction)
+        self.assertFalse(self.sections[1].is_new_students)
+        self.assertFalse(self.sections[1].blackboard_restriction)
+
+    def test_intern_repeated_values(self):
+        self.assertIs(self.sections[0].slots[1][0], self.sections[1].slots[0][0])
+        self.assertIs(self.sections[0].slots[0][1], self.sections[1].slots[0][1])
+
+    def test_keep_records(self):
+        sections = build_sections(self.sections)
+
+        self.assertIsInstance(sections[0], Section)
+        self.assertIs(sections[0], self.sections[0])
+
+
+class TestBuildClassrooms(TestCase):
+
+    def test_code_classroom_types(self):
+        classrooms = build_classrooms(
+            {
+                "A": {"classroom_type": "Sala", "capacity": 30, "board_type": "Branco"},
+                "B": {"classroom_type": "Laboratório", "capacity": 20},
+                "C": {
+                    "classroom_type": "Anfiteatro",
+                    "capacity": 90,
+                    "board_type": "Quadro Negro / Lousa de Giz",
+                },
+            }
+        )
+
+        self.assertEqual(
+            classrooms["A"], Classroom(None, ClassroomType.SALA, 30, False)
+        )
+        self.assertEqual(classrooms["B"].classroom_type, ClassroomType.LABORATORIO)
+        self.assertEqual(classrooms["C"].classroom_type, ClassroomType.OTHER)
+        self.assertTrue(classrooms["C"].is_blackboard)
+
+
+if __name__ == "__main__":
+    main()
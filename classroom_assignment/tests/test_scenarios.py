@@ -0,0 +1,96 @@
+from unittest import TestCase, main
+import json
+import sys
+import os
+import tempfile
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)  # FIXME quero corrigir de outra forma
+
+from database.records import build_classrooms
+from scenarios import apply_scenario, load_scenarios, run_scenarios
+
+
+class TestScenarios(TestCase):
+
+    def setUp(self) -> None:
+        self.classrooms = {
+            "F3014": {
+                "capacity": 60,
+                "classroom_type": "Sala",
+                "responsable_institute": "IC",
+            },
+            "H201": {
+                "capacity": 30,
+                "classroom_type": "Sala",
+                "responsable_institute": "IM",
+            },
+        }
+        self.sections = {
+            0: {
+                "capacity": 40,
+                "day": "SEG",
+                "time": "10:00-12:00",
+                "classroom_type": "Teórica",
+                "responsable_institute": "IC",
+                "term": 1,
+                "class_type": "Calouro",
+            },
+            1: {
+                "capacity": 25,
+                "day": "TER",
+                "time": "10:00-12:00",
+                "classroom_type": "Teórica",
+                "responsable_institute": "IC",
+            },
+        }
+        return super().setUp()
+
+    def test_apply_closed_classrooms_and_capacities(self):
+        classrooms = apply_scenario(
+            build_classrooms(self.classrooms),
+            {"close_classrooms": ["F*"], "classroom_capacity": {"H201": 45}},
+        )
+
+        self.assertEqual(list(classrooms), ["H201"])
+        self.assertEqual(classrooms["H201"].capacity, 45)
+
+    def test_compare_scenarios(self):
+        scenarios = [
+            {"name": "base"},
+            {"name": "closed", "close_classrooms": ["F3014"]},
+            {
+                "name": "without_rn4",
+                "close_classrooms": ["F3014"],
+                "classroom_capacity": {"H201": 35},
+                "parameters": {"new_students_classroom": None, "capacity_tolerance": 5},
+            },
+        ]
+
+        table = run_scenarios(self.classrooms, self.sections, scenarios, max_workers=1)
+
+        self.assertEqual(table["scenario"].tolist(), ["base", "closed", "without_rn4"])
+        self.assertEqual(table["status"].tolist(), ["optimal", "infeasible", "optimal"])
+        self.assertEqual(table.loc[0, "rooms_used"], 1)
+        self.assertEqual(table.loc[0, "capacity_waste"], 20 + 35)
+        self.assertEqual(table.loc[2, "rooms_used"], 1)
+        self.assertEqual(table.loc[2, "capacity_waste"], 0 + 10)
+
+    def test_reject_unknown_overrides(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "scenarios.json")
+
+            for scenario in [
+                {"name": "a", "close": ["F*"]},
+                {"name": "b", "parameters": {"rn4": False}},
+            ]:
+                with open(filename, "w") as file:
+                    json.dump([scenario], file)
+
+                with self.assertRaises((ValueError, TypeError)):
+                    load_scenarios(filename)
+
+
+if __name__ == "__main__":
+    main()
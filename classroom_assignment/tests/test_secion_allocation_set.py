@@ -2,40 +2,46 @@ from unittest import TestCase, main
 from unittest.mock import patch
 import sys
 import os
+import tempfile
 import pandas as pd
 
-from functools import wraps
-
 sys.path.insert(
     0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 )  # FIXME quero corrigir de outra forma
 
-
-def mock_decorator(*args, **kwargs):
-    """Decorate by doing nothing."""
-
-    def decorator(f):
-        @wraps(f)
-        def decorated_function(*args, **kwargs):
-            return f(*args, **kwargs)
-
-        return decorated_function
-
-    return decorator
-
-
-patch("cache_pandas.cache_to_csv", mock_decorator).start()
-
 from database.service_google_sheet import (
+    CLASSROOMS_RANGE,
+    SECTIONS_RANGE,
+    SpreadsheetTabs,
+    get_classrooms_available,
     get_secion_allocation,
 )
-from database.transform_data import transform_sections_to_dict
+from tests.stub_sheets_service import StubSheetsService, dataframe_to_values
+from database.table_cache import read_csv_table
+from database.transform_data import (
+    transform_classrooms_to_dict,
+    transform_sections_to_dict,
+)
+from benchmark import (
+    CACHED_CLASSROOMS_PATH,
+    CACHED_SECTIONS_PATH,
+    transform_classrooms_to_dict_rowwise,
+    transform_sections_to_dict_rowwise,
+)
+
+REPOSITORY_PATH = os.path.join(os.path.dirname(__file__), "..", "..")
 
 
 class TestSectionAllocationFromGoogleSheets(TestCase):
 
-    @patch("database.service_google_sheet.read_google_sheet_to_dataframe")
-    def test_get_secion_allocation(self, mock_read_google_sheet):
+    def setUp(self) -> None:
+        cache_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_directory.cleanup)
+        patch("database.table_cache.CACHE_DIRECTORY", cache_directory.name).start()
+        self.addCleanup(patch.stopall)
+        return super().setUp()
+
+    def test_get_secion_allocation(self):
         mock_data = pd.DataFrame(
             {
                 "Instituto responsável": ["IC", "IC"],
@@ -50,9 +56,9 @@ class TestSectionAllocationFromGoogleSheets(TestCase):
             },
         )
 
-        mock_read_google_sheet.return_value = mock_data
+        service = StubSheetsService({SECTIONS_RANGE: dataframe_to_values(mock_data)})
 
-        result = get_secion_allocation()
+        result = get_secion_allocation(SpreadsheetTabs("sheet_id", service))
 
         expected_data = pd.DataFrame(
             {
@@ -68,9 +74,24 @@ class TestSectionAllocationFromGoogleSheets(TestCase):
             }
         )
 
-        mock_read_google_sheet.assert_called_once()
         pd.testing.assert_frame_equal(result, expected_data)
 
+    def test_fetch_both_tabs_in_a_single_request(self):
+        service = StubSheetsService(
+            {
+                SECTIONS_RANGE: [["Período"], ["1"]],
+                CLASSROOMS_RANGE: [["Disponível", "Nome"], ["TRUE", "Sala 1"]],
+            }
+        )
+        tabs = SpreadsheetTabs("sheet_id", service)
+
+        sections = get_secion_allocation(tabs)
+        classrooms = get_classrooms_available(tabs)
+
+        self.assertEqual(len(service.requests), 1)
+        self.assertEqual(sections["term"].tolist(), [1])
+        self.assertEqual(classrooms.index.tolist(), ["Sala 1"])
+
 
 class TestTransformSectionAllocation(TestCase):
 
@@ -124,6 +145,53 @@ class TestTransformSectionAllocation(TestCase):
 
         self.assertDictEqual(result, expected_result)
 
+    def test_treat_section_allocation_codes_and_missing_values(self):
+        section_allocation = pd.DataFrame(
+            {
+                "day": ["SEG,QUA", None, "SEX"],
+                "time": ["08:00-10:00", "10:00-12:00", "13:00-15:00"],
+                "capacity": ["40", "30", None],
+                "classroom_type": ["T,P", "T", None],
+                "blackboard_restriction": ["TRUE", "FALSE", "FALSE"],
+            }
+        )
+
+        result = transform_sections_to_dict(section_allocation)
+
+        expected_result = {
+            0: {
+                "day": "SEG,QUA",
+                "time": "08:00-10:00",
+                "capacity": 40,
+                "classroom_type": "Teórica,Prática",
+                "blackboard_restriction": True,
+            },
+            2: {
+                "day": "SEX",
+                "time": "13:00-15:00",
+                "capacity": 0,
+                "classroom_type": "NAO INFORMADO",
+                "blackboard_restriction": False,
+            },
+        }
+
+        self.assertDictEqual(result, expected_result)
+
+    def test_same_output_as_rowwise_cleaning_on_cached_data(self):
+        sections = read_csv_table(os.path.join(REPOSITORY_PATH, CACHED_SECTIONS_PATH))
+        classrooms = read_csv_table(
+            os.path.join(REPOSITORY_PATH, CACHED_CLASSROOMS_PATH)
+        )
+
+        self.assertEqual(
+            transform_sections_to_dict(sections),
+            transform_sections_to_dict_rowwise(sections),
+        )
+        self.assertEqual(
+            transform_classrooms_to_dict(classrooms),
+            transform_classrooms_to_dict_rowwise(classrooms),
+        )
+
 
 if __name__ == "__main__":
     main()
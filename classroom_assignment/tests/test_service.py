@@ -0,0 +1,132 @@
+from unittest import TestCase, main
+from unittest.mock import patch
+import io
+import json
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)  # FIXME quero corrigir de outra forma
+
+from main import ClassroomAssignment
+from service import AllocationService, serve
+from tests.fixtures import classroom, section
+
+
+class TestAllocationService(TestCase):
+
+    def setUp(self) -> None:
+        classrooms = {"Room1": classroom(60), "Room2": classroom(30)}
+        sections = {0: section(25)}
+        assignment = [("Room1", 0, "SEG", "10:00-12:00")]
+
+        self.service = AllocationService(classrooms, sections, assignment)
+        return super().setUp()
+
+    def test_query_free_classroom(self):
+        response = self.service.handle(
+            {"action": "query", "section": section(20)}
+        )
+
+        self.assertEqual(
+            response,
+            {"status": "ok", "allocation": [("Room2", "SEG", "10:00-12:00")], "moved": []},
+        )
+        self.assertNotIn("__query__", self.service.sections)
+
+    def test_move_neighbour_when_no_classroom_is_free(self):
+        response = self.service.handle(
+            {"action": "add", "id": 1, "section": section(50)}
+        )
+
+        self.assertEqual(response["allocation"], [("Room1", "SEG", "10:00-12:00")])
+        self.assertEqual(
+            response["moved"],
+            [{"id": 0, "allocation": [("Room2", "SEG", "10:00-12:00")]}],
+        )
+        self.assertEqual(
+            sorted(self.service.get_assignment()),
+            [("Room1", 1, "SEG", "10:00-12:00"), ("Room2", 0, "SEG", "10:00-12:00")],
+        )
+
+    def test_report_section_that_does_not_fit(self):
+        self.service.handle({"action": "add", "id": 1, "section": section(20)})
+
+        response = self.service.handle(
+            {"action": "add", "id": 2, "section": section(10)}
+        )
+
+        self.assertEqual(response, {"status": "infeasible"})
+        self.assertNotIn(2, self.service.sections)
+
+    def test_remove_section_frees_its_classroom(self):
+        self.service.handle({"action": "add", "id": 1, "section": section(20)})
+        self.service.handle({"action": "remove", "id": 0})
+
+        response = self.service.handle(
+            {"action": "query", "section": section(50)}
+        )
+
+        self.assertEqual(response["allocation"], [("Room1", "SEG", "10:00-12:00")])
+
+    def test_report_invalid_requests(self):
+        self.assertEqual(
+            self.service.handle({"action": "remove", "id": 9})["status"], "error"
+        )
+        self.assertEqual(self.service.handle({"action": "move"})["status"], "error")
+
+    def test_report_invalid_sections(self):
+        without_time = section(20)
+        del without_time["time"]
+
+        for details in [
+            without_time,
+            section(20, day="SEG,QUA", time="08:00-10:00,10:00-12:00,13:00-15:00"),
+            section("vinte"),
+            "SEG 10:00-12:00",
+        ]:
+            with self.subTest(details=details):
+                response = self.service.handle(
+                    {"action": "add", "id": 1, "section": details}
+                )
+
+                self.assertEqual(response["status"], "error")
+                self.assertNotIn(1, self.service.sections)
+
+    def test_convert_section_fields(self):
+        response = self.service.handle(
+            {
+                "action": "query",
+                "section": section("20", blackboard_restriction="FALSE"),
+            }
+        )
+
+        self.assertEqual(response["allocation"], [("Room2", "SEG", "10:00-12:00")])
+
+    def test_release_environment_when_solve_fails(self):
+        with patch.object(
+            ClassroomAssignment, "optimize", side_effect=RuntimeError("solver error")
+        ), patch.object(ClassroomAssignment, "clean_model") as clean_model:
+            response = self.service.handle({"action": "query", "section": section(20)})
+
+        self.assertEqual(response, {"status": "error", "message": "solver error"})
+        clean_model.assert_called_once()
+
+    def test_serve_json_lines(self):
+        requests = io.StringIO(
+            json.dumps({"action": "query", "section": section(20)})
+            + "\n\nnot json\n[]\n"
+        )
+        responses = io.StringIO()
+
+        serve(self.service, requests, responses)
+
+        lines = [json.loads(line) for line in responses.getvalue().splitlines()]
+        self.assertEqual(lines[0]["allocation"], [["Room2", "SEG", "10:00-12:00"]])
+        self.assertEqual(lines[1]["status"], "error")
+        self.assertEqual(lines[2]["status"], "error")
+
+
+if __name__ == "__main__":
+    main()
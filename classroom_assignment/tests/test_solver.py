@@ -0,0 +1,242 @@
+import importlib.util
+import threading
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)  # FIXME quero corrigir de outra forma
+
+import gurobipy as gp
+
+import settings
+from main import ClassroomAssignment
+from solver.gurobi_backend import GurobiBackend
+from solver.gurobi_environment import EnvironmentPool
+from solver.backend import (
+    EQUAL,
+    LESS_EQUAL,
+    SolverStatus,
+    VariableType,
+    get_backend,
+    get_max_workers,
+)
+from utils.utils import Allocation
+
+HAS_HIGHS = importlib.util.find_spec("highspy") is not None
+
+
+class BackendTestMixin:
+    solver = None
+
+    def setUp(self) -> None:
+        self.backend = get_backend(self.solver)
+        self.backend.set_output(False)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.backend.dispose()
+        return super().tearDown()
+
+    def test_solve_linear_model(self):
+        variables = self.backend.add_variables(["a", "b", "c"], VariableType.BINARY)
+        self.backend.add_constraint(list(variables.values()), LESS_EQUAL, 2)
+        self.backend.add_constraint(
+            [variables["a"], variables["b"]], EQUAL, 1, coefficients=[1.0, 1.0]
+        )
+        self.backend.set_objective(list(variables.values()), [3.0, 2.0, 1.0])
+        self.backend.optimize()
+
+        self.assertEqual(self.backend.status, SolverStatus.OPTIMAL)
+        self.assertAlmostEqual(self.backend.objective_value, 4.0)
+        values = self.backend.get_values(variables)
+
+        self.assertEqual(
+            {key: round(value) for key, value in values.items()},
+            {"a": 1, "b": 0, "c": 1},
+        )
+
+    def test_report_infeasible_model(self):
+        variables = self.backend.add_variables(["a"], VariableType.BINARY)
+        self.backend.add_constraint([variables["a"]], EQUAL, 2)
+        self.backend.set_objective([variables["a"]], [1.0])
+        self.backend.optimize()
+
+        self.assertEqual(self.backend.status, SolverStatus.INFEASIBLE)
+
+    def test_solve_empty_model(self):
+        self.backend.set_objective([], [])
+        self.backend.optimize()
+
+        self.assertEqual(self.backend.status, SolverStatus.OPTIMAL)
+
+    def test_assign_classroom(self):
+        classrooms = {
+            "Room1": {
+                "capacity": 60,
+                "classroom_type": "Sala",
+                "responsable_institute": "IC",
+            },
+            "Room2": {
+                "capacity": 30,
+                "classroom_type": "Sala",
+                "responsable_institute": "IC",
+            },
+        }
+        sections = {
+            "Section1": {
+                "capacity": 25,
+                "day": "SEG",
+                "time": "10:00-12:00",
+                "classroom_type": "Teórica",
+                "responsable_institute": "IC",
+                "blackboard_restriction": False,
+            },
+        }
+        timetabling = ClassroomAssignment(classrooms, sections, solver=self.solver)
+        timetabling.backend.set_output(False)
+        timetabling.initialize_variables_and_coefficients()
+        timetabling.add_capacity_slack_variables()
+        timetabling.add_constraints()
+        timetabling.set_objective()
+        timetabling.optimize()
+
+        assignment, _ = timetabling.get_results()
+        timetabling.clean_model()
+
+        self.assertEqual(
+            assignment, [Allocation("Room2", "Section1", "SEG", "10:00-12:00")]
+        )
+
+
+class TestGurobiBackend(BackendTestMixin, unittest.TestCase):
+    solver = settings.Solver.GUROBI.value
+
+    def test_unavailable_stats_are_none(self):
+        def get_attr(attr):
+            if attr == "NumVars":
+                return 10
+            raise gp.GurobiError(10005, "Unable to retrieve attribute")
+
+        model = self.backend.model
+        self.backend.model = Mock()
+        self.backend.model.getAttr.side_effect = get_attr
+
+        stats = self.backend.get_stats()
+        self.backend.model = model
+
+        self.assertEqual(stats["NumVars"], 10)
+        self.assertIsNone(stats["MIPGap"])
+
+
+@unittest.skipUnless(HAS_HIGHS, "highspy is not installed")
+class TestHighsBackend(BackendTestMixin, unittest.TestCase):
+    solver = settings.Solver.HIGHS.value
+
+    def test_reject_quadratic_objective(self):
+        with self.assertRaises(ValueError):
+            ClassroomAssignment(
+                {},
+                {},
+                objective_mode=settings.ObjectiveMode.QUADRATIC.value,
+                solver=self.solver,
+            )
+
+
+class TestEnvironmentPool(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.pool = EnvironmentPool()
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.pool.close()
+        return super().tearDown()
+
+    def test_reuse_environment_of_disposed_backend(self):
+        backend = GurobiBackend(pool=self.pool)
+        env = backend.env
+        backend.dispose()
+
+        backend = GurobiBackend(pool=self.pool)
+
+        self.assertIs(backend.env, env)
+        self.assertEqual(self.pool.started, 1)
+        backend.dispose()
+
+    def test_start_one_environment_per_concurrent_backend(self):
+        backends = [GurobiBackend(pool=self.pool) for _ in range(2)]
+
+        self.assertIsNot(backends[0].env, backends[1].env)
+        self.assertEqual(self.pool.started, 2)
+        for backend in backends:
+            backend.dispose()
+
+    def test_wait_for_a_released_environment_when_full(self):
+        self.pool = EnvironmentPool(size=1)
+        env = self.pool.acquire()
+        acquired = []
+
+        thread = threading.Thread(target=lambda: acquired.append(self.pool.acquire()))
+        thread.start()
+        thread.join(timeout=0.2)
+        self.assertEqual(acquired, [])
+
+        self.pool.release(env)
+        thread.join(timeout=5)
+
+        self.assertEqual(acquired, [env])
+        self.pool.release(env)
+
+    def test_keep_given_environment_open(self):
+        env = self.pool.acquire()
+        backend = GurobiBackend(env=env)
+        backend.dispose()
+
+        self.assertEqual(self.pool.idle, [])
+        self.assertEqual(env.getParam("OutputFlag"), 1)
+        self.pool.release(env)
+
+    def test_do_not_lend_after_close(self):
+        self.pool.close()
+
+        with self.assertRaises(RuntimeError):
+            self.pool.acquire()
+
+
+class TestGetBackend(unittest.TestCase):
+
+    def test_unknown_solver(self):
+        with self.assertRaises(ValueError):
+            get_backend("cplex")
+
+
+class TestGetMaxWorkers(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.environments = settings.APP_GUROBI_ENVIRONMENTS
+        settings.APP_GUROBI_ENVIRONMENTS = 2
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        settings.APP_GUROBI_ENVIRONMENTS = self.environments
+        return super().tearDown()
+
+    def test_cap_gurobi_workers_at_environments(self):
+        self.assertEqual(get_max_workers(8, settings.Solver.GUROBI.value), 2)
+        self.assertEqual(get_max_workers(1, settings.Solver.GUROBI.value), 1)
+        self.assertLessEqual(get_max_workers(None, settings.Solver.GUROBI.value), 2)
+
+    def test_keep_other_solver_workers(self):
+        self.assertEqual(get_max_workers(8, settings.Solver.HIGHS.value), 8)
+
+    def test_no_cap_without_environments(self):
+        settings.APP_GUROBI_ENVIRONMENTS = None
+
+        self.assertEqual(get_max_workers(8, settings.Solver.GUROBI.value), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+from unittest import TestCase, main
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)  # FIXME quero corrigir de outra forma
+
+import settings
+from database.records import build_classrooms
+from main import ClassroomAssignment
+from utils.symmetry import disaggregate_assignment, group_identical_classrooms
+from utils.utils import Allocation
+from tests.fixtures import classroom, section
+
+
+class TestGroupIdenticalClassrooms(TestCase):
+
+    def test_group_by_record_and_keep_distinct(self):
+        classrooms = build_classrooms(
+            {
+                "F3014": classroom(40),
+                "H201": classroom(40),
+                "H202": classroom(40),
+                "H203": classroom(40, institute="IM"),
+                "LAB1": classroom(40, "Laboratório"),
+            }
+        )
+
+        groups = group_identical_classrooms(classrooms, distinct=("F3014",))
+
+        self.assertEqual(
+            groups,
+            {
+                "F3014": ("F3014",),
+                "H201": ("H201", "H202"),
+                "H203": ("H203",),
+                "LAB1": ("LAB1",),
+            },
+        )
+
+
+class TestDisaggregateAssignment(TestCase):
+
+    def test_keep_section_classroom_and_skip_occupied(self):
+        groups = {"H201": ("H201", "H202", "H203")}
+        assignment = [
+            Allocation("H201", 0, "SEG", "10:00-12:00"),
+            Allocation("H201", 1, "SEG", "10:00-12:00"),
+            Allocation("H201", 1, "QUA", "10:00-12:00"),
+        ]
+
+        disaggregated = disaggregate_assignment(
+            assignment, groups, {("H201", "SEG", "10:00-12:00")}
+        )
+
+        self.assertEqual(
+            disaggregated,
+            [
+                Allocation("H202", 0, "SEG", "10:00-12:00"),
+                Allocation("H203", 1, "SEG", "10:00-12:00"),
+                Allocation("H203", 1, "QUA", "10:00-12:00"),
+            ],
+        )
+
+
+class TestAggregateClassrooms(TestCase):
+
+    def setUp(self) -> None:
+        self.classrooms = {
+            "F3014": classroom(60),
+            "H201": classroom(40),
+            "H202": classroom(40),
+            "H203": classroom(40),
+            "H204": classroom(40, institute="IM"),
+        }
+        self.sections = {
+            0: section(30, day="SEG,QUA"),
+            1: section(35),
+            2: section(25),
+            3: section(20, day="QUA"),
+        }
+        self.occupied_slots = {("H201", "SEG", "10:00-12:00")}
+        return super().setUp()
+
+    def solve(self, objective_mode: str, aggregate_classrooms: bool) -> tuple:
+        timetabling = ClassroomAssignment(
+            self.classrooms,
+            self.sections,
+            objective_mode=objective_mode,
+            occupied_slots=self.occupied_slots,
+            aggregate_classrooms=aggregate_classrooms,
+        )
+        try:
+            timetabling.backend.set_output(False)
+            timetabling.build_model()
+            timetabling.optimize()
+            assignment, cap_diff = timetabling.get_results()
+
+            return (
+                timetabling.backend.objective_value,
+                timetabling.backend.num_variables,
+                assignment,
+                cap_diff,
+            )
+        finally:
+            timetabling.clean_model()
+
+    def test_same_objective_with_fewer_variables(self):
+        for objective_mode in settings.ObjectiveMode:
+            with self.subTest(objective_mode=objective_mode):
+                objective, num_variables, _, _ = self.solve(objective_mode.value, False)
+                (
+                    aggregated_objective,
+                    aggregated_num_variables,
+                    assignment,
+                    cap_diff,
+                ) = self.solve(objective_mode.value, True)
+
+                self.assertAlmostEqual(aggregated_objective, objective)
+                self.assertLess(aggregated_num_variables, num_variables)
+                self.assertTrue(
+                    all(
+                        allocation.classroom in self.classrooms
+                        for allocation in assignment
+                    )
+                )
+                self.assertTrue(
+                    all(row.classroom in self.classrooms for row in cap_diff)
+                )
+
+    def test_assignment_is_valid_per_classroom(self):
+        _, _, assignment, _ = self.solve(settings.ObjectiveMode.LINEAR.value, True)
+
+        slots = [
+            (allocation.classroom, allocation.day, allocation.time)
+            for allocation in assignment
+        ]
+        self.assertEqual(len(slots), len(set(slots)))
+        self.assertEqual(len(assignment), 5)
+        self.assertFalse(set(slots) & self.occupied_slots)
+
+
+if __name__ == "__main__":
+    main()
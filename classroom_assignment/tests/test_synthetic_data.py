@@ -0,0 +1,75 @@
+from unittest import TestCase, main
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)  # FIXME quero corrigir de outra forma
+
+from database.synthetic_data import generate_campus
+from database.records import build_sections
+from database.transform_data import (
+    transform_sections_to_dict,
+    transform_classrooms_to_dict,
+)
+from utils.utils import build_schedule_index
+
+
+class TestGenerateCampus(TestCase):
+
+    def setUp(self) -> None:
+        self.sections, self.classrooms = generate_campus(500, seed=42)
+        return super().setUp()
+
+    def test_sections_schema(self):
+        self.assertEqual(
+            list(self.sections.columns),
+            [
+                "responsable_institute",
+                "graduation_course",
+                "professor",
+                "course_id",
+                "course_name",
+                "day",
+                "time",
+                "capacity",
+                "classroom_type",
+                "term",
+                "class_type",
+                "blackboard_restriction",
+            ],
+        )
+        self.assertEqual(len(self.sections), 500)
+        self.assertEqual(self.sections["term"].dtype, int)
+
+    def test_classrooms_schema(self):
+        self.assertEqual(self.classrooms.index.name, "classroom_name")
+        self.assertEqual(
+            list(self.classrooms.columns),
+            [
+                "responsable_institute",
+                "classroom_type",
+                "capacity_siga",
+                "capacity",
+                "board_type",
+            ],
+        )
+        self.assertIn("F3014", self.classrooms.index)
+
+    def test_same_seed_generates_same_campus(self):
+        sections, classrooms = generate_campus(500, seed=42)
+
+        self.assertTrue(sections.equals(self.sections))
+        self.assertTrue(classrooms.equals(self.classrooms))
+
+    def test_slot_demand_does_not_exceed_classrooms(self):
+        sections = build_sections(transform_sections_to_dict(self.sections))
+        classrooms = transform_classrooms_to_dict(self.classrooms)
+        schedule = build_schedule_index(sections)
+
+        for slot_sections in schedule.slot_sections.values():
+            self.assertLessEqual(len(slot_sections), len(classrooms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+from unittest import TestCase, main
+from unittest.mock import Mock, patch
+import sys
+import os
+import tempfile
+import pandas as pd
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)  # FIXME quero corrigir de outra forma
+
+from database.service_google_sheet import (
+    SECTIONS_RANGE,
+    SpreadsheetTabs,
+    treat_section_allocation,
+)
+from database.table_cache import get_cache_path, load_cached_table, load_entry
+from tests.stub_sheets_service import StubSheetsService
+
+VALUES = [
+    ["Código disciplina", "Período", "Restrição quadro negro"],
+    ["ICP131", "1", "TRUE"],
+    ["ICP132", "2", "FALSE"],
+]
+
+
+class TestLoadCachedTable(TestCase):
+
+    def setUp(self) -> None:
+        cache_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_directory.cleanup)
+        self.directory = cache_directory.name
+        self.values = {SECTIONS_RANGE: VALUES}
+        self.treat = Mock(side_effect=treat_section_allocation)
+        return super().setUp()
+
+    def load(self, refresh_time=3600, service=None, seed_filename=None):
+        service = service or StubSheetsService(self.values)
+        table = load_cached_table(
+            SpreadsheetTabs("sheet_id", service),
+            SECTIONS_RANGE,
+            self.treat,
+            refresh_time=refresh_time,
+            directory=self.directory,
+            seed_filename=seed_filename,
+        )
+        return table, service
+
+    def write_seed(self) -> str:
+        treat_section_allocation(pd.DataFrame(VALUES[1:], columns=VALUES[0])).to_csv(
+            os.path.join(self.directory, "seed.csv")
+        )
+        return "seed.csv"
+
+    def test_keep_dtypes(self):
+        self.load()
+        table, _ = self.load()
+
+        self.assertTrue(pd.api.types.is_integer_dtype(table["term"]))
+        self.assertEqual(table["term"].tolist(), [1, 2])
+        self.assertEqual(table.index.tolist(), [0, 1])
+
+    def test_do_not_fetch_before_refresh_time(self):
+        self.load()
+        table, service = self.load()
+
+        self.assertEqual(service.requests, [])
+        self.assertEqual(self.treat.call_count, 1)
+        self.assertEqual(table["course_id"].tolist(), ["ICP131", "ICP132"])
+
+    def test_do_not_treat_again_when_content_did_not_change(self):
+        self.load()
+        path = get_cache_path("sheet_id", SECTIONS_RANGE, self.directory)
+        fetched_at = load_entry(path).fetched_at
+
+        with patch("time.time", return_value=fetched_at + 7200):
+            _, service = self.load()
+
+        self.assertEqual(len(service.requests), 1)
+        self.assertEqual(self.treat.call_count, 1)
+        self.assertEqual(load_entry(path).fetched_at, fetched_at + 7200)
+
+    def test_treat_again_when_content_changed(self):
+        self.load()
+        self.values = {SECTIONS_RANGE: VALUES + [["ICP133", "3", "FALSE"]]}
+
+        table, _ = self.load(refresh_time=0)
+
+        self.assertEqual(self.treat.call_count, 2)
+        self.assertEqual(table["term"].tolist(), [1, 2, 3])
+
+    def test_never_refresh_without_refresh_time(self):
+        self.load()
+        self.values = {SECTIONS_RANGE: []}
+
+        table, service = self.load(refresh_time=None)
+
+        self.assertEqual(service.requests, [])
+        self.assertEqual(len(table), 2)
+
+    def test_seed_from_csv_without_fetching(self):
+        table, service = self.load(seed_filename=self.write_seed())
+
+        self.assertEqual(service.requests, [])
+        self.assertEqual(self.treat.call_count, 0)
+        self.assertEqual(table["course_id"].tolist(), ["ICP131", "ICP132"])
+        self.assertEqual(table["term"].tolist(), [1, 2])
+
+    def test_treat_seed_again_on_revalidation(self):
+        table, service = self.load(refresh_time=0, seed_filename=self.write_seed())
+
+        self.assertEqual(len(service.requests), 1)
+        self.assertEqual(self.treat.call_count, 1)
+        self.assertEqual(len(table), 2)
+
+    def test_return_stale_table_when_fetch_fails(self):
+        self.load()
+        service = Mock()
+        service.spreadsheets.side_effect = OSError("network is unreachable")
+
+        table, _ = self.load(refresh_time=0, service=service)
+
+        self.assertEqual(self.treat.call_count, 1)
+        self.assertEqual(table["course_id"].tolist(), ["ICP131", "ICP132"])
+
+    def test_return_stale_table_when_fetch_is_empty(self):
+        self.load()
+        self.values = {}
+
+        table, _ = self.load(refresh_time=0)
+
+        self.assertEqual(len(table), 2)
+
+    def test_raise_when_fetch_fails_without_table(self):
+        service = Mock()
+        service.spreadsheets.side_effect = OSError("network is unreachable")
+
+        with self.assertRaises(OSError):
+            self.load(service=service)
+
+
+if __name__ == "__main__":
+    main()
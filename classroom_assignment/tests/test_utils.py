@@ -8,9 +8,17 @@ sys.path.insert(
     0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 )  # FIXME quero corrigir de outra forma
 
+from database.records import build_sections
 from utils.utils import (
+    Allocation,
+    CapacityDiff,
+    build_schedule_index,
+    get_classroom_type_demand,
+    get_courses_by_exact_day_and_time,
+    get_independent_components,
     get_section_schedule,
     get_possible_schedules,
+    get_possible_schedules_v2,
     treat_and_save_results,
 )
 
@@ -111,47 +119,141 @@ class TestGetPossibleSchedules(TestCase):
         self.assertEqual(set(expected_schedule), set(schedule))
 
 
+class TestBuildScheduleIndex(TestCase):
+    def setUp(self) -> None:
+        self.sections = build_sections(
+            {
+                "0": {"day": "SEG,QUA", "time": "13:00-15:00"},
+                "1": {"day": "SEG,QUI", "time": "13:00-15:00,08:00-10:00"},
+                "2": {"day": None, "time": None},
+            }
+        )
+
+    def test_index_slots_by_section(self):
+        result = build_schedule_index(self.sections)
+
+        self.assertEqual(
+            result.section_slots["0"],
+            (("SEG", "13:00-15:00"), ("QUA", "13:00-15:00")),
+        )
+        self.assertEqual(
+            result.section_slots["1"],
+            (("SEG", "13:00-15:00"), ("QUI", "08:00-10:00")),
+        )
+        self.assertEqual(result.section_slots["2"], ())
+
+    def test_index_sections_by_slot(self):
+        result = build_schedule_index(self.sections)
+
+        self.assertEqual(result.slot_sections[("SEG", "13:00-15:00")], ("0", "1"))
+        self.assertEqual(result.slot_sections[("QUI", "08:00-10:00")], ("1",))
+        self.assertNotIn(("QUI", "13:00-15:00"), result.slot_sections)
+
+    def test_index_is_immutable(self):
+        result = build_schedule_index(self.sections)
+
+        with self.assertRaises(TypeError):
+            result.slot_sections[("SEX", "08:00-10:00")] = ("0",)
+
+    def test_get_courses_by_exact_day_and_time(self):
+        result = get_courses_by_exact_day_and_time(
+            self.sections, "SEG", "13:00-15:00"
+        )
+
+        self.assertEqual(result, {"0", "1"})
+
+    def test_accept_section_dictionaries(self):
+        sections = {
+            "0": {"day": "SEG,QUA", "time": "13:00-15:00"},
+            "1": {"day": "SEG", "time": "13:00-15:00"},
+        }
+
+        self.assertEqual(
+            get_courses_by_exact_day_and_time(sections, "SEG", "13:00-15:00"),
+            {"0", "1"},
+        )
+        self.assertEqual(
+            get_possible_schedules_v2(sections),
+            (["SEG", "QUA"], ["13:00-15:00", "13:00-15:00"]),
+        )
+
+
+class TestGetIndependentComponents(TestCase):
+    def test_group_sections_linked_by_slots(self):
+        sections = build_sections(
+            {
+                "0": {"day": "SEG,QUA", "time": "08:00-10:00"},
+                "1": {"day": "QUA", "time": "08:00-10:00"},
+                "2": {"day": "SEX", "time": "10:00-12:00"},
+                "3": {"day": "SEG,SEX", "time": "13:00-15:00"},
+                "4": {"day": "SEX", "time": "13:00-15:00"},
+                "5": {"day": "SEX", "time": "15:00-17:00"},
+                "6": {"day": "SEX", "time": "15:00-17:00"},
+            }
+        )
+
+        result = get_independent_components(build_schedule_index(sections))
+
+        self.assertEqual(result, [["0", "1"], ["3", "4"], ["5", "6"], ["2"]])
+
+
+class TestGetClassroomTypeDemand(TestCase):
+    def test_repeat_single_classroom_type_for_all_slots(self):
+        result = get_classroom_type_demand({"classroom_type": "Teórica"}, 3)
+
+        self.assertEqual(result, (3, 0))
+
+    def test_count_each_classroom_type(self):
+        result = get_classroom_type_demand({"classroom_type": "Teórica,Prática"}, 2)
+
+        self.assertEqual(result, (1, 1))
+
+
 class TestTreatAndSaveResults(TestCase):
 
     @patch("utils.utils.save_results_to_csv")
     def test_treat_and_save_results(self, mock_save_results_to_csv):
 
-        timeschedule_mock = [
-            "E2011 (LAB 1)_0_SEG,QUA_08:00-10:00#1.0",
-            "F2007_1_TER,QUI_10:00-12:00#1.0",
-            "CapDiff_A201_OBG-BCC2-7#70.0",
-            "CapDiff_A201_OBG-BCC2-5#70.0",
-            "CapDiff_A202_OBG-BCC2-7#70.0",
+        assignment_mock = [
+            Allocation("E2011 (LAB 1)", 0, "SEG,QUA", "08:00-10:00"),
+            Allocation("F2007", 1, "TER,QUI", "10:00-12:00"),
+        ]
+        cap_diff_mock = [
+            CapacityDiff("A201", "OBG-BCC2-7", 70.0),
+            CapacityDiff("A201", "OBG-BCC2-5", 70.0),
+            CapacityDiff("A202", "OBG-BCC2-7", 70.0),
         ]
 
-        sections_mock = {
-            0: {
-                "institute": "IC",
-                "professor": "Prof1",
-                "course_id": "Course1",
-                "course_name": "CourseName1",
-                "day": "SEG,QUA",
-                "time": "08:00-10:00",
-                "capacity": 30,
-                "classroom_type": "Laboratório",
-                "graduation_course": "BCC1",
-                "term": 1,
-            },
-            1: {
-                "institute": "IC",
-                "professor": "Prof2",
-                "course_id": "Course2",
-                "course_name": "CourseName2",
-                "day": "TER,QUI",
-                "time": "10:00-12:00",
-                "capacity": 30,
-                "classroom_type": "Sala",
-                "graduation_course": "BCC1",
-                "term": 1,
-            },
-        }
-
-        result = treat_and_save_results(timeschedule_mock, sections_mock)
+        sections_mock = build_sections(
+            {
+                0: {
+                    "institute": "IC",
+                    "professor": "Prof1",
+                    "course_id": "Course1",
+                    "course_name": "CourseName1",
+                    "day": "SEG,QUA",
+                    "time": "08:00-10:00",
+                    "capacity": 30,
+                    "classroom_type": "Laboratório",
+                    "graduation_course": "BCC1",
+                    "term": 1,
+                },
+                1: {
+                    "institute": "IC",
+                    "professor": "Prof2",
+                    "course_id": "Course2",
+                    "course_name": "CourseName2",
+                    "day": "TER,QUI",
+                    "time": "10:00-12:00",
+                    "capacity": 30,
+                    "classroom_type": "Sala",
+                    "graduation_course": "BCC1",
+                    "term": 1,
+                },
+            }
+        )
+
+        result = treat_and_save_results(assignment_mock, sections_mock, cap_diff_mock)
 
         timeschedule = [
             [
@@ -177,9 +279,9 @@ class TestTreatAndSaveResults(TestCase):
         ]
 
         cap_diff = [
-            ["CapDiff_A201_OBG-BCC2-7#70.0"],
-            ["CapDiff_A201_OBG-BCC2-5#70.0"],
-            ["CapDiff_A202_OBG-BCC2-7#70.0"],
+            ["A201", "OBG-BCC2-7", 70.0],
+            ["A201", "OBG-BCC2-5", 70.0],
+            ["A202", "OBG-BCC2-7", 70.0],
         ]
 
         expected_result = timeschedule, cap_diff
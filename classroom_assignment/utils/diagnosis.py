@@ -0,0 +1,155 @@
+import json
+from typing import Hashable, NamedTuple, Optional, Tuple
+
+
+class ConstraintKey(NamedTuple):
+    """
+    What a model constraint (or variable bound) restricts, by the real section and
+    classroom ids. The fields that do not apply to the rule are None.
+    """
+
+    rule: str
+    section: Optional[Hashable] = None
+    classroom: Optional[Hashable] = None
+    day: Optional[str] = None
+    time: Optional[str] = None
+    classroom_type: Optional[str] = None
+
+
+class Conflict(NamedTuple):
+    """
+    An infeasible sub-model found by the diagnosis.
+
+    Attributes:
+        slot: The (day, time) of a slot sub-model, or None for a component of
+            sections that share slots.
+        sections: The sections of the sub-model.
+        constraints: The constraints and bounds of its IIS, or None when the
+            backend does not compute one.
+    """
+
+    slot: Optional[Tuple[str, str]]
+    sections: Tuple[Hashable, ...]
+    constraints: Optional[Tuple[ConstraintKey, ...]]
+
+
+def get_slot_relaxation(sections: dict, slot: tuple) -> dict:
+    """
+    Restricts the sections of a slot to that slot only. The RN3 demand of a section
+    is kept when all its slots require the same classroom type; the sections with
+    mixed types are left out. Any solution of the whole model gives a solution of
+    this sub-model, so its infeasibility proves the whole model infeasible.
+
+    Args:
+        sections (dict): The `Section` records of the sections in the slot.
+        slot (tuple): The (day, time) slot.
+
+    Returns:
+        dict: The `Section` records of the sub-model.
+    """
+    relaxation = {}
+
+    for section, details in sections.items():
+        qtty_slots = len(details.slots)
+
+        if details.theory_slots == qtty_slots:
+            theory_slots, practical_slots = 1, 0
+        elif details.practical_slots == qtty_slots:
+            theory_slots, practical_slots = 0, 1
+        elif details.theory_slots == 0 and details.practical_slots == 0:
+            theory_slots, practical_slots = 0, 0
+        else:
+            continue
+
+        relaxation[section] = details._replace(
+            slots=(slot,),
+            theory_slots=theory_slots,
+            practical_slots=practical_slots,
+        )
+
+    return relaxation
+
+
+def explain_iis(
+    constraint_keys: list,
+    variable_keys: list,
+    iis_constraints: list,
+    iis_bounds: list,
+    occupied_slots: set = frozenset(),
+) -> tuple:
+    """
+    Translates the indices of an IIS, in creation order, to the `ConstraintKey` of
+    its constraints and of the occupied slots whose bound belongs to it. The 0 and
+    1 bounds of the other binary variables explain nothing and are left out.
+    """
+    keys = [constraint_keys[index] for index in iis_constraints]
+
+    for index in iis_bounds:
+        if index >= len(variable_keys):
+            continue
+
+        classroom, section, day, time = variable_keys[index]
+        if (classroom, day, time) in occupied_slots:
+            keys.append(ConstraintKey("occupied", section, classroom, day, time))
+
+    return tuple(keys)
+
+
+def describe_constraint(key: ConstraintKey) -> str:
+    if key.rule == "RN1":
+        return f"RN1: sala {key.classroom} recebe no máximo 1 seção em {key.day} {key.time}"
+    if key.rule == "RN2":
+        return f"RN2: seção {key.section} precisa de 1 sala em {key.day} {key.time}"
+    if key.rule == "RN3":
+        return f"RN3: seção {key.section} precisa de sala do tipo {key.classroom_type}"
+    if key.rule == "RN4":
+        return f"RN4: seção {key.section} precisa da sala {key.classroom}"
+    if key.rule == "RN5":
+        return f"RN5: seção {key.section} não pode usar sala com quadro de giz"
+    if key.rule == "occupied":
+        return (
+            f"sala {key.classroom} já ocupada em {key.day} {key.time} "
+            f"(seção {key.section})"
+        )
+
+    return f"{key.rule}: seção {key.section}, sala {key.classroom}"
+
+
+def print_diagnosis(conflicts: list):
+    print("========= DIAGNOSIS ==========")
+    if not conflicts:
+        print("Nenhum sub-modelo inviável foi isolado")
+
+    for slot, sections, constraints in conflicts:
+        where = f"Horário {slot[0]} {slot[1]}" if slot else "Componente"
+        print(f"{where}: seções {', '.join(map(str, sections))}")
+
+        if constraints is None:
+            print("  (o solver não calcula IIS)")
+            continue
+
+        for key in constraints:
+            print(f"  {describe_constraint(key)}")
+    print("==============================")
+
+
+def save_diagnosis(filename: str, conflicts: list):
+    with open(filename, "w") as file:
+        json.dump(
+            [
+                {
+                    "slot": conflict.slot,
+                    "sections": conflict.sections,
+                    "constraints": (
+                        None
+                        if conflict.constraints is None
+                        else [key._asdict() for key in conflict.constraints]
+                    ),
+                }
+                for conflict in conflicts
+            ],
+            file,
+            ensure_ascii=False,
+            indent=2,
+            default=str,
+        )
@@ -0,0 +1,61 @@
+from database.records import Classroom, ClassroomType, Section
+
+
+def get_ineligibility_reason(
+    classroom: str,
+    classroom_details: Classroom,
+    section_details: Section,
+    parameters,
+) -> str:
+    """
+    Checks whether a classroom can ever be assigned to a section, applying the
+    rules that do not depend on the other sections (RN3, RN4, RN5 and the capacity
+    bound implied by RF2).
+
+    Args:
+        classroom (str): The classroom name, compared with the RN4 classroom.
+        classroom_details (Classroom): The classroom record.
+        section_details (Section): The section record.
+        parameters (ModelParameters): The rule settings of the model.
+
+    Returns:
+        str: The name of the rule that discards the pair, or None when the
+            classroom is eligible for the section.
+    """
+    classroom_type = classroom_details.classroom_type
+
+    # RN3: Salas só recebem aulas teóricas e laboratórios só recebem aulas práticas.
+    # Os demais tipos só são usados quando sobram horários sem tipo definido.
+    if classroom_type == ClassroomType.SALA:
+        if section_details.theory_slots == 0:
+            return "RN3"
+    elif classroom_type == ClassroomType.LABORATORIO:
+        if section_details.practical_slots == 0:
+            return "RN3"
+    elif section_details.theory_slots + section_details.practical_slots >= len(
+        section_details.slots
+    ):
+        return "RN3"
+
+    # RN4: As aulas teóricas das turmas de calouro só podem ocorrer na F3014
+    new_students_classroom = parameters.new_students_classroom
+    if (
+        new_students_classroom is not None
+        and section_details.is_new_students
+        and classroom_type == ClassroomType.SALA
+        and classroom != new_students_classroom
+    ):
+        return "RN4"
+
+    # RN5: Seções com restrição de quadro não podem ocupar salas com quadro de giz
+    if section_details.blackboard_restriction and classroom_details.is_blackboard:
+        return "RN5"
+
+    # RF2: A sala deve comportar a quantidade de vagas da seção
+    if (
+        classroom_details.capacity + parameters.capacity_tolerance
+        < section_details.capacity
+    ):
+        return "capacity"
+
+    return None
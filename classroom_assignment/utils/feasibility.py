@@ -0,0 +1,189 @@
+from typing import Hashable, NamedTuple, Optional, Tuple
+
+from database.records import ClassroomType
+from utils.utils import ScheduleIndex
+
+CLASSROOM_TYPE_NAMES = {
+    ClassroomType.SALA: "Sala",
+    ClassroomType.LABORATORIO: "Laboratório",
+    ClassroomType.OTHER: "outros tipos",
+}
+
+
+class Infeasibility(NamedTuple):
+    """A reason why the model cannot have a solution, found before building it."""
+
+    rule: str
+    sections: Tuple[Hashable, ...]
+    slot: Optional[Tuple[str, str]]
+    message: str
+
+
+def get_type_demand(details) -> dict:
+    """Returns how many slots of the section require each classroom type (RN3)."""
+    return {
+        ClassroomType.SALA: details.theory_slots,
+        ClassroomType.LABORATORIO: details.practical_slots,
+        ClassroomType.OTHER: max(
+            len(details.slots) - details.theory_slots - details.practical_slots, 0
+        ),
+    }
+
+
+def check_sections(
+    classrooms: dict,
+    sections: dict,
+    eligible_classrooms: dict,
+    new_students_classroom: str = None,
+) -> list:
+    """
+    Finds the sections that have no eligible classroom at all (RN2), none of a
+    required type (RN3) or, for freshman sections, not the freshman classroom (RN4).
+    """
+    infeasibilities = []
+
+    for section, details in sections.items():
+        eligible = eligible_classrooms[section]
+
+        if not eligible:
+            infeasibilities.append(
+                Infeasibility("RN2", (section,), None, "nenhuma sala elegível")
+            )
+            continue
+
+        needs_new_students_classroom = (
+            new_students_classroom is not None
+            and details.is_new_students
+            and details.theory_slots > 0
+        )
+        if needs_new_students_classroom and new_students_classroom not in eligible:
+            infeasibilities.append(
+                Infeasibility(
+                    "RN4",
+                    (section,),
+                    None,
+                    f"turma de calouro sem acesso à {new_students_classroom}",
+                )
+            )
+
+        eligible_types = {classrooms[classroom].classroom_type for classroom in eligible}
+
+        for classroom_type, demand in get_type_demand(details).items():
+            if demand and classroom_type not in eligible_types:
+                if needs_new_students_classroom and classroom_type == ClassroomType.SALA:
+                    continue  # Já reportado como RN4
+
+                infeasibilities.append(
+                    Infeasibility(
+                        "RN3",
+                        (section,),
+                        None,
+                        f"{demand} horário(s) sem sala elegível do tipo "
+                        f"{CLASSROOM_TYPE_NAMES[classroom_type]}",
+                    )
+                )
+
+    return infeasibilities
+
+
+def check_slots(
+    classrooms: dict,
+    schedule: ScheduleIndex,
+    eligible_classrooms: dict,
+    occupied_slots: set = frozenset(),
+    new_students_classroom: str = None,
+) -> list:
+    """
+    Compares, in each (day, time) slot, the sections with the free classrooms they
+    may use (RN1 and RN2):
+
+    - Sections whose eligible classrooms are all occupied in the slot.
+    - Sections that can only use the same classroom in the slot.
+    - More sections than free eligible classrooms, in the whole slot or among the
+      sections restricted to a single classroom type.
+    """
+    infeasibilities = []
+
+    for slot, slot_sections in schedule.slot_sections.items():
+        day, time = slot
+        free_classrooms = {
+            section: {
+                classroom
+                for classroom in eligible_classrooms[section]
+                if (classroom, day, time) not in occupied_slots
+            }
+            for section in slot_sections
+        }
+
+        # As seções sem nenhuma sala livre são reportadas uma vez, fora dos grupos
+        available_sections = []
+        sections_by_room = {}
+        sections_by_type = {}
+
+        for section, free in free_classrooms.items():
+            if not free:
+                if eligible_classrooms[section]:
+                    infeasibilities.append(
+                        Infeasibility(
+                            "RN1",
+                            (section,),
+                            slot,
+                            "todas as salas elegíveis já estão ocupadas",
+                        )
+                    )
+                continue
+
+            available_sections.append(section)
+
+            if len(free) == 1:
+                sections_by_room.setdefault(next(iter(free)), []).append(section)
+
+            types = {classrooms[classroom].classroom_type for classroom in free}
+            if len(types) == 1:
+                sections_by_type.setdefault(types.pop(), []).append(section)
+
+        for classroom, pinned_sections in sections_by_room.items():
+            if len(pinned_sections) > 1:
+                infeasibilities.append(
+                    Infeasibility(
+                        "RN4" if classroom == new_students_classroom else "RN1",
+                        tuple(pinned_sections),
+                        slot,
+                        f"{len(pinned_sections)} seções só podem usar a sala {classroom}",
+                    )
+                )
+
+        # Um grupo de tipo com todas as seções do horário repetiria o teste geral
+        groups = [(None, available_sections)] + [
+            (classroom_type, group)
+            for classroom_type, group in sections_by_type.items()
+            if len(group) < len(available_sections)
+        ]
+
+        for classroom_type, group in groups:
+            supply = set().union(*(free_classrooms[section] for section in group))
+
+            if len(group) > len(supply):
+                kind = (
+                    f" do tipo {CLASSROOM_TYPE_NAMES[classroom_type]}"
+                    if classroom_type is not None
+                    else ""
+                )
+                infeasibilities.append(
+                    Infeasibility(
+                        "RN1",
+                        tuple(group),
+                        slot,
+                        f"{len(group)} seções para {len(supply)} salas livres{kind}",
+                    )
+                )
+
+    return infeasibilities
+
+
+def print_infeasibility_report(infeasibilities: list):
+    print("========= PRE-CHECK ==========")
+    for rule, sections, slot, message in infeasibilities:
+        where = f" {slot[0]} {slot[1]}" if slot else ""
+        print(f"{rule}{where}: {message} (seções: {', '.join(map(str, sections))})")
+    print("==============================")
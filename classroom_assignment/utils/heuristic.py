@@ -0,0 +1,182 @@
+from typing import NamedTuple
+
+from database.records import build_classrooms, build_sections
+from utils import utils
+from utils.eligibility import get_ineligibility_reason
+from utils.feasibility import get_type_demand
+from utils.symmetry import disaggregate_assignment, group_identical_classrooms
+
+
+class HeuristicResult(NamedTuple):
+    """
+    An assignment built without a solver.
+
+    Attributes:
+        assignment: The `Allocation` rows, with concrete classrooms.
+        unallocated: The (section, day, time) slots left without a classroom.
+        objective_value: The linear objective of the assignment.
+    """
+
+    assignment: list
+    unallocated: list
+    objective_value: float
+
+
+def get_allocation_score(classroom_details, section_details, parameters) -> float:
+    """Returns the linear objective coefficient of a classroom in a section slot."""
+    if section_details.responsable_institute == classroom_details.responsable_institute:
+        coefficient = parameters.responsible_institute_coefficient
+    else:
+        coefficient = parameters.default_coefficient
+
+    # RF2: Penaliza a diferença de capacidade para preferir a menor sala possível.
+    # Com capacity_tolerance, as vagas que faltam pesam como as que sobram
+    return coefficient - parameters.capacity_diff_coefficient * abs(
+        classroom_details.capacity - section_details.capacity
+    )
+
+
+def allocate_greedy(
+    classrooms: dict,
+    sections: dict,
+    parameters,
+    occupied_slots: set = frozenset(),
+) -> HeuristicResult:
+    """
+    Allocates the sections slot by slot without a solver. In each (day, time) slot,
+    the sections with fewer eligible classrooms go first, and each one takes the
+    free eligible classroom with the best objective coefficient: a classroom of
+    the responsible institute and then the smallest one. RN1 to RN5 hold, but a
+    section may be left without a classroom where the exact model would move
+    others to make room.
+
+    Args:
+        classrooms (dict): The classrooms set, as records or dictionaries.
+        sections (dict): The sections set, as records or dictionaries.
+        parameters (ModelParameters): The coefficients and rule settings.
+        occupied_slots (set): (classroom, day, time) already taken.
+
+    Returns:
+        HeuristicResult: The assignment, the slots left out and its objective.
+    """
+    classrooms = build_classrooms(classrooms)
+    sections = build_sections(sections)
+    schedule = utils.build_schedule_index(sections)
+
+    # Salas idênticas são a mesma escolha: basta avaliar uma por grupo
+    classroom_groups = group_identical_classrooms(
+        classrooms, distinct=(parameters.new_students_classroom,)
+    )
+
+    candidates_by_signature = {}
+    candidates = {}
+    demand = {}
+
+    for section, details in sections.items():
+        # Seções com a mesma assinatura têm as mesmas salas elegíveis e notas
+        signature = details._replace(
+            graduation_course=None,
+            professor=None,
+            course_id=None,
+            course_name=None,
+            term=None,
+            slots=len(details.slots),
+        )
+
+        if signature not in candidates_by_signature:
+            section_candidates = {}
+
+            for classroom in classroom_groups:
+                if get_ineligibility_reason(
+                    classroom, classrooms[classroom], details, parameters
+                ):
+                    continue
+
+                section_candidates.setdefault(
+                    classrooms[classroom].classroom_type, []
+                ).append(
+                    (
+                        get_allocation_score(classrooms[classroom], details, parameters),
+                        classroom,
+                    )
+                )
+
+            for type_candidates in section_candidates.values():
+                type_candidates.sort(key=lambda candidate: -candidate[0])
+
+            candidates_by_signature[signature] = section_candidates
+
+        candidates[section] = candidates_by_signature[signature]
+        demand[section] = get_type_demand(details)
+
+    qtty_candidates = {
+        section: sum(
+            len(classroom_groups[classroom])
+            for type_candidates in section_candidates.values()
+            for _, classroom in type_candidates
+        )
+        for section, section_candidates in candidates.items()
+    }
+
+    free_classrooms = {}
+    assignment = []
+    unallocated = []
+    objective_value = 0.0
+
+    for (day, time), slot_sections in schedule.slot_sections.items():
+        for section in sorted(
+            slot_sections,
+            key=lambda section: (qtty_candidates[section], -sections[section].capacity),
+        ):
+            best = None
+
+            for classroom_type, type_candidates in candidates[section].items():
+                if demand[section][classroom_type] <= 0:
+                    continue
+
+                for score, classroom in type_candidates:
+                    if best is not None and score <= best[0]:
+                        break
+
+                    if (classroom, day, time) not in free_classrooms:
+                        free_classrooms[classroom, day, time] = sum(
+                            (member, day, time) not in occupied_slots
+                            for member in classroom_groups[classroom]
+                        )
+
+                    # RN1: Uma sala recebe no máximo uma seção por dia e horário
+                    if free_classrooms[classroom, day, time] > 0:
+                        best = (score, classroom, classroom_type)
+                        break
+
+            if best is None:
+                unallocated.append((section, day, time))
+                continue
+
+            score, classroom, classroom_type = best
+            free_classrooms[classroom, day, time] -= 1
+            demand[section][classroom_type] -= 1
+            objective_value += score
+            assignment.append(utils.Allocation(classroom, section, day, time))
+
+    return HeuristicResult(
+        disaggregate_assignment(assignment, classroom_groups, occupied_slots),
+        unallocated,
+        objective_value,
+    )
+
+
+def get_capacity_diff(classrooms: dict, sections: dict, assignment: list) -> list:
+    """Returns the `CapacityDiff` rows of the (classroom, section) pairs used."""
+    pairs = dict.fromkeys(
+        (allocation.classroom, allocation.section) for allocation in assignment
+    )
+
+    return [
+        utils.CapacityDiff(
+            classroom,
+            section,
+            float(classrooms[classroom].capacity - sections[section].capacity),
+        )
+        for classroom, section in pairs
+    ]
@@ -0,0 +1,117 @@
+import json
+import os
+from typing import Tuple
+
+
+def save_snapshot(
+    filename: str, classrooms: dict, sections: dict, assignment: list
+) -> None:
+    """
+    Saves the input sets and the assignment of a run, so that the next run can
+    re-optimize only what changed.
+
+    Args:
+        filename (str): The JSON file to write.
+        classrooms (dict): The `Classroom` records of the run.
+        sections (dict): The `Section` records of the run.
+        assignment (list): The (classroom, section, day, time) tuples of the solution.
+    """
+
+    # Salva como listas de pares para preservar as chaves inteiras das seções
+    snapshot = {
+        "classrooms": [
+            (classroom, details._asdict()) for classroom, details in classrooms.items()
+        ],
+        "sections": [(section, details._asdict()) for section, details in sections.items()],
+        "assignment": [list(allocation) for allocation in assignment],
+    }
+
+    with open(filename, "w") as file:
+        json.dump(snapshot, file)
+
+
+def load_snapshot(filename: str) -> dict:
+    """
+    Loads a snapshot saved by `save_snapshot`.
+
+    Returns:
+        dict: The 'classrooms', 'sections' and 'assignment' of the previous run, or
+            None when there is no snapshot.
+    """
+
+    if not os.path.exists(filename):
+        return None
+
+    with open(filename) as file:
+        snapshot = json.load(file)
+
+    return {
+        "classrooms": dict(snapshot["classrooms"]),
+        "sections": dict(snapshot["sections"]),
+        "assignment": [tuple(allocation) for allocation in snapshot["assignment"]],
+    }
+
+
+def _content_key(details) -> str:
+    # Registros e dicionários lidos do JSON geram a mesma chave (tuplas viram listas)
+    if hasattr(details, "_asdict"):
+        details = details._asdict()
+
+    return json.dumps(details, sort_keys=True, default=str)
+
+
+def diff_snapshot(
+    snapshot: dict, classrooms: dict, sections: dict
+) -> Tuple[list, list]:
+    """
+    Compares the current input with a previous snapshot.
+
+    Sections are matched by content instead of by key, since inserting a row in the
+    spreadsheet shifts the keys of every row below it. A matched section keeps its
+    previous classrooms unless one of them was removed or changed.
+
+    Args:
+        snapshot (dict): The previous run, as returned by `load_snapshot`.
+        classrooms (dict): The current `Classroom` records.
+        sections (dict): The current `Section` records.
+
+    Returns:
+        tuple: The kept assignment as (classroom, section, day, time) tuples using the
+            current section keys, and the list of sections that must be re-optimized.
+    """
+
+    previous_assignment = {}
+    for classroom, section, day, time in snapshot["assignment"]:
+        previous_assignment.setdefault(section, []).append((classroom, day, time))
+
+    previous_by_content = {}
+    for section, details in snapshot["sections"].items():
+        previous_by_content.setdefault(_content_key(details), []).append(section)
+
+    changed_classrooms = {
+        classroom
+        for classroom, details in snapshot["classrooms"].items()
+        if classroom not in classrooms
+        or _content_key(classrooms[classroom]) != _content_key(details)
+    }
+
+    kept_assignment = []
+    affected_sections = []
+
+    for section, details in sections.items():
+        candidates = previous_by_content.get(_content_key(details))
+        allocations = None
+
+        if candidates:
+            allocations = previous_assignment.get(candidates.pop(0))
+
+        if not allocations or any(
+            classroom in changed_classrooms for classroom, _, _ in allocations
+        ):
+            affected_sections.append(section)
+            continue
+
+        for classroom, day, time in allocations:
+            kept_assignment.append((classroom, section, day, time))
+
+    return kept_assignment, affected_sections
@@ -0,0 +1,85 @@
+import gc
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+def get_peak_rss() -> int:
+    """
+    Returns the peak resident set size of the process in bytes, or None when the
+    platform does not provide it.
+    """
+    if resource is None:
+        return None
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # ru_maxrss é dado em bytes no macOS e em kilobytes no Linux
+    if sys.platform == "darwin":
+        return peak_rss
+
+    return peak_rss * 1024
+
+
+class Instrumentation:
+    """
+    Records wall time, peak RSS growth and the number of live Python objects of
+    each phase of a run, plus the solver statistics. Does nothing when disabled.
+
+    The peak RSS is a high-water mark of the whole process, so a phase records how
+    much it raised it (`peak_rss_growth`, 0 when it stayed under an earlier peak)
+    and the mark itself (`max_rss_so_far`).
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.phases = []
+        self.solver = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        start_rss = get_peak_rss()
+        try:
+            yield
+        finally:
+            end_rss = get_peak_rss()
+            self.phases.append(
+                {
+                    "name": name,
+                    "wall_time": time.perf_counter() - start,
+                    "peak_rss_growth": None if end_rss is None else end_rss - start_rss,
+                    "max_rss_so_far": end_rss,
+                    "objects": len(gc.get_objects()),
+                }
+            )
+
+    def add_model_stats(self, backend):
+        if not self.enabled:
+            return
+
+        self.solver = backend.get_stats()
+
+    def save(self, filename: str):
+        if not self.enabled:
+            return
+
+        report = {
+            "total_wall_time": sum(phase["wall_time"] for phase in self.phases),
+            "phases": self.phases,
+            "solver": self.solver,
+        }
+
+        with open(filename, "w") as file:
+            json.dump(report, file, indent=2)
+
+        print(f"Run report was saved in {filename}")
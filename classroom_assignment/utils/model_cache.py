@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+import pickle
+from typing import Tuple
+
+MODEL_CACHE_DIRECTORY = "cache/models"
+
+
+def get_model_fingerprint(classrooms: dict, sections: dict, options: dict) -> str:
+    """
+    Hashes everything the built model depends on: the `Classroom` and `Section`
+    records, in order, and the model options.
+
+    Args:
+        classrooms (dict): The `Classroom` records of the model.
+        sections (dict): The `Section` records of the model.
+        options (dict): The objective mode, solver, occupied slots and any other
+            setting that changes the variables, constraints or objective.
+
+    Returns:
+        str: The hexadecimal sha256 of the normalized input.
+    """
+
+    # Listas de pares: as chaves inteiras das seções não viram strings
+    normalized = json.dumps(
+        [
+            [[classroom, list(details)] for classroom, details in classrooms.items()],
+            [[section, list(details)] for section, details in sections.items()],
+            sorted(options.items()),
+        ],
+        default=str,
+    )
+
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def get_model_cache_paths(fingerprint: str, directory: str = None) -> Tuple[str, str]:
+    """
+    Args:
+        fingerprint (str): The hash returned by `get_model_fingerprint`.
+        directory (str): Where the models are kept, `MODEL_CACHE_DIRECTORY` by
+            default.
+
+    Returns:
+        tuple: The paths of the MPS model and of the pickled variable keys.
+    """
+    directory = directory or MODEL_CACHE_DIRECTORY
+
+    return (
+        os.path.join(directory, f"{fingerprint}.mps"),
+        os.path.join(directory, f"{fingerprint}.pkl"),
+    )
+
+
+def save_model_keys(filename: str, keys: dict) -> None:
+    """
+    Saves what `ClassroomAssignment` keeps besides the solver model, so that a cached
+    model can be used without building anything in Python. Written last, so that
+    its presence means the model file is complete.
+    """
+    os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+
+    temporary_filename = f"{filename}.tmp"
+    with open(temporary_filename, "wb") as file:
+        pickle.dump(keys, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_filename, filename)
+
+
+def load_model_keys(filename: str) -> dict:
+    """
+    Loads the keys saved by `save_model_keys`.
+
+    Returns:
+        dict: The saved keys, or None when there is no complete cache entry.
+    """
+    try:
+        with open(filename, "rb") as file:
+            return pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
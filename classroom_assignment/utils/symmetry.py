@@ -0,0 +1,65 @@
+from utils.utils import Allocation
+
+
+def group_identical_classrooms(classrooms: dict, distinct=()) -> dict:
+    """
+    Groups the classrooms the model cannot tell apart: same responsible institute,
+    classroom type, capacity and blackboard (the whole `Classroom` record). Each
+    group is named after its first classroom, in the input order.
+
+    Args:
+        classrooms (dict): The `Classroom` records.
+        distinct: Classrooms that keep a group of their own, e.g. the RN4 classroom.
+
+    Returns:
+        dict: The name of each group mapped to the tuple of its classrooms.
+    """
+    groups = {}
+    representatives = {}
+
+    for classroom, details in classrooms.items():
+        key = classroom if classroom in distinct else details
+        representative = representatives.setdefault(key, classroom)
+        groups.setdefault(representative, []).append(classroom)
+
+    return {classroom: tuple(members) for classroom, members in groups.items()}
+
+
+def disaggregate_assignment(
+    assignment: list, classroom_groups: dict, occupied_slots: set = frozenset()
+) -> list:
+    """
+    Replaces the group of each `Allocation` by one of its classrooms that is free
+    in the slot, keeping a section in the same classroom across its slots when it
+    is free. RN1 of the grouped model limits the sections of a group in a slot to
+    its free classrooms, so every section gets a classroom of its own.
+
+    Returns:
+        list: The `Allocation` rows with concrete classrooms, in the same order.
+    """
+    section_classrooms = {}
+    used = set()
+    disaggregated = []
+
+    for classroom, section, day, time in assignment:
+        members = classroom_groups[classroom]
+
+        if len(members) == 1:
+            disaggregated.append(Allocation(classroom, section, day, time))
+            continue
+
+        free = [
+            member
+            for member in members
+            if (member, day, time) not in occupied_slots
+            and (member, day, time) not in used
+        ]
+        previous = section_classrooms.setdefault(section, [])
+        chosen = next((member for member in previous if member in free), free[0])
+
+        if chosen not in previous:
+            previous.append(chosen)
+        used.add((chosen, day, time))
+        disaggregated.append(Allocation(chosen, section, day, time))
+
+    return disaggregated
@@ -1,5 +1,38 @@
 import csv
-from typing import Tuple
+from types import MappingProxyType
+from typing import Hashable, Mapping, NamedTuple, Tuple
+
+ASSIGNMENT_PATH = "classroom_assignment/results/assignment.csv"
+
+
+class ScheduleIndex(NamedTuple):
+    """
+    Parsed schedule of a set of sections, built once by `build_schedule_index`.
+
+    Attributes:
+        section_slots: Maps each section to its (day, time) slots.
+        slot_sections: Maps each (day, time) slot to the sections scheduled on it.
+    """
+
+    section_slots: Mapping[Hashable, Tuple[Tuple[str, str], ...]]
+    slot_sections: Mapping[Tuple[str, str], Tuple[Hashable, ...]]
+
+
+class Allocation(NamedTuple):
+    """A (day, time) slot of a section assigned to a classroom."""
+
+    classroom: str
+    section: Hashable
+    day: str
+    time: str
+
+
+class CapacityDiff(NamedTuple):
+    """The unused capacity of a classroom assigned to a section."""
+
+    classroom: str
+    section: Hashable
+    capacity_diff: float
 
 
 def is_blackboard(classroom: dict) -> bool:
@@ -10,25 +43,107 @@ def is_blackboard(classroom: dict) -> bool:
     return False
 
 
-def get_courses_by_exact_day_and_time(courses: dict, day: str, time: str) -> set:
+def is_new_students_section(section: dict) -> bool:
+    return section.get("term") == 1 and section.get("class_type") == "Calouro"
+
+
+def get_classroom_type_demand(section: dict, qtty_slots: int) -> Tuple[int, int]:
+    """
+    Counts how many slots of a section require a theory classroom and how many
+    require a practical one, following the same rule used by RN3.
+
+    Args:
+        section (dict): The section details, specifically 'classroom_type'.
+        qtty_slots (int): The number of (day, time) slots of the section.
 
-    result = []
+    Returns:
+        tuple: The quantity of theory slots and the quantity of practical slots.
+    """
+
+    classroom_types = section["classroom_type"].split(",")
 
-    for course_id, details in courses.items():
-        days = details["day"].split(",")
-        times = details["time"].split(",")
+    if len(classroom_types) == 1:
+        classroom_types = [classroom_types[0]] * qtty_slots
 
-        # Repete o horário para os dias no caso de agendamento de mesma hora. Ex.: SEG,QUA 10h às 12h
-        if len(times) < len(days):
-            times = [times[0]] * len(days)
+    return classroom_types.count("Teórica"), classroom_types.count("Prática")
 
-        for i, course_day in enumerate(days):
-            if course_day == day:
-                for j, course_time in enumerate(times):
-                    if i == j and course_time == time:
-                        result.append(course_id)
 
-    return set(result)
+def build_schedule_index(sections: dict) -> ScheduleIndex:
+    """
+    Indexes the (day, time) slots of the sections, parsed once by `build_sections`,
+    both by section and by slot.
+
+    Args:
+        sections (dict): A dictionary where the keys are section identifiers and the values
+                        are `Section` records.
+
+    Returns:
+        ScheduleIndex: An immutable index of the sections schedule.
+    """
+
+    section_slots = {}
+    slot_sections = {}
+
+    for section, details in sections.items():
+        section_slots[section] = details.slots
+
+        for slot in section_slots[section]:
+            slot_sections.setdefault(slot, []).append(section)
+
+    return ScheduleIndex(
+        section_slots=MappingProxyType(section_slots),
+        slot_sections=MappingProxyType(
+            {slot: tuple(slot_section) for slot, slot_section in slot_sections.items()}
+        ),
+    )
+
+
+def get_independent_components(schedule_index: ScheduleIndex) -> list:
+    """
+    Groups the sections into connected components of the section-slot graph, where
+    a section is linked to each of its (day, time) slots. Sections of different
+    components never compete for a classroom.
+
+    Args:
+        schedule_index (ScheduleIndex): The schedule of the sections.
+
+    Returns:
+        list: The components, each one a list of sections in the index order,
+            sorted from the largest to the smallest component.
+    """
+
+    parent = {section: section for section in schedule_index.section_slots}
+
+    def find(section):
+        while parent[section] != section:
+            parent[section] = parent[parent[section]]
+            section = parent[section]
+        return section
+
+    for slot_sections in schedule_index.slot_sections.values():
+        root = find(slot_sections[0])
+        for section in slot_sections[1:]:
+            other_root = find(section)
+            if other_root != root:
+                parent[other_root] = root
+
+    components = {}
+    for section in schedule_index.section_slots:
+        components.setdefault(find(section), []).append(section)
+
+    return sorted(components.values(), key=len, reverse=True)
+
+
+def get_courses_by_exact_day_and_time(courses: dict, day: str, time: str) -> set:
+    """
+    Returns the sections scheduled on a (day, time) slot. The values of `courses`
+    may be `Section` records or the dictionaries of `transform_sections_to_dict`.
+    """
+    from database.records import build_sections  # database.records importa este módulo
+
+    schedule_index = build_schedule_index(build_sections(courses))
+
+    return set(schedule_index.slot_sections.get((day, time), ()))
 
 
 def get_possible_schedules(sections: dict) -> Tuple[list, list]:
@@ -60,35 +175,19 @@ def get_possible_schedules_v2(sections: dict) -> Tuple[list, list]:
     """
     Extracts and returns the unique days and times from a dictionary of sections.
     Args:
-        sections (dict): A dictionary where the keys are course identifiers and the values are dictionaries
-                        containing course details, specifically 'day' and 'time'.
+        sections (dict): A dictionary where the keys are course identifiers and the values are `Section`
+                        records or the dictionaries of `transform_sections_to_dict`.
     Returns:
         tuple: A tuple containing two lists:
             - days (list): A list of unique days on which the sections are scheduled.
             - time (list): A list of unique times at which the sections are scheduled.
     """
+    from database.records import build_sections  # database.records importa este módulo
 
-    unique_schedules = set()
-
-    for _, course_details in sections.items():
-        day_original = course_details["day"]
-        time_original = course_details["time"]
-
-        days = day_original.split(",") if day_original else []
-        times = time_original.split(",") if time_original else []
-
-        # Repete o horário para os dias no caso de agendamento de mesma hora. Ex.: SEG,QUA 10h às 12h
-        if len(times) < len(days):
-            times = [times[0]] * len(days)
-
-        for day, time in zip(days, times):
-            unique_schedules.add((day, time))
+    schedule_index = build_schedule_index(build_sections(sections))
 
-    days = []
-    times = []
-    for day, time in unique_schedules:
-        days.append(day)
-        times.append(time)
+    days = [day for day, _ in schedule_index.slot_sections]
+    times = [time for _, time in schedule_index.slot_sections]
 
     return days, times
 
@@ -108,6 +207,18 @@ def get_section_schedule(courses_set: dict, course_class_id: str) -> Tuple[list,
     day = courses_set[course_class_id]["day"]
     time = courses_set[course_class_id]["time"]
 
+    return parse_schedule(day, time)
+
+
+def parse_schedule(day: str, time: str) -> Tuple[list, list]:
+    """
+    Splits the 'day' and 'time' of a section into one (day, time) pair per slot. A
+    single time is repeated for every day.
+
+    Returns:
+        tuple: The list of days and the list of times.
+    """
+
     days = day.split(",") if day else []
     times = time.split(",") if time else []
 
@@ -126,49 +237,96 @@ def save_results_to_csv(data: list, filename: str) -> None:
             spamwriter.writerow(line)
 
 
-def treat_and_save_results(timeschedule: list, courses: dict):
-    timeschedule_treated = []
-    cap_diff = []
-    pnc = []
+def read_results_from_csv(filename: str) -> list:
+    """
+    Reads a file written by `save_results_to_csv`. Returns an empty list when the
+    file does not exist.
+    """
+    try:
+        with open(filename, newline="") as file:
+            spamreader = csv.reader(file, delimiter=";", quotechar="|")
+            return [line for line in spamreader if line]
+    except FileNotFoundError:
+        return []
+
 
-    for schedule in timeschedule:
-
-        if "CapDiff" in schedule:
-            cap_diff.append([schedule])
-        elif "PNC" in schedule:
-            pnc.append([schedule])
-        else:
-
-            schedule, _ = schedule.split("#")
-            allocation = schedule.split("_")
-            classroom_name = allocation[0]
-            course_class_id = int(allocation[1])
-
-            professor = courses[course_class_id]["professor"]
-            graduation_course = courses[course_class_id]["graduation_course"]
-            course_id = courses[course_class_id]["course_id"]
-            course_name = courses[course_class_id]["course_name"]
-            term = courses[course_class_id]["term"]
-
-            day = allocation[2]
-            time = allocation[3]
-
-            result = [
-                classroom_name,
-                professor,
-                graduation_course,
-                course_id,
-                course_name,
-                term,
+def match_results_to_sections(rows: list, sections: dict) -> Tuple[list, int]:
+    """
+    Matches the rows of an assignment.csv (classroom, professor, graduation course,
+    course, course name, term, day, time) to the current sections with the same
+    course, professor, graduation course and slot.
+
+    Args:
+        rows (list): The rows returned by `read_results_from_csv`.
+        sections (dict): The `Section` records.
+
+    Returns:
+        tuple: The `Allocation` of each matched row and how many rows had no
+            matching section.
+    """
+    sections_by_row = {}
+    for section, details in sections.items():
+        for day, time in details.slots:
+            key = (
+                details.course_id,
+                details.professor,
+                details.graduation_course,
                 day,
                 time,
+            )
+            sections_by_row.setdefault(key, []).append(section)
+
+    assignment = []
+    without_section = 0
+
+    for classroom, professor, graduation_course, course_id, _, _, day, time in rows:
+        candidates = sections_by_row.get(
+            (course_id, professor, graduation_course, day, time)
+        )
+        if not candidates:
+            without_section += 1
+            continue
+
+        # Seções idênticas: usa a primeira que ainda não foi associada neste horário
+        assignment.append(Allocation(classroom, candidates.pop(0), day, time))
+
+    return assignment, without_section
+
+
+def treat_and_save_results(assignment: list, courses: dict, cap_diff: list = ()):
+    """
+    Joins the assignment with the section details and saves the results CSVs.
+
+    Args:
+        assignment (list): The `Allocation` rows of the solution.
+        courses (dict): The `Section` records of the sections set.
+        cap_diff (list): The `CapacityDiff` rows of the solution.
+
+    Returns:
+        tuple: The rows saved in assignment.csv and in cap_diff.csv.
+    """
+    timeschedule_treated = []
+    pnc = []
+
+    for allocation in assignment:
+        course = courses[allocation.section]
+
+        timeschedule_treated.append(
+            [
+                allocation.classroom,
+                course.professor,
+                course.graduation_course,
+                course.course_id,
+                course.course_name,
+                course.term,
+                allocation.day,
+                allocation.time,
             ]
+        )
 
-            timeschedule_treated.append(result)
+    cap_diff = [list(diff) for diff in cap_diff]
 
-    save_results_to_csv(
-        timeschedule_treated, "classroom_assignment/results/assignment.csv"
-    )
+    save_results_to_csv(timeschedule_treated, ASSIGNMENT_PATH)
     save_results_to_csv(cap_diff, "classroom_assignment/results/cap_diff.csv")
     save_results_to_csv(pnc, "classroom_assignment/results/pnc.csv")
 